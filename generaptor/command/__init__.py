@@ -4,17 +4,27 @@ This module provides all CLI command implementations for generaptor.
 Each submodule contains a specific command and its setup function.
 """
 
+from .agent import setup_cmd as setup_agent
+from .analyze import setup_cmd as setup_analyze
 from .extract import setup_cmd as setup_extract
 from .generate import setup_cmd as setup_generate
+from .get_coverage import setup_cmd as setup_get_coverage
 from .get_fingerprint import setup_cmd as setup_get_fingerprint
+from .get_manifest import setup_cmd as setup_get_manifest
 from .get_metadata import setup_cmd as setup_get_metadata
 from .get_profiles import setup_cmd as setup_get_profiles
 from .get_rules import setup_cmd as setup_get_rules
 from .get_secret import setup_cmd as setup_get_secret
+from .get_stats import setup_cmd as setup_get_stats
 from .get_targets import setup_cmd as setup_get_targets
+from .get_timing import setup_cmd as setup_get_timing
+from .grep import setup_cmd as setup_grep
+from .key_pool import setup_cmd as setup_key_pool
 from .new_profile import setup_cmd as setup_new_profile
 from .new_rule import setup_cmd as setup_new_rule
 from .new_target import setup_cmd as setup_new_target
+from .purge_secrets import setup_cmd as setup_purge_secrets
+from .sweep import setup_cmd as setup_sweep
 from .update import setup_cmd as setup_update
 
 
@@ -36,3 +46,13 @@ def setup_commands(cmd):
     setup_get_secret(cmd)
     setup_get_metadata(cmd)
     setup_get_fingerprint(cmd)
+    setup_grep(cmd)
+    setup_sweep(cmd)
+    setup_get_coverage(cmd)
+    setup_get_timing(cmd)
+    setup_analyze(cmd)
+    setup_get_manifest(cmd)
+    setup_get_stats(cmd)
+    setup_key_pool(cmd)
+    setup_agent(cmd)
+    setup_purge_secrets(cmd)
@@ -0,0 +1,311 @@
+"""agent command module.
+
+This module provides the CLI command running the key agent, which keeps
+unlocked private keys in memory behind a Unix socket, and managing the
+keys it holds.
+"""
+
+from base64 import b64encode
+from dataclasses import dataclass, field
+from json import JSONDecodeError, loads
+from os import umask
+from pathlib import Path
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from tempfile import mkdtemp
+from threading import Lock
+from time import time
+
+from ..helper.agent import (
+    AGENT_SOCKET_ENV,
+    AGENT_SOCKET_NAME,
+    AgentError,
+    agent_request,
+    check_private,
+    default_socket_path,
+    key_id_from_path,
+)
+from ..helper.crypto import (
+    RSAPrivateKey,
+    decrypt_secret,
+    load_private_key,
+    private_key_from_pem_bytes,
+    private_key_to_pem_bytes,
+)
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.agent')
+_DEFAULT_TTL = 3600
+
+
+@dataclass
+class _KeyAgent:
+    """Unlocked private keys indexed by key identifier with expiry."""
+
+    ttl: int
+    keys: dict[str, tuple[RSAPrivateKey, float]] = field(default_factory=dict)
+    lock: Lock = field(default_factory=Lock)
+
+    def purge(self):
+        """Forget expired keys."""
+        now = time()
+        with self.lock:
+            for key_id, (_, expires) in list(self.keys.items()):
+                if expires <= now:
+                    _LOGGER.info("key expired: %s", key_id)
+                    del self.keys[key_id]
+
+    def _add(self, request: dict) -> dict:
+        """Hold an unlocked private key until it expires."""
+        private_key = private_key_from_pem_bytes(
+            request['pem'].encode('utf-8'), None
+        )
+        expires = time() + (request.get('ttl') or self.ttl)
+        with self.lock:
+            self.keys[request['key_id']] = (private_key, expires)
+        _LOGGER.info("key added: %s", request['key_id'])
+        return {'ok': True, 'expires': int(expires)}
+
+    def _list(self, _request: dict) -> dict:
+        """List held keys with expiry timestamp."""
+        with self.lock:
+            keys = [
+                {'key_id': key_id, 'expires': int(expires)}
+                for key_id, (_, expires) in self.keys.items()
+            ]
+        return {'ok': True, 'keys': keys}
+
+    def _decrypt(self, request: dict) -> dict:
+        """Decrypt a collection secret with a held key."""
+        with self.lock:
+            item = self.keys.get(request['key_id'])
+        if not item:
+            return {'ok': False, 'error': "key not held by agent"}
+        secret = decrypt_secret(item[0], request['b64_enc_secret'])
+        return {'ok': True, 'secret': b64encode(secret).decode()}
+
+    def _clear(self, _request: dict) -> dict:
+        """Forget all keys."""
+        with self.lock:
+            self.keys.clear()
+        _LOGGER.info("keys cleared")
+        return {'ok': True}
+
+    def handle(self, request: dict) -> dict:
+        """Handle a request.
+
+        Args:
+            request (dict): Request with 'op' operation name and arguments.
+
+        Returns:
+            dict: Response with 'ok' status, 'error' message on failure.
+        """
+        self.purge()
+        handler = {
+            'add': self._add,
+            'list': self._list,
+            'decrypt': self._decrypt,
+            'clear': self._clear,
+        }.get(request.get('op'))
+        if not handler:
+            return {'ok': False, 'error': "unknown operation"}
+        try:
+            return handler(request)
+        except KeyError as exc:
+            return {'ok': False, 'error': f"missing argument: {exc}"}
+        except (TypeError, ValueError):
+            return {'ok': False, 'error': f"{request['op']} failed"}
+
+
+class _AgentRequestHandler(StreamRequestHandler):
+    """Handle one JSON request line per connection."""
+
+    def handle(self):
+        """Answer a request read from the connection."""
+        try:
+            request = loads(self.rfile.readline())
+        except (JSONDecodeError, UnicodeDecodeError):
+            request = None
+        if isinstance(request, dict):
+            response = self.server.agent.handle(request)
+        else:
+            response = {'ok': False, 'error': "invalid request"}
+        self.wfile.write(dump_json(response).encode('utf-8') + b'\n')
+
+
+class _AgentServer(ThreadingUnixStreamServer):
+    """Key agent server forgetting expired keys between requests."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, agent: _KeyAgent):
+        self.agent = agent
+        # socket is only accessible to the current user
+        previous = umask(0o177)
+        try:
+            super().__init__(str(socket_path), _AgentRequestHandler)
+        finally:
+            umask(previous)
+
+    def service_actions(self):
+        """Forget expired keys while idle."""
+        self.agent.purge()
+
+
+def _serve(args):
+    """Run key agent until interrupted.
+
+    The socket is created in a directory private to the current user,
+    a temporary one if no socket path is given or configured.
+
+    Args:
+        args: Parsed command line arguments with socket and ttl.
+    """
+    socket_path = args.socket or default_socket_path()
+    temporary = socket_path is None
+    if temporary:
+        socket_path = Path(mkdtemp(prefix='generaptor-')) / AGENT_SOCKET_NAME
+    else:
+        socket_path = socket_path.absolute()
+        socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        check_private(socket_path.parent)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    if socket_path.exists():
+        try:
+            agent_request({'op': 'list'}, socket_path)
+        except AgentError:
+            _LOGGER.warning("removing stale socket %s", socket_path)
+            socket_path.unlink()
+        else:
+            _LOGGER.error("agent already running on %s", socket_path)
+            return
+    server = _AgentServer(socket_path, _KeyAgent(ttl=args.ttl))
+    print(dump_json({'socket': str(socket_path), 'env': AGENT_SOCKET_ENV}))
+    _LOGGER.info("agent listening on %s", socket_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        if temporary:
+            socket_path.parent.rmdir()
+        _LOGGER.info("agent stopped")
+
+
+def _add(args):
+    """Unlock private keys and hand them to the key agent.
+
+    Args:
+        args: Parsed command line arguments with socket, ttl and
+            private_keys.
+    """
+    for private_key_path in args.private_keys:
+        try:
+            private_key = load_private_key(private_key_path, use_agent=False)
+        except ValueError:
+            _LOGGER.error("invalid private key and/or passphrase")
+            return
+        if not private_key:
+            return
+        try:
+            response = agent_request(
+                {
+                    'op': 'add',
+                    'key_id': key_id_from_path(private_key_path),
+                    'pem': private_key_to_pem_bytes(
+                        private_key, None
+                    ).decode(),
+                    'ttl': args.ttl,
+                },
+                args.socket,
+            )
+        except AgentError as exc:
+            _LOGGER.error("%s", exc)
+            return
+        print(
+            dump_json(
+                {
+                    'key_id': key_id_from_path(private_key_path),
+                    'expires': response['expires'],
+                }
+            )
+        )
+
+
+def _list(args):
+    """Print keys held by the key agent.
+
+    Args:
+        args: Parsed command line arguments with socket.
+    """
+    try:
+        response = agent_request({'op': 'list'}, args.socket)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    for key in response['keys']:
+        print(dump_json(key))
+
+
+def _clear(args):
+    """Make the key agent forget all keys.
+
+    Args:
+        args: Parsed command line arguments with socket.
+    """
+    try:
+        agent_request({'op': 'clear'}, args.socket)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+
+
+def setup_cmd(cmd):
+    """Setup agent command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    agent = cmd.add_parser(
+        'agent',
+        help="keep unlocked private keys in memory for other commands",
+    )
+    agent.add_argument(
+        '--socket',
+        type=Path,
+        help=f"agent socket, defaults to {AGENT_SOCKET_ENV} environment "
+        "variable or generaptor directory in XDG_RUNTIME_DIR, serve uses a "
+        "private temporary directory otherwise",
+    )
+    action = agent.add_subparsers(dest='action')
+    action.required = True
+    serve = action.add_parser('serve', help="run the agent")
+    serve.add_argument(
+        '--ttl',
+        type=int,
+        default=_DEFAULT_TTL,
+        help="seconds before added keys are forgotten",
+    )
+    serve.set_defaults(func=_serve)
+    add = action.add_parser('add', help="unlock private keys into the agent")
+    add.add_argument(
+        '--ttl',
+        type=int,
+        help="seconds before keys are forgotten, defaults to agent ttl",
+    )
+    add.add_argument(
+        'private_keys',
+        metavar='private_key',
+        nargs='+',
+        type=Path,
+        help="private key files",
+    )
+    add.set_defaults(func=_add)
+    list_cmd = action.add_parser('list', help="list keys held by the agent")
+    list_cmd.set_defaults(func=_list)
+    clear = action.add_parser('clear', help="make the agent forget all keys")
+    clear.set_defaults(func=_clear)
@@ -0,0 +1,89 @@
+"""analyze command module.
+
+This module provides the CLI command estimating the endpoint cost of a
+rule set, optionally filtered by profile or specific targets, before
+generating a collector.
+"""
+
+from ..concept import (
+    OperatingSystem,
+    get_profile_set,
+    get_rule_set,
+    get_rule_set_from_targets,
+)
+from ..concept.rule_analysis import analyze_rule_set
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.analyze')
+
+
+def _analyze_cmd(args):
+    """Handle analyze command execution.
+
+    Args:
+        args: Parsed command line arguments with opsystem, profile, targets
+            and top.
+    """
+    opsystem = OperatingSystem(args.opsystem)
+    if args.profile:
+        profile_set = get_profile_set(args.cache, args.config, opsystem)
+        profile = profile_set.by_name.get(args.profile)
+        if not profile:
+            _LOGGER.error("cannot find profile: %s", args.profile)
+            return
+        rule_set = get_rule_set_from_targets(
+            args.cache, args.config, opsystem, profile.targets
+        )
+    elif args.targets:
+        rule_set = get_rule_set_from_targets(
+            args.cache, args.config, opsystem, args.targets
+        )
+    else:
+        rule_set = get_rule_set(args.cache, args.config, opsystem)
+    if rule_set.empty:
+        _LOGGER.warning("empty rule set, operation canceled.")
+        return
+    analysis = analyze_rule_set(rule_set, opsystem)
+    costs = sorted(analysis.costs, key=lambda cost: cost.score, reverse=True)
+    for cost in costs[: args.top]:
+        print(dump_json({'type': 'rule', **cost.to_dict()}))
+    for warning in analysis.warnings():
+        print(dump_json({'type': 'warning', **warning}))
+    print(dump_json({'type': 'summary', **analysis.summary()}))
+
+
+def setup_cmd(cmd):
+    """Setup analyze command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    analyze = cmd.add_parser(
+        'analyze',
+        help="estimate endpoint cost of rules matching collection targets",
+    )
+    analyze.add_argument(
+        '--top',
+        type=int,
+        default=10,
+        help="number of most expensive rules to print",
+    )
+    analyze.add_argument(
+        'opsystem',
+        choices=[item.value for item in OperatingSystem],
+        help="Operating system",
+    )
+    group = analyze.add_mutually_exclusive_group()
+    group.add_argument(
+        '--profile',
+        help="use given profile (non-interactive)",
+    )
+    group.add_argument(
+        '--targets',
+        metavar='target',
+        default=[],
+        nargs='+',
+        help="collection targets",
+    )
+    analyze.set_defaults(func=_analyze_cmd)
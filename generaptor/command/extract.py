@@ -4,11 +4,27 @@ This module provides the CLI command for extracting collection archives
 using private keys for decryption.
 """
 
-from collections.abc import Iterator
+from os import cpu_count
 from pathlib import Path
 
-from ..concept import Collection, CollectionList, Outcome
-from ..helper.crypto import RSAPrivateKey, load_private_key
+from ..concept import (
+    Collection,
+    CollectionList,
+    Outcome,
+    TargetTier,
+    collection_secrets,
+    enumerate_collections,
+    group_runs,
+)
+from ..concept.baseline import restore_unchanged
+from ..concept.secret_cache import SECRET_CACHE_TTL, SecretCache
+from ..concept.work_queue import TaskState, WorkQueue, default_owner
+from ..helper.agent import AgentError, agent_private_key
+from ..helper.crypto import (
+    RSAPrivateKey,
+    ask_private_key_secret,
+    load_private_key,
+)
 from ..helper.json import dump_json
 from ..helper.logging import get_logger
 
@@ -38,42 +54,55 @@ def _check_same_fingerprint(collections: CollectionList, private_key: Path):
     return True
 
 
-def _enumerate_collections(args) -> Iterator[Collection]:
-    """Enumerate collection archives from command arguments.
+def _check_complete_runs(collections: CollectionList):
+    """Warn about tiered collection runs missing some tiers.
 
     Args:
-        args: Parsed command line arguments with collections paths.
-
-    Yields:
-        Collection: Collection objects for each found archive file.
+        collections (CollectionList): List of collection archives to check.
     """
-    for filepath in args.collections:
-        if filepath.is_file():
-            yield Collection(filepath=filepath)
-            continue
-        if filepath.is_dir():
-            for item in filepath.glob('Collection_*.zip'):
-                yield Collection(filepath=item)
-            continue
-        _LOGGER.warning("skipped %s", filepath)
+    tiers = {tier.value for tier in TargetTier}
+    for run, run_collections in group_runs(collections).items():
+        missing = tiers - {collection.tier for collection in run_collections}
+        if missing:
+            _LOGGER.warning("run %s is missing tiers: %s", run, missing)
 
 
 def _extract_collection(
-    collection: Collection, private_key: RSAPrivateKey, output_directory: Path
-):
+    collection: Collection,
+    private_key: RSAPrivateKey,
+    output_directory: Path,
+    baseline: Path | None = None,
+    decrypted: dict[str, bytes | None] | None = None,
+    secret_cache: SecretCache | None = None,
+) -> Outcome:
     """Extract a single collection archive.
 
+    Tiers of a tiered collection are extracted to the same run directory.
+
     Args:
         collection (Collection): Collection archive to extract.
         private_key (RSAPrivateKey): Private key for decryption.
         output_directory (Path): Base directory for extracted content.
+        baseline (Path | None): Extracted baseline collection directory
+            restoring files skipped by a delta collection.
+        decrypted (dict[str, bytes | None] | None): Secrets decrypted in
+            advance.
+        secret_cache (SecretCache | None): Unlocked secret cache.
+
+    Returns:
+        Outcome: Result of the extraction.
     """
     try:
-        secret = collection.secret(private_key)
+        secret = collection.secret(private_key, decrypted, secret_cache)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return Outcome.FAILURE
     except ValueError:
         _LOGGER.exception("private key does not match collection archive")
-        return
+        return Outcome.FAILURE
     dirname = f'{collection.filepath.stem}'
+    if collection.run:
+        output_directory = output_directory / collection.run
     directory = output_directory / dirname
     directory.mkdir(parents=True, exist_ok=True)
     _LOGGER.info("extracting: %s", collection.filepath)
@@ -81,6 +110,62 @@ def _extract_collection(
     outcome = collection.extract_to(directory, secret)
     if outcome == Outcome.PARTIAL:
         _LOGGER.warning("archive partially extracted")
+    if baseline and outcome != Outcome.FAILURE:
+        restored, missing = restore_unchanged(
+            directory, baseline, collection.opsystem
+        )
+        _LOGGER.info("restored %d unchanged files from baseline", restored)
+        if missing:
+            _LOGGER.warning(
+                "%d unchanged files missing from baseline", missing
+            )
+            outcome = Outcome.PARTIAL
+    return outcome
+
+
+def _extract_queued(
+    args,
+    collections: CollectionList,
+    private_key: RSAPrivateKey,
+    secret_cache: SecretCache | None = None,
+):
+    """Extract collection archives claimed from a shared work queue.
+
+    Collections are identified by their secret so that workers mounting
+    the evidence share at different paths agree on task keys.
+
+    Args:
+        args: Parsed command line arguments with queue options.
+        collections (CollectionList): Collection archives visible to this worker.
+        private_key (RSAPrivateKey): Private key for decryption.
+        secret_cache (SecretCache | None): Unlocked secret cache.
+    """
+    queue = WorkQueue(
+        filepath=args.queue,
+        owner=args.worker_id,
+        lease_duration=args.lease_duration,
+    )
+    by_key = {collection.identifier: collection for collection in collections}
+    queue.submit(
+        (key, collection.filepath.name) for key, collection in by_key.items()
+    )
+    while True:
+        key = queue.claim(by_key)
+        if not key:
+            break
+        with queue.lease(key):
+            outcome = _extract_collection(
+                by_key[key],
+                private_key,
+                args.output_directory,
+                args.baseline,
+                secret_cache=secret_cache,
+            )
+        queue.complete(
+            key,
+            TaskState.FAILED if outcome == Outcome.FAILURE else TaskState.DONE,
+        )
+    _LOGGER.info("queue state: %s", queue.counts())
 
 
 def _extract_cmd(args):
@@ -89,18 +174,53 @@ def _extract_cmd(args):
     Args:
         args: Parsed command line arguments with private_key, collections, and output_directory.
     """
-    collections = list(_enumerate_collections(args))
+    collections = list(enumerate_collections(args.collections))
     if not _check_same_fingerprint(collections, args.private_key):
         return
+    _check_complete_runs(collections)
+    private_key_secret = None
+    secret_cache = None
+    agent_key = agent_private_key(args.private_key)
+    if args.secret_cache and agent_key:
+        _LOGGER.info("agent holds private key, secret cache not used")
+    elif args.secret_cache:
+        private_key_secret = ask_private_key_secret()
+        if not private_key_secret:
+            _LOGGER.error("secret cache requires private key passphrase")
+            return
     try:
-        private_key = load_private_key(args.private_key)
+        private_key = agent_key or load_private_key(
+            args.private_key, private_key_secret, use_agent=False
+        )
     except ValueError:
         _LOGGER.exception("invalid private key and/or passphrase")
         return
     if not private_key:
         return
-    for collection in collections:
-        _extract_collection(collection, private_key, args.output_directory)
+    if private_key_secret:
+        # unlock once the passphrase is known to decrypt the private key
+        secret_cache = args.cache.secret_cache.unlock(
+            private_key_secret, args.secret_cache_ttl
+        )
+    if args.queue:
+        _extract_queued(args, collections, private_key, secret_cache)
+    else:
+        try:
+            decrypted = collection_secrets(
+                collections, private_key, args.workers, secret_cache
+            )
+        except AgentError as exc:
+            _LOGGER.error("%s", exc)
+            return
+        for collection in collections:
+            _extract_collection(
+                collection,
+                private_key,
+                args.output_directory,
+                args.baseline,
+                decrypted,
+                secret_cache,
+            )
     print(dump_json({'directory': str(args.output_directory)}))
 
 
@@ -121,6 +241,49 @@ def setup_cmd(cmd):
         default=Path('extracted'),
         help="set output directory",
     )
+    extract.add_argument(
+        '--baseline',
+        type=Path,
+        help="extracted baseline collection directory, restores files "
+        "skipped by delta collections",
+    )
+    extract.add_argument(
+        '--secret-cache',
+        action='store_true',
+        help="reuse secrets decrypted previously, stored encrypted with a "
+        "key derived from the private key passphrase, not used when the "
+        "key agent holds the private key",
+    )
+    extract.add_argument(
+        '--secret-cache-ttl',
+        type=int,
+        default=SECRET_CACHE_TTL,
+        help="seconds before secrets stored in the secret cache expire",
+    )
+    extract.add_argument(
+        '--queue',
+        type=Path,
+        help="share collections between workers using this SQLite queue file",
+    )
+    extract.add_argument(
+        '--lease-duration',
+        type=float,
+        default=300.0,
+        help="seconds after which a collection claimed by a dead worker is reclaimed",
+    )
+    extract.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of secrets decrypted in parallel, queue workers "
+        "decrypt secrets of claimed collections only",
+    )
+    extract.add_argument(
+        '--worker-id',
+        default=default_owner(),
+        help="worker identifier in the queue, defaults to hostname:pid",
+    )
     extract.add_argument(
         'private_key',
         type=Path,
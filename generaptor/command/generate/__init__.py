@@ -6,7 +6,13 @@ with platform-specific subcommands for Windows, Linux, and macOS.
 
 from pathlib import Path
 
+from ...concept import (
+    DEFAULT_PERFORMANCE_PROFILE,
+    PERFORMANCE_PROFILES,
+    RepackMethod,
+)
 from ...helper.prompt import INTERACTIVE_PROMPT_AVAILABLE
+from .batch import setup_target as setup_batch
 from .darwin import setup_target as setup_darwin
 from .linux import setup_target as setup_linux
 from .windows import setup_target as setup_windows
@@ -53,8 +59,100 @@ def setup_cmd(cmd):
         "reading GENERAPTOR_PK_SECRET environment variable (ignored if "
         "--x509 is used)",
     )
+    generate.add_argument(
+        '--no-key-pool',
+        action='store_true',
+        help="always generate a private key instead of claiming one from "
+        "the key pool filled by key-pool command",
+    )
+    generate.add_argument(
+        '--no-build-cache',
+        action='store_true',
+        help="always repack collectors instead of serving identical builds "
+        "from the build cache",
+    )
+    generate.add_argument(
+        '--no-optimize-globs',
+        action='store_true',
+        help="render one glob per rule instead of deduplicating, pruning "
+        "and merging globs",
+    )
+    generate.add_argument(
+        '--log-globs',
+        action='store_true',
+        help="make collector log every loaded glob",
+    )
+    generate.add_argument(
+        '--tiered',
+        action='store_true',
+        help="collect volatile artifacts and fast tier targets in a first "
+        "archive before collecting other targets in a second archive",
+    )
+    generate.add_argument(
+        '--baseline',
+        type=Path,
+        help="previous collection archive or baseline manifest, files it "
+        "uploaded are not uploaded again when unchanged",
+    )
+    generate.add_argument(
+        '--baseline-key',
+        type=Path,
+        help="private key of the baseline collection, only required if it "
+        "was not hashed yet",
+    )
+    generate.add_argument(
+        '--repack',
+        default=RepackMethod.AUTO.value,
+        choices=[method.value for method in RepackMethod],
+        help="embed configuration natively, using the platform binary, or "
+        "natively with platform binary fallback",
+    )
+    generate.add_argument(
+        '--verify-repack',
+        action='store_true',
+        help="compare native repack output with platform binary output",
+    )
+    generate.add_argument(
+        '--performance',
+        default=DEFAULT_PERFORMANCE_PROFILE,
+        choices=list(PERFORMANCE_PROFILES),
+        help="collector performance profile controlling endpoint resource "
+        "usage",
+    )
+    generate.add_argument(
+        '--compression-level',
+        type=int,
+        metavar='N',
+        help="override collection archive compression level (0-9)",
+    )
+    generate.add_argument(
+        '--cpu-limit',
+        type=int,
+        metavar='PERCENT',
+        help="override collector CPU usage limit, 0 means no limit",
+    )
+    generate.add_argument(
+        '--ops-per-sec',
+        type=int,
+        metavar='N',
+        help="override collector operations per second limit, 0 means no "
+        "limit",
+    )
+    generate.add_argument(
+        '--artifact-timeout',
+        type=int,
+        metavar='SECONDS',
+        help="override per-artifact timeout, 0 means Velociraptor default",
+    )
+    generate.add_argument(
+        '--ntfs-cache-time',
+        type=int,
+        metavar='SECONDS',
+        help="override NTFS parser cache flush period (windows only)",
+    )
     target = generate.add_subparsers(dest='target')
     target.required = True
+    setup_batch(target)
     setup_darwin(target)
     setup_linux(target)
     setup_windows(target)
@@ -0,0 +1,289 @@
+"""Generate batch target module.
+
+This module provides the command generating several collectors described
+in a job file, sharing loaded sets and certificate between them.
+"""
+
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from os import cpu_count
+from pathlib import Path
+from re import sub
+
+from jinja2 import TemplateError
+
+from ...concept import (
+    Architecture,
+    Collector,
+    CollectorConfig,
+    Distribution,
+    MetadataWalk,
+    OperatingSystem,
+    RepackMethod,
+    get_profile_set,
+    get_rule_set,
+    get_target_set,
+)
+from ...concept.rule_analysis import assign_accessors
+from ...helper.crypto import provide_x509_certificate
+from ...helper.json import dump_json, load_jsonl
+from ...helper.logging import get_logger
+from ...helper.validation import check_device
+from .helper import select_performance
+
+_LOGGER = get_logger('command.generate.batch')
+
+
+@dataclass
+class _SetsLoader:
+    """Load rule, target and profile sets once per operating system."""
+
+    args: Namespace
+    sets: dict = field(default_factory=dict)
+
+    def get(self, opsystem: OperatingSystem):
+        """Retrieve sets for given operating system.
+
+        Args:
+            opsystem (OperatingSystem): Target operating system.
+
+        Returns:
+            tuple: Rule set, target set and profile set.
+        """
+        if opsystem not in self.sets:
+            cache, config = self.args.cache, self.args.config
+            self.sets[opsystem] = (
+                get_rule_set(cache, config, opsystem),
+                get_target_set(cache, config, opsystem),
+                get_profile_set(cache, config, opsystem),
+            )
+        return self.sets[opsystem]
+
+
+def _job_name(index: int, job: dict) -> str:
+    """Build a filename-safe job name.
+
+    Args:
+        index (int): Job line index in the job file.
+        job (dict): Job description.
+
+    Returns:
+        str: Job name.
+    """
+    name = job.get('name') or '-'.join(
+        [
+            job['opsystem'],
+            job.get('arch', Architecture.AMD64.value),
+            job.get('profile', 'custom' if job.get('targets') else 'default'),
+            str(index),
+        ]
+    )
+    return sub(r'[^\w.-]+', '_', name)
+
+
+def _job_config(
+    job: dict, sets: _SetsLoader, default_profile: str, default_tiered: bool
+) -> dict | None:
+    """Build collector configuration parameters for a job.
+
+    Args:
+        job (dict): Job description.
+        sets (_SetsLoader): Sets loader.
+        default_profile (str): Profile used when job selects neither a
+            profile nor targets.
+        default_tiered (bool): Tiered collection when job does not specify.
+
+    Returns:
+        dict | None: Collector configuration parameters except certificate,
+            or None if the job is invalid.
+    """
+    distribution = Distribution(
+        arch=Architecture(job.get('arch', Architecture.AMD64.value)),
+        opsystem=OperatingSystem(job['opsystem']),
+    )
+    device = job.get('device', '')
+    if not check_device(device):
+        return None
+    rule_set, target_set, profile_set = sets.get(distribution.opsystem)
+    if not rule_set or not target_set:
+        _LOGGER.error("cannot load rules and targets")
+        return None
+    targets = job.get('targets')
+    if not targets:
+        if not profile_set:
+            _LOGGER.error("cannot load profiles")
+            return None
+        profile_name = job.get('profile', default_profile)
+        profile = profile_set.by_name.get(profile_name)
+        if not profile:
+            _LOGGER.error("cannot find profile: %s", profile_name)
+            return None
+        targets = profile.targets
+    if job.get('tiered', default_tiered):
+        fast_rule_set, rule_set = target_set.select_tiers(rule_set, targets)
+    else:
+        fast_rule_set, rule_set = None, target_set.select(rule_set, targets)
+    if rule_set.empty and (fast_rule_set is None or fast_rule_set.empty):
+        _LOGGER.error("empty rule set")
+        return None
+    if distribution.opsystem == OperatingSystem.LINUX:
+        metadata_walk = job.get('metadata_walk')
+        if metadata_walk is not None:
+            metadata_walk = MetadataWalk(
+                **{'root': device or '/', **metadata_walk}
+            )
+        return {
+            'device': device,
+            'rule_set': rule_set,
+            'fast_rule_set': fast_rule_set,
+            'distribution': distribution,
+            'metadata_walk': metadata_walk,
+        }
+    if distribution.opsystem != OperatingSystem.WINDOWS:
+        return {
+            'device': device,
+            'rule_set': rule_set,
+            'fast_rule_set': fast_rule_set,
+            'distribution': distribution,
+        }
+    if device and not device.endswith(':'):
+        _LOGGER.warning("assuming device name is '%s:'", device)
+        device += ':'
+    if job.get('assign_accessors', False):
+        rule_set = assign_accessors(rule_set, distribution.opsystem)
+        if fast_rule_set is not None:
+            fast_rule_set = assign_accessors(
+                fast_rule_set, distribution.opsystem
+            )
+    return {
+        'device': device,
+        'rule_set': rule_set,
+        'fast_rule_set': fast_rule_set,
+        'distribution': distribution,
+        'memdump': job.get('memdump', False),
+        'dont_be_lazy': job.get('dont_be_lazy', False),
+        'vss_analysis_age': job.get('vss_analysis_age', 0),
+        'use_auto_accessor': job.get('use_auto_accessor', True),
+        'device_workers': max(1, job.get('device_workers', 1)),
+    }
+
+
+def _load_jobs(args) -> dict[str, dict]:
+    """Load jobs from job file.
+
+    Args:
+        args: Parsed command line arguments with jobs and profile.
+
+    Returns:
+        dict[str, dict]: Collector configuration parameters indexed by job
+            name, empty if any job is invalid.
+    """
+    sets = _SetsLoader(args)
+    configs = {}
+    for index, job in enumerate(load_jsonl(args.jobs)):
+        try:
+            name = _job_name(index, job)
+            config = _job_config(job, sets, args.profile, args.tiered)
+            performance = select_performance(args, job.get('performance'))
+        except (KeyError, TypeError, ValueError) as exc:
+            _LOGGER.error("invalid job #%d: %s (%s)", index, job, exc)
+            return {}
+        if not config:
+            _LOGGER.error("invalid job #%d: %s", index, name)
+            return {}
+        if name in configs:
+            _LOGGER.error("duplicate job name: %s", name)
+            return {}
+        config['performance'] = performance
+        configs[name] = config
+    return configs
+
+
+def _generate_batch_cmd(args):
+    """Handle batch collectors generation command.
+
+    Args:
+        args: Parsed command line arguments with jobs and workers.
+    """
+    _LOGGER.info("starting batch collector generator...")
+    configs = _load_jobs(args)
+    if not configs:
+        _LOGGER.warning("no valid job, operation canceled.")
+        return
+    try:
+        certificate = provide_x509_certificate(
+            args.output_directory,
+            args.x509_certificate,
+            args.ask_password,
+            key_pool=(None if args.no_key_pool else args.cache.key_pool),
+        )
+    except KeyboardInterrupt:
+        print()
+        _LOGGER.warning("operation canceled.")
+        return
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                Collector(
+                    config=CollectorConfig(
+                        certificate=certificate,
+                        optimize_globs=(not args.no_optimize_globs),
+                        log_globs=args.log_globs,
+                        **config,
+                    )
+                ).generate,
+                args.cache,
+                args.config,
+                args.output_directory,
+                name=f'collector-{timestamp}-{name}',
+                use_build_cache=(not args.no_build_cache),
+                repack_method=RepackMethod(args.repack),
+                verify=args.verify_repack,
+            ): name
+            for name, config in configs.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except (OSError, TemplateError, ValueError):
+                _LOGGER.exception("failed to generate collector: %s", name)
+                continue
+            if not result:
+                _LOGGER.error("failed to generate collector: %s", name)
+                continue
+            binary, config = result
+            print(
+                dump_json(
+                    {'job': name, 'binary': str(binary), 'config': str(config)}
+                )
+            )
+
+
+def setup_target(target):
+    """Setup batch target.
+
+    Args:
+        target: argparse subparsers object to add the batch target command to.
+    """
+    batch = target.add_parser(
+        'batch', help="generate collectors described in a job file"
+    )
+    batch.set_defaults(func=_generate_batch_cmd)
+    batch.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of collectors generated in parallel",
+    )
+    batch.add_argument(
+        'jobs',
+        type=Path,
+        help="JSONL job file, one collector per line with opsystem and "
+        "optional name, arch, device, profile or targets, tiered, "
+        "performance, linux metadata_walk and windows options",
+    )
@@ -9,12 +9,19 @@ from ...concept import (
     CollectorConfig,
     Distribution,
     OperatingSystem,
-    get_rule_set_from_targets,
+    RepackMethod,
 )
+from ...helper.agent import AgentError
 from ...helper.crypto import provide_x509_certificate
 from ...helper.logging import get_logger
 from ...helper.validation import check_device
-from .helper import ProfileNotFoundError, select_targets
+from .helper import (
+    ProfileNotFoundError,
+    select_baseline,
+    select_performance,
+    select_rule_sets,
+    select_targets,
+)
 
 _LOGGER = get_logger('command.generate.darwin')
 
@@ -32,22 +39,37 @@ def _generate_darwin_cmd(args):
         arch=Architecture(args.arch),
         opsystem=OperatingSystem.DARWIN,
     )
+    try:
+        performance = select_performance(args)
+    except ValueError as exc:
+        _LOGGER.error("invalid performance settings: %s", exc)
+        return
+    try:
+        baseline = select_baseline(args, distribution.opsystem)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    except ValueError as exc:
+        _LOGGER.error("invalid baseline: %s", exc)
+        return
     try:
         targets = select_targets(args, distribution.opsystem)
     except ProfileNotFoundError:
         _LOGGER.error("cannot find profile: %s", args.profile)
         return
     try:
-        rule_set = get_rule_set_from_targets(
-            args.cache, args.config, distribution.opsystem, targets
-        )
-        if rule_set.empty:
+        rule_sets = select_rule_sets(args, distribution.opsystem, targets)
+        if not rule_sets:
+            return
+        fast_rule_set, rule_set = rule_sets
+        if rule_set.empty and (fast_rule_set is None or fast_rule_set.empty):
             _LOGGER.warning("empty rule set, operation canceled.")
             return
         certificate = provide_x509_certificate(
             args.output_directory,
             args.x509_certificate,
             args.ask_password,
+            key_pool=(None if args.no_key_pool else args.cache.key_pool),
         )
     except KeyboardInterrupt:
         print()
@@ -58,9 +80,21 @@ def _generate_darwin_cmd(args):
         rule_set=rule_set,
         certificate=certificate,
         distribution=distribution,
+        optimize_globs=(not args.no_optimize_globs),
+        performance=performance,
+        log_globs=args.log_globs,
+        fast_rule_set=fast_rule_set,
+        baseline=baseline,
     )
     collector = Collector(config=config)
-    collector.generate(args.cache, args.config, args.output_directory)
+    collector.generate(
+        args.cache,
+        args.config,
+        args.output_directory,
+        use_build_cache=(not args.no_build_cache),
+        repack_method=RepackMethod(args.repack),
+        verify=args.verify_repack,
+    )
 
 
 def setup_target(target):
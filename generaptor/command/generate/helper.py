@@ -4,7 +4,24 @@ This module provides helper functionality for the generate command,
 including target selection and profile handling.
 """
 
-from ...concept import OperatingSystem, get_profile_set
+from uuid import UUID
+
+from ...concept import (
+    PERFORMANCE_PROFILES,
+    Collection,
+    OperatingSystem,
+    PerformanceProfile,
+    RuleSet,
+    get_profile_set,
+    get_rule_set_from_targets,
+    get_tier_rule_sets_from_targets,
+)
+from ...concept.baseline import (
+    BaselineEntryList,
+    baseline_from_collection,
+    load_baseline,
+)
+from ...helper.crypto import load_private_key
 from ...helper.logging import get_logger
 
 _LOGGER = get_logger('command.generate.helper')
@@ -38,3 +55,101 @@ def select_targets(args, opsystem: OperatingSystem):
     if not profile:
         raise ProfileNotFoundError
     return profile.targets
+
+
+def select_rule_sets(
+    args, opsystem: OperatingSystem, targets: list[str | UUID]
+) -> tuple[RuleSet | None, RuleSet] | None:
+    """Select rule sets for given operating system and targets.
+
+    Args:
+        args: Parsed command line arguments with tiered flag.
+        opsystem (OperatingSystem): Target operating system.
+        targets (list[str | UUID]): List of target names or GUIDs, empty for
+            interactive selection.
+
+    Returns:
+        tuple[RuleSet | None, RuleSet] | None: Fast tier rule set, None if
+            the collector is not tiered, and bulk tier rule set, or None if
+            rules and targets cannot be loaded.
+    """
+    if not args.tiered:
+        rule_set = get_rule_set_from_targets(
+            args.cache, args.config, opsystem, targets
+        )
+        if not rule_set:
+            _LOGGER.error("cannot load rules and targets")
+            return None
+        return None, rule_set
+    rule_sets = get_tier_rule_sets_from_targets(
+        args.cache, args.config, opsystem, targets
+    )
+    if not rule_sets:
+        _LOGGER.error("cannot load rules and targets")
+        return None
+    fast_rule_set, rule_set = rule_sets
+    if fast_rule_set.empty:
+        _LOGGER.warning(
+            "no fast tier target selected, fast tier only collects volatile "
+            "artifacts"
+        )
+    return fast_rule_set, rule_set
+
+
+def select_performance(args, name: str | None = None) -> PerformanceProfile:
+    """Select performance profile and apply command line overrides.
+
+    Args:
+        args: Parsed command line arguments with performance settings.
+        name (str | None): Profile name, defaults to command line profile.
+
+    Returns:
+        PerformanceProfile: Selected performance profile.
+
+    Raises:
+        KeyError: If the performance profile does not exist.
+        ValueError: If an overridden setting is invalid.
+    """
+    profile = PERFORMANCE_PROFILES[name or args.performance]
+    return profile.override(
+        compression_level=args.compression_level,
+        cpu_limit=args.cpu_limit,
+        ops_per_sec=args.ops_per_sec,
+        timeout=args.artifact_timeout,
+        ntfs_cache_time=args.ntfs_cache_time,
+    )
+
+
+def select_baseline(
+    args, opsystem: OperatingSystem
+) -> BaselineEntryList | None:
+    """Load baseline manifest or build it from a previous collection.
+
+    Args:
+        args: Parsed command line arguments with baseline settings.
+        opsystem (OperatingSystem): Target operating system.
+
+    Returns:
+        BaselineEntryList | None: Baseline manifest entries, or None if no
+            baseline is given.
+
+    Raises:
+        AgentError: If the agent holding the baseline key is unreachable or
+            rejects a request.
+        ValueError: If the baseline is invalid.
+    """
+    if not args.baseline:
+        return None
+    if args.baseline.suffix != '.zip':
+        return load_baseline(args.baseline)
+    collection = Collection(filepath=args.baseline)
+    if collection.opsystem != opsystem:
+        raise ValueError(
+            f"baseline collection operating system is {collection.opsystem}"
+        )
+    private_key = None
+    if args.baseline_key:
+        private_key = load_private_key(args.baseline_key)
+    return baseline_from_collection(
+        collection, args.cache.digest_cache, private_key
+    )
@@ -8,17 +8,50 @@ from ...concept import (
     Collector,
     CollectorConfig,
     Distribution,
+    MetadataWalk,
     OperatingSystem,
-    get_rule_set_from_targets,
+    RepackMethod,
 )
+from ...helper.agent import AgentError
 from ...helper.crypto import provide_x509_certificate
 from ...helper.logging import get_logger
 from ...helper.validation import check_device
-from .helper import ProfileNotFoundError, select_targets
+from .helper import (
+    ProfileNotFoundError,
+    select_baseline,
+    select_performance,
+    select_rule_sets,
+    select_targets,
+)
 
 _LOGGER = get_logger('command.generate.linux')
 
 
+def _metadata_walk(args) -> MetadataWalk | None:
+    """Build native file metadata walk settings.
+
+    Args:
+        args: Parsed command line arguments with metadata walk settings.
+
+    Returns:
+        MetadataWalk | None: Metadata walk settings, or None if native
+            metadata walk is disabled.
+
+    Raises:
+        ValueError: If a setting is invalid.
+    """
+    if not args.native_metadata:
+        return None
+    settings = {'root': args.metadata_root or args.device or '/'}
+    if args.metadata_depth is not None:
+        settings['depth'] = args.metadata_depth
+    if args.metadata_ops_per_sec is not None:
+        settings['ops_per_sec'] = args.metadata_ops_per_sec
+    if args.metadata_excluded_fstypes is not None:
+        settings['excluded_fstypes'] = tuple(args.metadata_excluded_fstypes)
+    return MetadataWalk(**settings)
+
+
 def _generate_linux_cmd(args):
     """Handle Linux collector generation command.
 
@@ -32,22 +65,42 @@ def _generate_linux_cmd(args):
         arch=Architecture(args.arch),
         opsystem=OperatingSystem.LINUX,
     )
+    try:
+        performance = select_performance(args)
+    except ValueError as exc:
+        _LOGGER.error("invalid performance settings: %s", exc)
+        return
+    try:
+        metadata_walk = _metadata_walk(args)
+    except ValueError as exc:
+        _LOGGER.error("invalid metadata walk settings: %s", exc)
+        return
+    try:
+        baseline = select_baseline(args, distribution.opsystem)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    except ValueError as exc:
+        _LOGGER.error("invalid baseline: %s", exc)
+        return
     try:
         targets = select_targets(args, distribution.opsystem)
     except ProfileNotFoundError:
         _LOGGER.error("cannot find profile: %s", args.profile)
         return
     try:
-        rule_set = get_rule_set_from_targets(
-            args.cache, args.config, distribution.opsystem, targets
-        )
-        if rule_set.empty:
+        rule_sets = select_rule_sets(args, distribution.opsystem, targets)
+        if not rule_sets:
+            return
+        fast_rule_set, rule_set = rule_sets
+        if rule_set.empty and (fast_rule_set is None or fast_rule_set.empty):
             _LOGGER.warning("empty rule set, operation canceled.")
             return
         certificate = provide_x509_certificate(
             args.output_directory,
             args.x509_certificate,
             args.ask_password,
+            key_pool=(None if args.no_key_pool else args.cache.key_pool),
         )
     except KeyboardInterrupt:
         print()
@@ -58,9 +111,22 @@ def _generate_linux_cmd(args):
         rule_set=rule_set,
         certificate=certificate,
         distribution=distribution,
+        optimize_globs=(not args.no_optimize_globs),
+        performance=performance,
+        log_globs=args.log_globs,
+        fast_rule_set=fast_rule_set,
+        baseline=baseline,
+        metadata_walk=metadata_walk,
     )
     collector = Collector(config=config)
-    collector.generate(args.cache, args.config, args.output_directory)
+    collector.generate(
+        args.cache,
+        args.config,
+        args.output_directory,
+        use_build_cache=(not args.no_build_cache),
+        repack_method=RepackMethod(args.repack),
+        verify=args.verify_repack,
+    )
 
 
 def setup_target(target):
@@ -84,3 +150,33 @@ def setup_target(target):
         default='',
         help="set root directory (absolute path), empty means '/'",
     )
+    linux.add_argument(
+        '--native-metadata',
+        action='store_true',
+        help="collect file metadata walking the file system natively "
+        "instead of running 'find / -ls'",
+    )
+    linux.add_argument(
+        '--metadata-root',
+        help="directory walked by the native metadata walk, defaults to "
+        "device or '/'",
+    )
+    linux.add_argument(
+        '--metadata-depth',
+        type=int,
+        metavar='N',
+        help="maximum recursion depth of the native metadata walk",
+    )
+    linux.add_argument(
+        '--metadata-ops-per-sec',
+        type=int,
+        metavar='N',
+        help="operations per second limit of the native metadata walk",
+    )
+    linux.add_argument(
+        '--metadata-excluded-fstypes',
+        nargs='*',
+        metavar='FSTYPE',
+        help="file system types whose mount points are not walked, "
+        "replaces default types (proc, sysfs, nfs, cifs, fuse.*...)",
+    )
@@ -9,12 +9,20 @@ from ...concept import (
     CollectorConfig,
     Distribution,
     OperatingSystem,
-    get_rule_set_from_targets,
+    RepackMethod,
 )
+from ...concept.rule_analysis import assign_accessors
+from ...helper.agent import AgentError
 from ...helper.crypto import provide_x509_certificate
 from ...helper.logging import get_logger
 from ...helper.validation import check_device
-from .helper import ProfileNotFoundError, select_targets
+from .helper import (
+    ProfileNotFoundError,
+    select_baseline,
+    select_performance,
+    select_rule_sets,
+    select_targets,
+)
 
 _LOGGER = get_logger('command.generate.windows')
 
@@ -28,6 +36,11 @@ def _generate_windows_cmd(args):
     _LOGGER.info("starting windows collector generator...")
     if not check_device(args.device):
         return
+    if args.device_workers < 1:
+        _LOGGER.error("device workers must be at least 1")
+        return
+    if args.device_workers > 1 and args.memdump:
+        _LOGGER.warning("memory will be dumped concurrently for each device")
     if args.device and not args.device.endswith(':'):
         _LOGGER.warning("assuming device name is '%s:'", args.device)
         args.device += ':'
@@ -35,22 +48,43 @@ def _generate_windows_cmd(args):
         arch=Architecture(args.arch),
         opsystem=OperatingSystem.WINDOWS,
     )
+    try:
+        performance = select_performance(args)
+    except ValueError as exc:
+        _LOGGER.error("invalid performance settings: %s", exc)
+        return
+    try:
+        baseline = select_baseline(args, distribution.opsystem)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    except ValueError as exc:
+        _LOGGER.error("invalid baseline: %s", exc)
+        return
     try:
         targets = select_targets(args, distribution.opsystem)
     except ProfileNotFoundError:
         _LOGGER.error("cannot find profile: %s", args.profile)
         return
     try:
-        rule_set = get_rule_set_from_targets(
-            args.cache, args.config, distribution.opsystem, targets
-        )
-        if rule_set.empty:
+        rule_sets = select_rule_sets(args, distribution.opsystem, targets)
+        if not rule_sets:
+            return
+        fast_rule_set, rule_set = rule_sets
+        if rule_set.empty and (fast_rule_set is None or fast_rule_set.empty):
             _LOGGER.warning("empty rule set, operation canceled.")
             return
+        if args.assign_accessors:
+            rule_set = assign_accessors(rule_set, distribution.opsystem)
+            if fast_rule_set is not None:
+                fast_rule_set = assign_accessors(
+                    fast_rule_set, distribution.opsystem
+                )
         certificate = provide_x509_certificate(
             args.output_directory,
             args.x509_certificate,
             args.ask_password,
+            key_pool=(None if args.no_key_pool else args.cache.key_pool),
         )
     except KeyboardInterrupt:
         print()
@@ -61,13 +95,26 @@ def _generate_windows_cmd(args):
         rule_set=rule_set,
         certificate=certificate,
         distribution=distribution,
+        optimize_globs=(not args.no_optimize_globs),
+        performance=performance,
+        log_globs=args.log_globs,
+        fast_rule_set=fast_rule_set,
+        baseline=baseline,
         memdump=args.memdump,
         dont_be_lazy=args.dont_be_lazy,
         vss_analysis_age=args.vss_analysis_age,
         use_auto_accessor=(not args.no_auto_accessor),
+        device_workers=args.device_workers,
     )
     collector = Collector(config=config)
-    collector.generate(args.cache, args.config, args.output_directory)
+    collector.generate(
+        args.cache,
+        args.config,
+        args.output_directory,
+        use_build_cache=(not args.no_build_cache),
+        repack_method=RepackMethod(args.repack),
+        verify=args.verify_repack,
+    )
 
 
 def setup_target(target):
@@ -101,6 +148,12 @@ def setup_target(target):
         action='store_true',
         help="disable auto accessor (which automatically select fastest collection technique)",
     )
+    windows.add_argument(
+        '--assign-accessors',
+        action='store_true',
+        help="assign cheapest correct accessor to rules, raw ntfs parsing "
+        "is kept for NTFS metadata files and alternate data streams only",
+    )
     windows.add_argument(
         '--vss-analysis-age',
         type=int,
@@ -108,6 +161,13 @@ def setup_target(target):
         metavar='N',
         help="analyze VSS within N days ago, 0 means no VSS analysis",
     )
+    windows.add_argument(
+        '--device-workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help="collect up to N devices in parallel, one archive per device",
+    )
     windows.add_argument(
         '--dont-be-lazy',
         action='store_true',
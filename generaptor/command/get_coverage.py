@@ -0,0 +1,185 @@
+"""get-coverage command module.
+
+This module provides the CLI command for reporting which rules and targets
+collected files and how many bytes they account for in collection archives.
+"""
+
+from os import cpu_count
+from pathlib import Path
+
+from ..concept import (
+    Collection,
+    OperatingSystem,
+    enumerate_collections,
+    get_rule_set,
+    get_target_set,
+    process_collections,
+)
+from ..concept.coverage import CoverageReport, RuleMatcher
+from ..helper.agent import AgentError
+from ..helper.crypto import load_private_key
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.get_coverage')
+
+
+def _list_members(
+    collection: Collection, secret: str
+) -> list[tuple[str, int]]:
+    """List collection archive members names and sizes.
+
+    Args:
+        collection (Collection): Collection archive.
+        secret (str): Secret for decrypting the archive.
+
+    Returns:
+        list[tuple[str, int]]: Member names and uncompressed sizes.
+    """
+    with collection.open_data(secret) as data_zipf:
+        return [
+            (member.filename, member.file_size)
+            for member in data_zipf.infolist()
+            if not member.is_dir()
+        ]
+
+
+def _create_report(args, opsystem: OperatingSystem) -> CoverageReport | None:
+    """Create coverage report for given operating system.
+
+    Args:
+        args: Parsed command line arguments with cache and config.
+        opsystem (OperatingSystem): Operating system of the collections.
+
+    Returns:
+        CoverageReport | None: Empty coverage report, or None if rules or
+            targets cannot be loaded.
+    """
+    rule_set = get_rule_set(args.cache, args.config, opsystem)
+    target_set = get_target_set(args.cache, args.config, opsystem)
+    if not rule_set or not target_set:
+        _LOGGER.error("cannot load rules and targets for %s", opsystem.value)
+        return None
+    return CoverageReport(
+        matcher=RuleMatcher(rule_set=rule_set, opsystem=opsystem),
+        target_set=target_set,
+    )
+
+
+def _list_uncached(args, pending: list[Collection]):
+    """List uncached collections members in parallel.
+
+    Args:
+        args: Parsed command line arguments with private_key and workers.
+        pending (list[Collection]): Collections without cached digests.
+
+    Yields:
+        tuple[Collection, list[tuple[str, int]]]: Collection and its members.
+
+    Raises:
+        AgentError: If the agent holding the private key is unreachable or
+            rejects a request.
+    """
+    try:
+        private_key = load_private_key(args.private_key)
+    except ValueError:
+        _LOGGER.error("invalid private key and/or passphrase")
+        return
+    if not private_key:
+        return
+    yield from process_collections(
+        _list_members, pending, private_key, workers=args.workers
+    )
+
+
+def _get_coverage_cmd(args):
+    """Handle get-coverage command execution.
+
+    Args:
+        args: Parsed command line arguments with private_key and collections.
+    """
+    reports = {}
+    pending = []
+    collected = []
+    for collection in enumerate_collections(args.collections):
+        opsystem = collection.opsystem
+        if not opsystem:
+            _LOGGER.warning(
+                "unknown operating system, skipped %s", collection.filepath
+            )
+            continue
+        if opsystem not in reports:
+            reports[opsystem] = _create_report(args, opsystem)
+        if not reports[opsystem]:
+            continue
+        digests = args.cache.digest_cache.load(collection)
+        if digests is None:
+            pending.append(collection)
+            continue
+        collected.append(
+            (collection, [(digest.member, digest.size) for digest in digests])
+        )
+    if pending:
+        _LOGGER.info("listing %d uncached collections...", len(pending))
+        try:
+            collected.extend(_list_uncached(args, pending))
+        except AgentError as exc:
+            _LOGGER.error("%s", exc)
+            return
+    for collection, members in collected:
+        reports[collection.opsystem].add(str(collection.filepath), members)
+    for opsystem, report in reports.items():
+        if not report:
+            continue
+        for kind, rows in (
+            ('rule', report.rule_rows()),
+            ('target', report.target_rows()),
+        ):
+            for row in rows:
+                print(
+                    dump_json(
+                        {'opsystem': opsystem.value, 'type': kind, **row}
+                    )
+                )
+        if report.unmatched.files:
+            print(
+                dump_json(
+                    {
+                        'opsystem': opsystem.value,
+                        'type': 'unmatched',
+                        **report.unmatched.to_dict(),
+                    }
+                )
+            )
+
+
+def setup_cmd(cmd):
+    """Setup get-coverage command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    get_coverage = cmd.add_parser(
+        'get-coverage',
+        help="get files count and bytes collected per rule and target",
+    )
+    get_coverage.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of collection archives listed in parallel",
+    )
+    get_coverage.add_argument(
+        'private_key',
+        type=Path,
+        help="private key, only loaded if some collections are not cached",
+    )
+    get_coverage.add_argument(
+        'collections',
+        metavar='collection',
+        nargs='+',
+        type=Path,
+        help="collection archives",
+    )
+    get_coverage.set_defaults(func=_get_coverage_cmd)
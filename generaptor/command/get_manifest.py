@@ -0,0 +1,70 @@
+"""get-manifest command module.
+
+This module provides the CLI command building the baseline manifest of a
+collection archive, for generating delta collectors.
+"""
+
+from pathlib import Path
+
+from ..concept import DATA_ERRORS, Collection
+from ..concept.baseline import baseline_from_collection
+from ..helper.agent import AgentError
+from ..helper.crypto import load_private_key
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.get_manifest')
+
+
+def _get_manifest_cmd(args):
+    """Handle get-manifest command execution.
+
+    Args:
+        args: Parsed command line arguments with private_key and collection.
+    """
+    collection = Collection(filepath=args.collection)
+    private_key = None
+    if args.private_key:
+        try:
+            private_key = load_private_key(args.private_key)
+        except ValueError:
+            _LOGGER.error("invalid private key and/or passphrase")
+            return
+    try:
+        entries = baseline_from_collection(
+            collection, args.cache.digest_cache, private_key
+        )
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    except ValueError as exc:
+        _LOGGER.error("cannot build manifest: %s", exc)
+        return
+    except DATA_ERRORS:
+        _LOGGER.exception("failed to read %s", collection.filepath)
+        return
+    for entry in entries:
+        print(dump_json(entry.to_dict()))
+
+
+def setup_cmd(cmd):
+    """Setup get-manifest command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    get_manifest = cmd.add_parser(
+        'get-manifest',
+        help="get the baseline manifest of files uploaded by a collection",
+    )
+    get_manifest.add_argument(
+        '--private-key',
+        type=Path,
+        help="private key, only required if the collection was not hashed yet",
+    )
+    get_manifest.add_argument(
+        'collection',
+        type=Path,
+        help="collection archive",
+    )
+    get_manifest.set_defaults(func=_get_manifest_cmd)
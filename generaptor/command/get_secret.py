@@ -4,33 +4,47 @@ This module provides the CLI command for retrieving decrypted secrets
 from collection archives using private keys.
 """
 
+from os import cpu_count
 from pathlib import Path
 
-from ..concept import Collection
-from ..helper.crypto import RSAPrivateKey, load_private_key
+from ..concept import Collection, collection_secrets, enumerate_collections
+from ..concept.secret_cache import SECRET_CACHE_TTL
+from ..helper.agent import AgentError, agent_private_key
+from ..helper.crypto import (
+    RSAPrivateKey,
+    ask_private_key_secret,
+    load_private_key,
+)
 from ..helper.json import dump_json
 from ..helper.logging import get_logger
 
 _LOGGER = get_logger('command.get_secret')
 
 
-def _print_collection_secret(private_key: RSAPrivateKey, filepath: Path):
+def _print_collection_secret(
+    collection: Collection,
+    private_key: RSAPrivateKey,
+    decrypted: dict[str, bytes | None],
+):
     """Print collection secret as JSON.
 
     Args:
+        collection (Collection): Collection archive.
         private_key (RSAPrivateKey): Private key for decrypting the secret.
-        filepath (Path): Path to the collection archive file.
+        decrypted (dict[str, bytes | None]): Secrets decrypted in advance.
     """
-    collection = Collection(filepath=filepath)
     _LOGGER.info(
         "collection certificate fingerprint: %s", collection.fingerprint
     )
     try:
-        secret = collection.secret(private_key)
+        secret = collection.secret(private_key, decrypted)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
     except ValueError:
         _LOGGER.error("private key does not match collection archive")
         return
-    print(dump_json({'filepath': str(filepath), 'secret': secret}))
+    print(dump_json({'filepath': str(collection.filepath), 'secret': secret}))
 
 
 def _get_secret_cmd(args):
@@ -39,22 +53,40 @@ def _get_secret_cmd(args):
     Args:
         args: Parsed command line arguments with private_key and collections paths.
     """
+    private_key_secret = None
+    secret_cache = None
+    agent_key = agent_private_key(args.private_key)
+    if args.secret_cache and agent_key:
+        _LOGGER.info("agent holds private key, secret cache not used")
+    elif args.secret_cache:
+        private_key_secret = ask_private_key_secret()
+        if not private_key_secret:
+            _LOGGER.error("secret cache requires private key passphrase")
+            return
     try:
-        private_key = load_private_key(args.private_key)
+        private_key = agent_key or load_private_key(
+            args.private_key, private_key_secret, use_agent=False
+        )
     except ValueError:
         _LOGGER.error("invalid private key and/or passphrase")
         return
     if not private_key:
         return
-    for filepath in args.collections:
-        if filepath.is_file():
-            _print_collection_secret(private_key, filepath)
-            continue
-        if filepath.is_dir():
-            for item in filepath.glob('Collection_*.zip'):
-                _print_collection_secret(private_key, item)
-            continue
-        _LOGGER.warning("skipped %s", filepath)
+    if private_key_secret:
+        # unlock once the passphrase is known to decrypt the private key
+        secret_cache = args.cache.secret_cache.unlock(
+            private_key_secret, args.secret_cache_ttl
+        )
+    collections = list(enumerate_collections(args.collections))
+    try:
+        decrypted = collection_secrets(
+            collections, private_key, args.workers, secret_cache
+        )
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    for collection in collections:
+        _print_collection_secret(collection, private_key, decrypted)
 
 
 def setup_cmd(cmd):
@@ -71,6 +103,26 @@ def setup_cmd(cmd):
         type=Path,
         help="private key, given collections must share the same certificate fingerprint",
     )
+    get_secret.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of secrets decrypted in parallel",
+    )
+    get_secret.add_argument(
+        '--secret-cache',
+        action='store_true',
+        help="reuse secrets decrypted previously, stored encrypted with a "
+        "key derived from the private key passphrase, not used when the "
+        "key agent holds the private key",
+    )
+    get_secret.add_argument(
+        '--secret-cache-ttl',
+        type=int,
+        default=SECRET_CACHE_TTL,
+        help="seconds before secrets stored in the secret cache expire",
+    )
     get_secret.add_argument(
         'collections',
         metavar='collection',
@@ -0,0 +1,113 @@
+"""get-stats command module.
+
+This module provides the CLI command reporting collection statistics from
+the stats cache, decrypting only collections which are not cached yet.
+"""
+
+from os import cpu_count
+from pathlib import Path
+
+from ..concept import Collection, enumerate_collections, process_collections
+from ..concept.stats_cache import CollectionStats
+from ..concept.timing import collection_stats
+from ..helper.agent import AgentError
+from ..helper.crypto import load_private_key
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.get_stats')
+
+
+def _print_stats(collection: Collection, stats: CollectionStats):
+    """Print collection statistics as JSON.
+
+    Args:
+        collection (Collection): Collection archive.
+        stats (CollectionStats): Collection statistics.
+    """
+    print(
+        dump_json(
+            {
+                'filepath': str(collection.filepath),
+                'hostname': collection.hostname,
+                'created': collection.metadata.get('created'),
+                'stats': stats.to_dict(),
+            }
+        )
+    )
+
+
+def _get_stats_cmd(args):
+    """Handle get-stats command execution.
+
+    Args:
+        args: Parsed command line arguments with private_key and collections.
+    """
+    stats_cache = args.cache.stats_cache
+    pending = []
+    for collection in enumerate_collections(args.collections, stats_cache):
+        if args.refresh or collection.stats is None:
+            pending.append(collection)
+            continue
+        _print_stats(collection, collection.stats)
+    if not pending:
+        return
+    if not args.private_key:
+        _LOGGER.warning(
+            "skipped %d uncached collections, private key required",
+            len(pending),
+        )
+        return
+    try:
+        private_key = load_private_key(args.private_key)
+    except ValueError:
+        _LOGGER.error("invalid private key and/or passphrase")
+        return
+    if not private_key:
+        return
+    _LOGGER.info("reading %d uncached collections...", len(pending))
+    try:
+        for collection, stats in process_collections(
+            collection_stats, pending, private_key, workers=args.workers
+        ):
+            stats_cache.store(collection.identifier, stats)
+            _print_stats(collection, stats)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+
+
+def setup_cmd(cmd):
+    """Setup get-stats command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    get_stats = cmd.add_parser(
+        'get-stats',
+        help="get collection duration, uploads, errors and rows statistics",
+    )
+    get_stats.add_argument(
+        '--private-key',
+        type=Path,
+        help="private key, only loaded if some collections are not cached",
+    )
+    get_stats.add_argument(
+        '--refresh',
+        action='store_true',
+        help="ignore cached statistics and read collections again",
+    )
+    get_stats.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of collection archives read in parallel",
+    )
+    get_stats.add_argument(
+        'collections',
+        metavar='collection',
+        nargs='+',
+        type=Path,
+        help="collection archives",
+    )
+    get_stats.set_defaults(func=_get_stats_cmd)
@@ -0,0 +1,80 @@
+"""get-timing command module.
+
+This module provides the CLI command for reporting per-artifact and
+per-phase collection durations across collection archives.
+"""
+
+from os import cpu_count
+from pathlib import Path
+
+from ..concept import enumerate_collections, process_collections
+from ..concept.timing import TimingReport, collection_timing
+from ..helper.agent import AgentError
+from ..helper.crypto import load_private_key
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.get_timing')
+
+
+def _get_timing_cmd(args):
+    """Handle get-timing command execution.
+
+    Args:
+        args: Parsed command line arguments with private_key and collections.
+    """
+    try:
+        private_key = load_private_key(args.private_key)
+    except ValueError:
+        _LOGGER.error("invalid private key and/or passphrase")
+        return
+    if not private_key:
+        return
+    report = TimingReport()
+    try:
+        for _, timing in process_collections(
+            collection_timing,
+            enumerate_collections(args.collections),
+            private_key,
+            workers=args.workers,
+        ):
+            report.add(timing)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+        return
+    for row in report.artifact_rows():
+        print(dump_json({'type': 'artifact', **row}))
+    for row in report.phase_rows():
+        print(dump_json({'type': 'phase', **row}))
+
+
+def setup_cmd(cmd):
+    """Setup get-timing command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    get_timing = cmd.add_parser(
+        'get-timing',
+        help="get per-artifact and per-phase collection durations",
+    )
+    get_timing.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of collection archives read in parallel",
+    )
+    get_timing.add_argument(
+        'private_key',
+        type=Path,
+        help="private key, given collections must share the same certificate fingerprint",
+    )
+    get_timing.add_argument(
+        'collections',
+        metavar='collection',
+        nargs='+',
+        type=Path,
+        help="collection archives",
+    )
+    get_timing.set_defaults(func=_get_timing_cmd)
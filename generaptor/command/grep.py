@@ -0,0 +1,169 @@
+"""grep command module.
+
+This module provides the CLI command for searching collection archives
+content without extracting them.
+"""
+
+from fnmatch import fnmatch
+from os import cpu_count
+from pathlib import Path
+from re import IGNORECASE, Pattern
+from re import compile as re_compile
+from re import error as re_error
+
+from ..concept import (
+    Collection,
+    enumerate_collections,
+    process_collections,
+    sorted_members,
+)
+from ..helper.agent import AgentError
+from ..helper.crypto import load_private_key
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+from ..helper.search import AHOCORASICK_AVAILABLE, Searcher
+
+_LOGGER = get_logger('command.grep')
+
+
+def _grep_collection(
+    collection: Collection,
+    secret: str,
+    patterns: list[Pattern],
+    ignore_case: bool,
+    include: str,
+) -> list[dict]:
+    """Search collection archive members for patterns.
+
+    Args:
+        collection (Collection): Collection archive to search.
+        secret (str): Secret for decrypting the archive.
+        patterns (list[Pattern]): Compiled bytes regular expressions.
+        ignore_case (bool): Patterns ignore case.
+        include (str): Only search members matching this glob.
+
+    Returns:
+        list[dict]: Matches found in collection archive members.
+    """
+    searcher = Searcher(patterns, ignore_case=ignore_case)
+    matches = []
+    with collection.open_data(secret) as data_zipf:
+        for member in sorted_members(data_zipf):
+            if member.is_dir() or not fnmatch(member.filename, include):
+                continue
+            with data_zipf.open(member) as fobj:
+                for match in searcher.search(fobj):
+                    matches.append(
+                        {
+                            'collection': str(collection.filepath),
+                            'member': member.filename,
+                            **match.to_dict(),
+                        }
+                    )
+    return matches
+
+
+def _compile_patterns(args) -> list[Pattern] | None:
+    """Compile patterns from command arguments.
+
+    Args:
+        args: Parsed command line arguments with patterns and ignore_case.
+
+    Returns:
+        list[Pattern] | None: Compiled patterns, or None if a pattern is invalid.
+    """
+    flags = IGNORECASE if args.ignore_case else 0
+    patterns = []
+    for pattern in args.patterns:
+        try:
+            patterns.append(re_compile(pattern.encode('utf-8'), flags))
+        except re_error as exc:
+            _LOGGER.error("invalid pattern: %s (%s)", pattern, exc)
+            return None
+    return patterns
+
+
+def _grep_cmd(args):
+    """Handle grep command execution.
+
+    Args:
+        args: Parsed command line arguments with private_key, patterns and collections.
+    """
+    patterns = _compile_patterns(args)
+    if not patterns:
+        return
+    if not AHOCORASICK_AVAILABLE:
+        _LOGGER.info("pyahocorasick not available, using substring prefilter")
+    try:
+        private_key = load_private_key(args.private_key)
+    except ValueError:
+        _LOGGER.error("invalid private key and/or passphrase")
+        return
+    if not private_key:
+        return
+    try:
+        for _, matches in process_collections(
+            _grep_collection,
+            enumerate_collections(args.collections),
+            private_key,
+            patterns,
+            args.ignore_case,
+            args.include,
+            workers=args.workers,
+        ):
+            for match in matches:
+                print(dump_json(match))
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+
+
+def setup_cmd(cmd):
+    """Setup grep command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    grep = cmd.add_parser(
+        'grep',
+        help="search collection archives content without extracting them",
+    )
+    grep.add_argument(
+        '--pattern',
+        '-e',
+        dest='patterns',
+        metavar='pattern',
+        action='append',
+        required=True,
+        help="regular expression to search for, can be repeated",
+    )
+    grep.add_argument(
+        '--ignore-case',
+        '-i',
+        action='store_true',
+        help="ignore case distinctions in patterns",
+    )
+    grep.add_argument(
+        '--include',
+        default='uploads/*',
+        help="only search archive members matching this glob",
+    )
+    grep.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of collection archives searched in parallel",
+    )
+    grep.add_argument(
+        'private_key',
+        type=Path,
+        help="private key, given collections must share the same certificate fingerprint",
+    )
+    grep.add_argument(
+        'collections',
+        metavar='collection',
+        nargs='+',
+        type=Path,
+        help="collection archives",
+    )
+    grep.set_defaults(func=_grep_cmd)
@@ -0,0 +1,68 @@
+"""key-pool command module.
+
+This module provides the CLI command filling the pool of pre-generated
+private keys and certificates claimed by generate command.
+"""
+
+from os import cpu_count, getenv
+
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.key_pool')
+
+
+def _key_pool_cmd(args):
+    """Handle key-pool command execution.
+
+    Args:
+        args: Parsed command line arguments with size, workers and status.
+    """
+    key_pool = args.cache.key_pool
+    if not args.status:
+        private_key_secret = getenv('GENERAPTOR_PK_SECRET')
+        if not private_key_secret:
+            _LOGGER.error("GENERAPTOR_PK_SECRET environment variable not set")
+            return
+        key_pool.fill(private_key_secret, args.size, args.workers)
+    print(
+        dump_json(
+            {
+                'directory': str(key_pool.directory),
+                'size': key_pool.size,
+                'available': len(key_pool.fingerprints),
+            }
+        )
+    )
+
+
+def setup_cmd(cmd):
+    """Setup key-pool command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    key_pool = cmd.add_parser(
+        'key-pool',
+        help="generate private keys and certificates in advance, encrypted "
+        "with GENERAPTOR_PK_SECRET environment variable",
+    )
+    key_pool.add_argument(
+        '--size',
+        type=int,
+        help="count of entries to maintain in the pool, defaults to the "
+        "previous size",
+    )
+    key_pool.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of keys generated in parallel",
+    )
+    key_pool.add_argument(
+        '--status',
+        action='store_true',
+        help="only print pool status",
+    )
+    key_pool.set_defaults(func=_key_pool_cmd)
@@ -3,7 +3,7 @@
 This module provides the CLI command for creating new rules.
 """
 
-from ..concept import Rule
+from ..concept import Rule, RuleMode
 from ..helper.json import dump_json
 from ..helper.logging import get_logger
 
@@ -16,13 +16,20 @@ def _new_rule_cmd(args):
     Args:
         args: Parsed command line arguments with rule attributes.
     """
-    rule = Rule(
-        name=args.name,
-        category=args.category,
-        glob=args.glob,
-        accessor=args.accessor,
-        comment=args.comment,
-    )
+    try:
+        rule = Rule(
+            name=args.name,
+            category=args.category,
+            glob=args.glob,
+            accessor=args.accessor,
+            comment=args.comment,
+            max_size=args.max_size,
+            mode=RuleMode(args.mode),
+            max_depth=args.max_depth,
+        )
+    except ValueError as exc:
+        _LOGGER.error("cannot create rule: %s", exc)
+        return
     print(dump_json(rule.to_dict()))
 
 
@@ -38,4 +45,26 @@ def setup_cmd(cmd):
     new_rule.add_argument('glob', help="rule glob pattern")
     new_rule.add_argument('accessor', help="rule accessor")
     new_rule.add_argument('--comment', default='', help="rule comment")
+    new_rule.add_argument(
+        '--max-size',
+        type=int,
+        default=0,
+        metavar='BYTES',
+        help="only list matching files larger than given size, 0 means no "
+        "limit",
+    )
+    new_rule.add_argument(
+        '--mode',
+        default=RuleMode.CONTENT.value,
+        choices=[mode.value for mode in RuleMode],
+        help="upload, hash or only list matching files, or exclude matching "
+        "directories from recursive walks",
+    )
+    new_rule.add_argument(
+        '--max-depth',
+        type=int,
+        default=0,
+        metavar='N',
+        help="bound recursive wildcards depth, 0 means glob depth",
+    )
     new_rule.set_defaults(func=_new_rule_cmd)
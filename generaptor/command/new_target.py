@@ -5,7 +5,7 @@ This module provides the CLI command for creating new targets.
 
 from uuid import UUID
 
-from ..concept import Target
+from ..concept import Target, TargetTier
 from ..helper.json import dump_json
 from ..helper.logging import get_logger
 
@@ -16,9 +16,11 @@ def _new_target_cmd(args):
     """Handle new-target command execution.
 
     Args:
-        args: Parsed command line arguments with name and rules.
+        args: Parsed command line arguments with name, rules and tier.
     """
-    target = Target(name=args.name, rules=set(args.rules))
+    target = Target(
+        name=args.name, rules=set(args.rules), tier=TargetTier(args.tier)
+    )
     print(dump_json(target.to_dict()))
 
 
@@ -29,6 +31,13 @@ def setup_cmd(cmd):
         cmd: argparse subparsers object to add the command to.
     """
     new_target = cmd.add_parser('new-target', help="generate a new target")
+    new_target.add_argument(
+        '--tier',
+        default=TargetTier.BULK.value,
+        choices=[tier.value for tier in TargetTier],
+        help="collection tier, fast targets are collected in a first archive "
+        "when generating a tiered collector",
+    )
     new_target.add_argument('name', help="target name")
     new_target.add_argument(
         'rules', nargs='+', type=UUID, metavar='rule', help="target rules"
@@ -0,0 +1,42 @@
+"""purge-secrets command module.
+
+This module provides the CLI command removing decrypted collection secrets
+from the secret cache.
+"""
+
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.purge_secrets')
+
+
+def _purge_secrets_cmd(args):
+    """Handle purge-secrets command execution.
+
+    Args:
+        args: Parsed command line arguments with all.
+    """
+    secret_cache = args.cache.secret_cache
+    purged = secret_cache.purge(everything=args.all)
+    _LOGGER.info("purged %d cached secrets", purged)
+    print(
+        dump_json({'directory': str(secret_cache.directory), 'purged': purged})
+    )
+
+
+def setup_cmd(cmd):
+    """Setup purge-secrets command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    purge_secrets = cmd.add_parser(
+        'purge-secrets',
+        help="remove expired secrets from the secret cache",
+    )
+    purge_secrets.add_argument(
+        '--all',
+        action='store_true',
+        help="remove all secrets, whether expired or not",
+    )
+    purge_secrets.set_defaults(func=_purge_secrets_cmd)
@@ -0,0 +1,153 @@
+"""sweep command module.
+
+This module provides the CLI command for matching collection archives
+content against known hashes.
+"""
+
+from os import cpu_count
+from pathlib import Path
+
+from ..concept import (
+    Collection,
+    compute_digests,
+    enumerate_collections,
+    process_collections,
+)
+from ..helper.agent import AgentError
+from ..helper.crypto import load_private_key
+from ..helper.json import dump_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('command.sweep')
+_ALGORITHM_BY_LENGTH = {32: 'md5', 40: 'sha1', 64: 'sha256'}
+
+
+def _load_iocs(filepath: Path) -> dict[str, set[str]]:
+    """Load hashes from IOC file.
+
+    One hash per line, empty lines and lines starting with '#' are ignored.
+
+    Args:
+        filepath (Path): Path to the IOC file.
+
+    Returns:
+        dict[str, set[str]]: Lowercase hashes indexed by algorithm name.
+    """
+    iocs = {algorithm: set() for algorithm in _ALGORITHM_BY_LENGTH.values()}
+    with filepath.open('r', encoding='utf-8') as fobj:
+        for line in fobj:
+            line = line.strip().lower()
+            if not line or line.startswith('#'):
+                continue
+            algorithm = _ALGORITHM_BY_LENGTH.get(len(line))
+            if not algorithm:
+                _LOGGER.warning("skipped invalid hash: %s", line)
+                continue
+            iocs[algorithm].add(line)
+    return iocs
+
+
+def _print_matches(collection: Collection, digests, iocs):
+    """Print digests matching IOCs as JSON.
+
+    Args:
+        collection (Collection): Collection archive.
+        digests (MemberDigestList): Collection archive member digests.
+        iocs (dict[str, set[str]]): Hashes indexed by algorithm name.
+    """
+    for digest in digests:
+        for algorithm, hashes in iocs.items():
+            value = getattr(digest, algorithm)
+            if value not in hashes:
+                continue
+            print(
+                dump_json(
+                    {
+                        'collection': str(collection.filepath),
+                        'member': digest.member,
+                        'size': digest.size,
+                        'algorithm': algorithm,
+                        'hash': value,
+                    }
+                )
+            )
+
+
+def _sweep_cmd(args):
+    """Handle sweep command execution.
+
+    Args:
+        args: Parsed command line arguments with iocs, private_key and collections.
+    """
+    iocs = _load_iocs(args.iocs)
+    if not any(iocs.values()):
+        _LOGGER.warning("no valid hash to sweep for, operation canceled.")
+        return
+    digest_cache = args.cache.digest_cache
+    pending = []
+    for collection in enumerate_collections(args.collections):
+        digests = None if args.refresh else digest_cache.load(collection)
+        if digests is None:
+            pending.append(collection)
+            continue
+        _print_matches(collection, digests, iocs)
+    if not pending:
+        return
+    _LOGGER.info("hashing %d uncached collections...", len(pending))
+    try:
+        private_key = load_private_key(args.private_key)
+    except ValueError:
+        _LOGGER.error("invalid private key and/or passphrase")
+        return
+    if not private_key:
+        return
+    try:
+        for collection, digests in process_collections(
+            compute_digests, pending, private_key, workers=args.workers
+        ):
+            digest_cache.store(collection, digests)
+            _print_matches(collection, digests, iocs)
+    except AgentError as exc:
+        _LOGGER.error("%s", exc)
+
+
+def setup_cmd(cmd):
+    """Setup sweep command.
+
+    Args:
+        cmd: argparse subparsers object to add the command to.
+    """
+    sweep = cmd.add_parser(
+        'sweep',
+        help="match collection archives content against known hashes",
+    )
+    sweep.add_argument(
+        '--refresh',
+        action='store_true',
+        help="ignore cached digests and hash collections again",
+    )
+    sweep.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=cpu_count(),
+        help="number of collection archives hashed in parallel",
+    )
+    sweep.add_argument(
+        'iocs',
+        type=Path,
+        help="file containing one MD5, SHA-1 or SHA-256 hash per line",
+    )
+    sweep.add_argument(
+        'private_key',
+        type=Path,
+        help="private key, only loaded if some collections are not cached",
+    )
+    sweep.add_argument(
+        'collections',
+        metavar='collection',
+        nargs='+',
+        type=Path,
+        help="collection archives",
+    )
+    sweep.set_defaults(func=_sweep_cmd)
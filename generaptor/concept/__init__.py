@@ -8,23 +8,51 @@ from uuid import UUID
 
 from ..helper.logging import get_logger
 from .cache import Cache
-from .collection import Collection, CollectionList, Outcome
-from .collector import Collector, CollectorConfig
+from .collection import (
+    DATA_ERRORS,
+    Collection,
+    CollectionList,
+    Outcome,
+    collection_secrets,
+    enumerate_collections,
+    group_runs,
+    process_collections,
+    sorted_members,
+)
+from .collector import Collector, CollectorConfig, RepackMethod
 from .config import Config
+from .digest_cache import (
+    DigestCache,
+    MemberDigest,
+    MemberDigestList,
+    compute_digests,
+)
 from .distribution import (
     SUPPORTED_DISTRIBUTIONS,
     Architecture,
     Distribution,
     OperatingSystem,
 )
+from .metadata_walk import DEFAULT_EXCLUDED_FSTYPES, MetadataWalk
+from .performance import (
+    DEFAULT_PERFORMANCE_PROFILE,
+    PERFORMANCE_PROFILES,
+    PerformanceProfile,
+)
 from .profile_set import (
     GUIDProfileMapping,
     NameProfileMapping,
     Profile,
     ProfileSet,
 )
-from .rule_set import GUIDRuleMapping, Rule, RuleSet
-from .target_set import GUIDTargetMapping, NameTargetMapping, Target, TargetSet
+from .rule_set import GUIDRuleMapping, Rule, RuleMode, RuleSet
+from .target_set import (
+    GUIDTargetMapping,
+    NameTargetMapping,
+    Target,
+    TargetSet,
+    TargetTier,
+)
 
 _LOGGER = get_logger('concept')
 
@@ -144,3 +172,30 @@ def get_rule_set_from_targets(
     if not target_set:
         return None
     return target_set.select(rule_set, targets)
+
+
+def get_tier_rule_sets_from_targets(
+    cache: Cache,
+    config: Config,
+    opsystem: OperatingSystem,
+    targets: list[str | UUID],
+) -> tuple[RuleSet, RuleSet] | None:
+    """Load fast and bulk tier rulesets for given targets and operating system.
+
+    Args:
+        cache (Cache): The cache instance.
+        config (Config): The config instance.
+        opsystem (OperatingSystem): The target operating system.
+        targets (list[str | UUID]): List of target names or GUIDs to include.
+
+    Returns:
+        tuple[RuleSet, RuleSet] | None: Fast tier and bulk tier rule sets,
+            or None if inputs are invalid.
+    """
+    rule_set = get_rule_set(cache, config, opsystem)
+    if not rule_set:
+        return None
+    target_set = get_target_set(cache, config, opsystem)
+    if not target_set:
+        return None
+    return target_set.select_tiers(rule_set, targets)
@@ -0,0 +1,243 @@
+"""Generaptor Baseline module.
+
+This module provides baseline manifests describing files uploaded by a
+previous collection, so that a delta collection skips unchanged files and
+extraction restores them from the previous collection.
+"""
+
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from shutil import copy2
+
+from ..helper.crypto import RSAPrivateKey
+from ..helper.json import load_jsonl
+from ..helper.logging import get_logger
+from .collection import Collection
+from .coverage import parse_upload_member
+from .digest_cache import DigestCache, MemberDigestList, compute_digests
+from .distribution import OperatingSystem
+
+_LOGGER = get_logger('concept.baseline')
+_LIMITED_RESULTS_PATTERN = 'results/*Limited.json'
+
+
+@dataclass(kw_only=True, frozen=True)
+class BaselineEntry:
+    """Baseline manifest entry.
+
+    Attributes:
+        path (str): File path on the endpoint, as reported by the collector.
+        size (int): File size in bytes.
+        sha256 (str): Hexadecimal SHA-256 digest.
+        mtime (int): Modification time in seconds since epoch, 0 if unknown
+            in which case only size and digest are compared.
+    """
+
+    path: str
+    size: int
+    sha256: str
+    mtime: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the baseline entry.
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, dct: dict):
+        """Contruct instance from dict.
+
+        Args:
+            dct (dict): Dictionary representation of the baseline entry.
+
+        Returns:
+            BaselineEntry: BaselineEntry instance.
+        """
+        return cls(
+            path=dct['path'],
+            size=dct['size'],
+            sha256=dct['sha256'],
+            mtime=dct.get('mtime', 0),
+        )
+
+
+BaselineEntryList = list[BaselineEntry]
+
+
+def _upload_path(components: list[str], opsystem: OperatingSystem) -> str:
+    """Build endpoint file path from uploaded member path components.
+
+    Args:
+        components (list[str]): Unescaped member path components.
+        opsystem (OperatingSystem): Operating system of the collection.
+
+    Returns:
+        str: File path as reported by the collector.
+    """
+    if opsystem == OperatingSystem.WINDOWS:
+        return '\\'.join(components)
+    return '/' + '/'.join(components)
+
+
+def _path_key(path: str, opsystem: OperatingSystem) -> str:
+    """Build path lookup key.
+
+    Args:
+        path (str): File path on the endpoint.
+        opsystem (OperatingSystem): Operating system of the collection.
+
+    Returns:
+        str: Casefolded path on Windows, path otherwise.
+    """
+    if opsystem == OperatingSystem.WINDOWS:
+        return path.casefold()
+    return path
+
+
+def baseline_from_digests(
+    digests: MemberDigestList, opsystem: OperatingSystem
+) -> BaselineEntryList:
+    """Build baseline manifest from collection archive member digests.
+
+    Modification times are not part of the archive members, entries are
+    compared on size and digest only.
+
+    Args:
+        digests (MemberDigestList): Collection archive member digests.
+        opsystem (OperatingSystem): Operating system of the collection.
+
+    Returns:
+        BaselineEntryList: Baseline manifest entries.
+    """
+    entries = []
+    for digest in digests:
+        parsed = parse_upload_member(digest.member)
+        if not parsed or not parsed[1]:
+            continue
+        entries.append(
+            BaselineEntry(
+                path=_upload_path(parsed[1], opsystem),
+                size=digest.size,
+                sha256=digest.sha256,
+            )
+        )
+    return entries
+
+
+def baseline_from_collection(
+    collection: Collection,
+    digest_cache: DigestCache,
+    private_key: RSAPrivateKey | None = None,
+) -> BaselineEntryList:
+    """Build baseline manifest from a previous collection.
+
+    Cached member digests are used when available, the collection is
+    decrypted and hashed otherwise.
+
+    Args:
+        collection (Collection): Previous collection archive.
+        digest_cache (DigestCache): Member digests cache.
+        private_key (RSAPrivateKey | None): Private key, only required if
+            member digests are not cached.
+
+    Returns:
+        BaselineEntryList: Baseline manifest entries.
+
+    Raises:
+        AgentError: If the agent holding the private key is unreachable or
+            rejects a request.
+        ValueError: If digests are not cached and private key is missing or
+            does not match the collection.
+    """
+    digests = digest_cache.load(collection)
+    if digests is None:
+        if not private_key:
+            raise ValueError("collection is not hashed yet, key required")
+        secret = collection.secret(private_key)
+        if not secret:
+            raise ValueError("collection secret is missing")
+        _LOGGER.info("hashing %s", collection.filepath)
+        digests = compute_digests(collection, secret)
+        digest_cache.store(collection, digests)
+    return baseline_from_digests(digests, collection.opsystem)
+
+
+def load_baseline(filepath: Path) -> BaselineEntryList:
+    """Load baseline manifest from JSONL file.
+
+    Args:
+        filepath (Path): Path to the baseline manifest.
+
+    Returns:
+        BaselineEntryList: Baseline manifest entries.
+
+    Raises:
+        ValueError: If an entry is invalid.
+    """
+    try:
+        return [BaselineEntry.from_dict(row) for row in load_jsonl(filepath)]
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"invalid baseline entry: {exc}") from exc
+
+
+def _unchanged_paths(directory: Path) -> Iterable[str]:
+    """Enumerate files reported unchanged by a delta collection.
+
+    Args:
+        directory (Path): Extracted delta collection directory.
+
+    Yields:
+        str: File path as reported by the collector.
+    """
+    for filepath in directory.glob(_LIMITED_RESULTS_PATTERN):
+        for row in load_jsonl(filepath):
+            if row.get('Unchanged') and row.get('OSPath'):
+                yield str(row['OSPath'])
+
+
+def restore_unchanged(
+    directory: Path, baseline_directory: Path, opsystem: OperatingSystem
+) -> tuple[int, int]:
+    """Restore files skipped by a delta collection from its baseline.
+
+    Files are copied from the extracted baseline collection to the same
+    member path in the extracted delta collection, so that the delta
+    collection directory holds the full view.
+
+    Args:
+        directory (Path): Extracted delta collection directory.
+        baseline_directory (Path): Extracted baseline collection directory.
+        opsystem (OperatingSystem): Operating system of the collections.
+
+    Returns:
+        tuple[int, int]: Count of restored files and of files missing from
+            the baseline.
+    """
+    by_key = {}
+    for filepath in baseline_directory.glob('uploads/**/*'):
+        if not filepath.is_file():
+            continue
+        member = filepath.relative_to(baseline_directory).as_posix()
+        parsed = parse_upload_member(member)
+        if not parsed or not parsed[1]:
+            continue
+        path = _upload_path(parsed[1], opsystem)
+        by_key[_path_key(path, opsystem)] = member
+    restored, missing = 0, 0
+    for path in _unchanged_paths(directory):
+        member = by_key.get(_path_key(path, opsystem))
+        if not member:
+            _LOGGER.warning("unchanged file missing from baseline: %s", path)
+            missing += 1
+            continue
+        destination = directory / member
+        if destination.exists():
+            continue
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        copy2(baseline_directory / member, destination)
+        restored += 1
+    return restored, missing
@@ -0,0 +1,138 @@
+"""Generaptor Build Cache module.
+
+This module provides a content-addressed cache of collector binaries, so
+that a collector already built from the same template binary and rendered
+configuration is not repacked again.
+"""
+
+from dataclasses import dataclass, field
+from os import close, utime
+from pathlib import Path
+from shutil import copy2
+from tempfile import mkstemp
+from threading import Lock
+
+from ..helper.crypto import checksum, data_checksum
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('concept.build_cache')
+_DEFAULT_MAX_SIZE = 2 * 1024 * 1024 * 1024
+_ENTRY_MODE = 0o555
+
+
+@dataclass(frozen=True)
+class BuildCache:
+    """Collector build cache directory.
+
+    Entries are named after the digest of the template binary and of the
+    rendered configuration. Served entries are copied to the output so
+    that later changes to the output, e.g. signing, never alter the cached
+    build, entries are stored read-only as well. Entries modification time
+    is refreshed when served and least recently used entries are evicted
+    when the cache exceeds its maximum size.
+
+    Attributes:
+        directory (Path): Path to the build cache directory.
+        max_size (int): Maximum size of the cache in bytes.
+    """
+
+    directory: Path
+    max_size: int = _DEFAULT_MAX_SIZE
+    _digests: dict = field(default_factory=dict, compare=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, compare=False, repr=False)
+
+    def _binary_digest(self, filepath: Path) -> str:
+        """Digest of a binary, memoized by path, size and modification time.
+
+        Args:
+            filepath (Path): Path to the binary.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest.
+        """
+        stat = filepath.stat()
+        memo_key = (filepath, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(memo_key)
+        if digest is None:
+            digest = checksum(filepath)
+            with self._lock:
+                self._digests[memo_key] = digest
+        return digest
+
+    def key(self, template_binary: Path, config: Path) -> str:
+        """Compute build key.
+
+        Args:
+            template_binary (Path): Template binary of the collector.
+            config (Path): Rendered collector configuration.
+
+        Returns:
+            str: Hexadecimal build key.
+        """
+        return data_checksum(
+            b'\n'.join(
+                [
+                    self._binary_digest(template_binary).encode(),
+                    config.read_bytes(),
+                ]
+            )
+        )
+
+    def fetch(self, key: str, output: Path) -> bool:
+        """Serve cached build to output path.
+
+        Args:
+            key (str): Build key.
+            output (Path): Output collector binary path.
+
+        Returns:
+            bool: True if build was cached and served.
+        """
+        entry = self.directory / key
+        if not entry.is_file():
+            return False
+        output.unlink(missing_ok=True)
+        copy2(entry, output)
+        output.chmod(0o700)
+        try:
+            utime(entry)
+        except OSError:
+            _LOGGER.warning("failed to refresh build cache entry: %s", key)
+        return True
+
+    def store(self, key: str, output: Path):
+        """Store collector binary in cache and evict old entries.
+
+        Args:
+            key (str): Build key.
+            output (Path): Output collector binary path.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self.directory / key
+        fd, tmp_entry = mkstemp(suffix='.tmp', dir=self.directory)
+        close(fd)
+        tmp_entry = Path(tmp_entry)
+        copy2(output, tmp_entry)
+        tmp_entry.chmod(_ENTRY_MODE)
+        tmp_entry.replace(entry)
+        self.evict()
+
+    def evict(self):
+        """Evict least recently used entries exceeding maximum size."""
+        entries = []
+        for entry in self.directory.iterdir():
+            if not entry.is_file() or entry.suffix == '.tmp':
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            _LOGGER.info("evicting build cache entry: %s", entry.name)
+            entry.unlink(missing_ok=True)
+            total -= size
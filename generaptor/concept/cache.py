@@ -10,9 +10,14 @@ from pathlib import Path
 from platform import architecture, libc_ver, machine, system
 from shutil import copytree
 
+from ..helper.crypto import KeyPool
 from ..helper.logging import get_logger
+from .build_cache import BuildCache
 from .config import Config
+from .digest_cache import DigestCache
 from .distribution import Architecture, Distribution, OperatingSystem
+from .secret_cache import SecretCache
+from .stats_cache import StatsCache
 
 _LOGGER = get_logger('concept.cache')
 _HERE = Path(__file__).resolve()
@@ -103,6 +108,60 @@ class Cache:
         """
         return Config(self.directory / 'config')
 
+    @cached_property
+    def bytecode_cache(self) -> Path:
+        """Cache compiled templates directory.
+
+        Returns:
+            Path: Path to the compiled templates subdirectory within the cache.
+        """
+        return self.directory / 'jinja'
+
+    @cached_property
+    def build_cache(self) -> BuildCache:
+        """Cache collector builds.
+
+        Returns:
+            BuildCache: Build cache stored in the cache directory.
+        """
+        return BuildCache(self.directory / 'build')
+
+    @cached_property
+    def digest_cache(self) -> DigestCache:
+        """Cache collection digests.
+
+        Returns:
+            DigestCache: Digest cache stored in the cache directory.
+        """
+        return DigestCache(self.directory / 'digests')
+
+    @cached_property
+    def stats_cache(self) -> StatsCache:
+        """Cache collection statistics.
+
+        Returns:
+            StatsCache: Stats cache stored in the cache directory.
+        """
+        return StatsCache(self.directory / 'stats')
+
+    @cached_property
+    def secret_cache(self) -> SecretCache:
+        """Cache decrypted collection secrets.
+
+        Returns:
+            SecretCache: Locked secret cache stored in the cache directory.
+        """
+        return SecretCache(self.directory / 'secrets')
+
+    @cached_property
+    def key_pool(self) -> KeyPool:
+        """Cache pre-generated private keys and certificates.
+
+        Returns:
+            KeyPool: Key pool stored in the cache directory.
+        """
+        return KeyPool(self.directory / 'keys')
+
     @cached_property
     def program(self):
         """Cache program directory.
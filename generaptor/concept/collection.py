@@ -4,22 +4,108 @@ This module provides functionality for handling Velociraptor collection archives
 including extraction, metadata access, and secret retrieval.
 """
 
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from functools import cached_property
+from io import SEEK_CUR, SEEK_END, SEEK_SET
 from json import loads
+from operator import attrgetter
 from pathlib import Path
-from zipfile import ZipFile
+from re import sub
+from typing import Any, BinaryIO
+from zipfile import BadZipFile, ZipFile, ZipInfo
+from zlib import error as zlib_error
 
 from pyzipper import AESZipFile
-
-from ..helper.crypto import RSAPrivateKey, checksum, decrypt_secret
+from pyzipper import BadZipFile as AESBadZipFile
+
+from ..helper.agent import AgentError
+from ..helper.crypto import (
+    RSAPrivateKey,
+    checksum,
+    data_checksum,
+    decrypt_secret,
+    decrypt_secrets,
+)
 from ..helper.logging import get_logger
 from .distribution import OperatingSystem
+from .secret_cache import SecretCache
+from .stats_cache import CollectionStats, StatsCache
 
 _LOGGER = get_logger('concept.collection')
 _DATA_FILENAME = 'data.zip'
+# decrypted bytes kept from the end of the data archive, enough for the
+# central directory of about 100k members
+_DATA_TAIL_SIZE = 8 * 1024 * 1024
+# errors raised when the data archive cannot be decrypted, read or held in
+# memory, BrokenProcessPool is a RuntimeError
+DATA_ERRORS = (
+    RuntimeError,
+    BadZipFile,
+    AESBadZipFile,
+    KeyError,
+    EOFError,
+    OSError,
+    MemoryError,
+    zlib_error,
+)
+
+
+class _TailCachedReader:
+    """Seekable reader of a decrypted member caching its tail.
+
+    Decrypted member streams restart decryption from the start on every
+    backward seek. Zip central directory lookups seek back and forth near
+    the end of the data archive, they are served from the cached tail so
+    that members read in archive order only need one more pass.
+    """
+
+    def __init__(self, fobj: BinaryIO, size: int):
+        self._fobj = fobj
+        self._size = size
+        self._pos = 0
+        fobj.seek(max(size - _DATA_TAIL_SIZE, 0))
+        self._tail = fobj.read()
+        self._tail_start = size - len(self._tail)
+
+    def seekable(self) -> bool:
+        """Reader is seekable."""
+        return True
+
+    def tell(self) -> int:
+        """Current position."""
+        return self._pos
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Move to given position."""
+        if whence == SEEK_CUR:
+            offset += self._pos
+        elif whence == SEEK_END:
+            offset += self._size
+        self._pos = max(0, min(offset, self._size))
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes, stopping at the cached tail."""
+        end = self._size if size < 0 else min(self._pos + size, self._size)
+        if self._pos >= self._tail_start:
+            data = self._tail[
+                self._pos - self._tail_start : end - self._tail_start
+            ]
+        else:
+            if self._fobj.tell() != self._pos:
+                self._fobj.seek(self._pos)
+            data = self._fobj.read(min(end, self._tail_start) - self._pos)
+        self._pos += len(data)
+        return data
 
 
 class Outcome(Enum):
@@ -73,9 +159,14 @@ class Collection:
 
     Attributes:
         filepath (Path): Path to the collection ZIP archive file.
+        stats_cache (StatsCache | None): Stats cache backing the statistics
+            properties, None to disable them.
     """
 
     filepath: Path
+    stats_cache: StatsCache | None = field(
+        default=None, compare=False, repr=False
+    )
 
     @cached_property
     def metadata(self) -> dict[str, str]:
@@ -98,6 +189,22 @@ class Collection:
         """
         return checksum(self.filepath)
 
+    @cached_property
+    def identifier(self) -> str:
+        """Collection identifier.
+
+        SHA-256 of the encrypted secret which is unique to each collection
+        and available without reading the whole archive, falls back to the
+        collection checksum if the encrypted secret is missing.
+
+        Returns:
+            str: Hexadecimal identifier of the collection.
+        """
+        b64_enc_secret = self.metadata.get('b64_enc_secret')
+        if not b64_enc_secret:
+            return self.checksum
+        return data_checksum(b64_enc_secret.encode())
+
     @cached_property
     def version(self) -> str | None:
         """Retrieve version in metadata.
@@ -158,21 +265,164 @@ class Collection:
         """
         return self.metadata.get('fingerprint_hex')
 
-    def secret(self, private_key: RSAPrivateKey) -> str | None:
+    @cached_property
+    def run_id(self) -> str | None:
+        """Retrieve run identifier in metadata.
+
+        Tiers of a tiered collection share the same run identifier.
+
+        Returns:
+            str | None: Run identifier from metadata, or None if not present.
+        """
+        return self.metadata.get('run_id')
+
+    @cached_property
+    def tier(self) -> str | None:
+        """Retrieve collection tier in metadata.
+
+        Returns:
+            str | None: Tier from metadata, or None if not present.
+        """
+        return self.metadata.get('tier')
+
+    @cached_property
+    def run(self) -> str | None:
+        """Run name shared by the tiers of a tiered collection.
+
+        Returns:
+            str | None: Filename-safe run name built from hostname and run
+                identifier, or None if the collection is not tiered.
+        """
+        if not self.run_id:
+            return None
+        return sub(
+            r'[^0-9A-Za-z\-_]', '-', f'Run_{self.hostname}_{self.run_id}'
+        )
+
+    @cached_property
+    def stats(self) -> CollectionStats | None:
+        """Retrieve collection statistics from the stats cache.
+
+        Returns:
+            CollectionStats | None: Cached statistics, or None if there is no
+                stats cache or the collection is not cached yet.
+        """
+        if self.stats_cache is None:
+            return None
+        return self.stats_cache.load(self.identifier)
+
+    @cached_property
+    def duration(self) -> float | None:
+        """Retrieve collection duration from the stats cache.
+
+        Returns:
+            float | None: Duration in seconds, or None if not cached.
+        """
+        return self.stats.duration if self.stats else None
+
+    @cached_property
+    def files(self) -> int | None:
+        """Retrieve count of uploaded files from the stats cache.
+
+        Returns:
+            int | None: Count of uploaded files, or None if not cached.
+        """
+        return self.stats.files if self.stats else None
+
+    @cached_property
+    def uploaded_bytes(self) -> int | None:
+        """Retrieve uploaded bytes from the stats cache.
+
+        Returns:
+            int | None: Uploaded bytes, or None if not cached.
+        """
+        return self.stats.uploaded_bytes if self.stats else None
+
+    @cached_property
+    def errors(self) -> int | None:
+        """Retrieve count of error log messages from the stats cache.
+
+        Returns:
+            int | None: Count of error log messages, or None if not cached.
+        """
+        return self.stats.errors if self.stats else None
+
+    @cached_property
+    def artifact_rows(self) -> dict[str, int] | None:
+        """Retrieve result rows per artifact from the stats cache.
+
+        Returns:
+            dict[str, int] | None: Count of result rows indexed by artifact
+                name, or None if not cached.
+        """
+        return self.stats.artifact_rows if self.stats else None
+
+    def secret(
+        self,
+        private_key: RSAPrivateKey,
+        decrypted: dict[str, bytes | None] | None = None,
+        secret_cache: SecretCache | None = None,
+    ) -> str | None:
         """Retrieve collection secret.
 
         Args:
             private_key (RSAPrivateKey): Private key for decrypting the secret.
+            decrypted (dict[str, bytes | None] | None): Secrets decrypted in
+                advance by collection_secrets(), used instead of the private
+                key when they include the collection secret.
+            secret_cache (SecretCache | None): Unlocked secret cache checked
+                before using the private key and updated afterwards.
 
         Returns:
             str | None: Decrypted secret string, or None if not present/valid.
+
+        Raises:
+            ValueError: If the private key does not match the secret.
         """
         b64_enc_secret = self.metadata.get('b64_enc_secret')
         if not b64_enc_secret:
             return None
+        if decrypted and b64_enc_secret in decrypted:
+            secret_bytes = decrypted[b64_enc_secret]
+            if secret_bytes is None:
+                raise ValueError("private key does not match secret")
+            return secret_bytes.decode()
+        if secret_cache:
+            secret_bytes = secret_cache.load(self.fingerprint, b64_enc_secret)
+            if secret_bytes is not None:
+                return secret_bytes.decode()
         secret_bytes = decrypt_secret(private_key, b64_enc_secret)
+        if secret_cache:
+            secret_cache.store(self.fingerprint, b64_enc_secret, secret_bytes)
         return secret_bytes.decode()
 
+    @contextmanager
+    def open_data(self, secret: str) -> Iterator[ZipFile]:
+        """Open decrypted data archive without extracting it.
+
+        Data archive is decrypted on the fly while members are read, only
+        its tail holding the central directory is kept in memory and nothing
+        is written to disk. Reading members in archive order avoids
+        decrypting the data archive again from its start, see
+        sorted_members().
+
+        Args:
+            secret (str): Secret/password for decrypting the archive.
+
+        Yields:
+            ZipFile: Decrypted data archive opened for reading.
+
+        Raises:
+            RuntimeError: If the secret does not match the archive.
+        """
+        with AESZipFile(str(self.filepath), 'r') as zipf:
+            zipf.setpassword(secret.encode('utf-8'))
+            zipinf = zipf.getinfo(_DATA_FILENAME)
+            with zipf.open(zipinf) as fobj:
+                reader = _TailCachedReader(fobj, zipinf.file_size)
+                with ZipFile(reader) as data_zipf:
+                    yield data_zipf
+
     def extract_to(self, directory: Path, secret: str) -> Outcome:
         """Extract collection archive data to directory.
 
@@ -208,3 +458,213 @@ class Collection:
 
 
 CollectionList = list[Collection]
+
+
+def group_runs(
+    collections: Iterable[Collection],
+) -> dict[str, CollectionList]:
+    """Group tiers of tiered collections by run.
+
+    Args:
+        collections (Iterable[Collection]): Collection archives.
+
+    Returns:
+        dict[str, CollectionList]: Tiered collections indexed by run name,
+            collections which are not tiered are skipped.
+    """
+    runs = {}
+    for collection in collections:
+        if collection.run:
+            runs.setdefault(collection.run, []).append(collection)
+    return runs
+
+
+def sorted_members(data_zipf: ZipFile) -> list[ZipInfo]:
+    """Data archive members in archive order.
+
+    Args:
+        data_zipf (ZipFile): Data archive opened by Collection.open_data().
+
+    Returns:
+        list[ZipInfo]: Members sorted by offset in the data archive.
+    """
+    return sorted(data_zipf.infolist(), key=attrgetter('header_offset'))
+
+
+def _has_metadata(collection: Collection) -> bool:
+    """Determine if collection archive metadata can be read.
+
+    Args:
+        collection (Collection): Collection archive.
+
+    Returns:
+        bool: True if metadata was read from the archive.
+    """
+    try:
+        return isinstance(collection.metadata, dict)
+    except (*DATA_ERRORS, ValueError, IndexError):
+        return False
+
+
+def enumerate_collections(
+    filepaths: Iterable[Path], stats_cache: StatsCache | None = None
+) -> Iterator[Collection]:
+    """Enumerate collection archives from files and directories.
+
+    Args:
+        filepaths (Iterable[Path]): Collection archives or directories
+            containing collection archives.
+        stats_cache (StatsCache | None): Stats cache backing the collections
+            statistics properties.
+
+    Yields:
+        Collection: Collection objects for each found archive file, archives
+            whose metadata cannot be read are skipped.
+    """
+    for filepath in filepaths:
+        if filepath.is_file():
+            candidates = [filepath]
+        elif filepath.is_dir():
+            candidates = filepath.glob('Collection_*.zip')
+        else:
+            _LOGGER.warning("skipped %s", filepath)
+            continue
+        for item in candidates:
+            collection = Collection(filepath=item, stats_cache=stats_cache)
+            if not _has_metadata(collection):
+                _LOGGER.warning("skipped unreadable collection: %s", item)
+                continue
+            yield collection
+
+
+def collection_secrets(
+    collections: Iterable[Collection],
+    private_key: RSAPrivateKey,
+    workers: int | None = None,
+    secret_cache: SecretCache | None = None,
+) -> dict[str, bytes | None]:
+    """Decrypt secrets of many collections in parallel.
+
+    Metadata of collection archives is read by a pool of threads, then
+    distinct secrets missing from the secret cache for their collection
+    certificate fingerprint are decrypted by a pool of processes and stored
+    in the secret cache.
+
+    Args:
+        collections (Iterable[Collection]): Collection archives.
+        private_key (RSAPrivateKey): Private key for decrypting the secrets.
+        workers (int | None): Number of workers, defaults to the number
+            of CPUs.
+        secret_cache (SecretCache | None): Unlocked secret cache.
+
+    Returns:
+        dict[str, bytes | None]: Decrypted secrets to give to
+            Collection.secret().
+
+    Raises:
+        AgentError: If the agent holding the private key is unreachable or
+            rejects a request.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        metadatas = executor.map(
+            lambda item: item.metadata if _has_metadata(item) else {},
+            collections,
+        )
+        enc_secrets = list(
+            dict.fromkeys(
+                (metadata.get('fingerprint_hex'), metadata['b64_enc_secret'])
+                for metadata in metadatas
+                if metadata.get('b64_enc_secret')
+            )
+        )
+    cached = {}
+    if secret_cache:
+        missing = set()
+        for fingerprint, b64_enc_secret in enc_secrets:
+            secret = secret_cache.load(fingerprint, b64_enc_secret)
+            if secret is None:
+                missing.add(b64_enc_secret)
+            else:
+                cached[b64_enc_secret] = secret
+        # an encrypted secret is cached only if cached for all fingerprints
+        cached = {
+            key: value for key, value in cached.items() if key not in missing
+        }
+        _LOGGER.info("%d secrets found in secret cache", len(cached))
+    decrypted = decrypt_secrets(
+        private_key,
+        [item for _, item in enc_secrets if item not in cached],
+        workers,
+    )
+    if secret_cache:
+        for fingerprint, b64_enc_secret in enc_secrets:
+            secret = decrypted.get(b64_enc_secret)
+            if secret is not None:
+                secret_cache.store(fingerprint, b64_enc_secret, secret)
+    return cached | decrypted
+
+
+def process_collections(
+    func: Callable[..., Any],
+    collections: Iterable[Collection],
+    private_key: RSAPrivateKey,
+    *args,
+    workers: int | None = None,
+) -> Iterator[tuple[Collection, Any]]:
+    """Process collections in parallel.
+
+    Collection secrets are retrieved by collection_secrets(), then
+    func(collection, secret, *args) is called by a pool of processes.
+    Collections the private key does not match or which cannot be read are
+    logged and skipped.
+
+    Args:
+        func (Callable[..., Any]): Picklable function processing a
+            collection with its secret.
+        collections (Iterable[Collection]): Collection archives.
+        private_key (RSAPrivateKey): Private key for decrypting the secrets.
+        *args: Additional arguments given to func.
+        workers (int | None): Number of worker processes, defaults to the
+            number of CPUs.
+
+    Yields:
+        tuple[Collection, Any]: Collection and func result, in completion
+            order.
+
+    Raises:
+        AgentError: If the agent holding the private key is unreachable or
+            rejects a request, remaining collections are not processed.
+    """
+    collections = list(collections)
+    decrypted = collection_secrets(collections, private_key, workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for collection in collections:
+            try:
+                secret = collection.secret(private_key, decrypted)
+            except AgentError:
+                raise
+            except ValueError:
+                _LOGGER.error(
+                    "private key does not match collection archive: %s",
+                    collection.filepath,
+                )
+                continue
+            except DATA_ERRORS:
+                _LOGGER.exception("failed to read %s", collection.filepath)
+                continue
+            if not secret:
+                _LOGGER.error(
+                    "collection secret is missing: %s", collection.filepath
+                )
+                continue
+            future = executor.submit(func, collection, secret, *args)
+            futures[future] = collection
+        for future in as_completed(futures):
+            collection = futures[future]
+            try:
+                result = future.result()
+            except DATA_ERRORS:
+                _LOGGER.exception("failed to read %s", collection.filepath)
+                continue
+            yield collection, result
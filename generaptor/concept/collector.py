@@ -4,9 +4,12 @@ This module provides functionality for generating Velociraptor collectors,
 including collector configuration and binary generation.
 """
 
+from collections import defaultdict
+from collections.abc import Iterable
 from csv import QUOTE_MINIMAL, writer
 from dataclasses import dataclass
 from datetime import datetime
+from enum import Enum
 from io import StringIO
 from pathlib import Path
 from platform import system
@@ -14,33 +17,148 @@ from subprocess import CalledProcessError, run
 
 from ..__version__ import version
 from ..helper.crypto import Certificate, fingerprint, pem_string
+from ..helper.glob import (
+    GlobOptimizerStats,
+    bound_depth,
+    exclusion_regex,
+    optimize_globs,
+    recursive_depth,
+    split_glob,
+)
 from ..helper.logging import get_logger
+from ..helper.repack import RepackError, repack, verify_repack
+from .baseline import BaselineEntryList
 from .cache import Cache
 from .config import Config
 from .distribution import Distribution, OperatingSystem
-from .rule_set import RuleSet
+from .metadata_walk import MetadataWalk
+from .performance import (
+    DEFAULT_PERFORMANCE_PROFILE,
+    PERFORMANCE_PROFILES,
+    PerformanceProfile,
+)
+from .rule_set import RuleMode, RuleSet
 
 _LOGGER = get_logger('concept.collector')
 
 
-def _globs_from_ruleset(rule_set: RuleSet):
-    """Generate CSV glob patterns from rule set.
+def _glob_rows_from_ruleset(
+    rule_set: RuleSet, opsystem: OperatingSystem, optimize: bool = True
+) -> list[tuple[str, str, int, RuleMode]]:
+    """Generate glob rows from rule set.
+
+    Exclusion rules are skipped. Rules sharing the same size limit and
+    collection mode are optimized together.
 
     Args:
         rule_set (RuleSet): The rule set to generate glob patterns from.
+        opsystem (OperatingSystem): Operating system of the rule set.
+        optimize (bool): Deduplicate, prune and merge globs.
 
     Returns:
-        str: CSV-formatted string containing glob and accessor pairs.
+        list[tuple[str, str, int, RuleMode]]: Glob, accessor, max size and
+            mode rows.
+    """
+    groups = defaultdict(list)
+    for rule in rule_set.collected:
+        groups[(rule.max_size, rule.mode)].append(
+            (bound_depth(rule.glob, rule.max_depth), rule.accessor)
+        )
+    is_windows = opsystem == OperatingSystem.WINDOWS
+    total = GlobOptimizerStats()
+    rows = []
+    for (max_size, mode), globs in groups.items():
+        if optimize:
+            globs, stats = optimize_globs(
+                globs,
+                case_insensitive=is_windows,
+                separator='\\' if is_windows else '/',
+            )
+            total.total += stats.total
+            total.duplicates += stats.duplicates
+            total.subsumed += stats.subsumed
+            total.merged += stats.merged
+        rows.extend(
+            (glob, accessor, max_size, mode) for glob, accessor in globs
+        )
+    if optimize:
+        _LOGGER.info(
+            "glob optimizer removed %d of %d globs "
+            "(%d duplicates, %d subsumed, %d merged)",
+            total.removed,
+            total.total,
+            total.duplicates,
+            total.subsumed,
+            total.merged,
+        )
+    return rows
+
+
+def _csv_string(rows: Iterable[Iterable]) -> str:
+    """Generate CSV string without header.
+
+    Args:
+        rows (Iterable[Iterable]): CSV rows.
+
+    Returns:
+        str: CSV-formatted string.
     """
     imstr = StringIO()
     csv_writer = writer(
         imstr, delimiter=',', quotechar='"', quoting=QUOTE_MINIMAL
     )
-    for rule in rule_set.values:
-        csv_writer.writerow([rule.glob, rule.accessor])
-    file_globs = imstr.getvalue()
+    csv_writer.writerows(rows)
+    csv_string = imstr.getvalue()
     imstr.close()
-    return file_globs
+    return csv_string
+
+
+def _partition_glob_rows(
+    rows: list[tuple[str, str, int, RuleMode]],
+    prune: bool,
+    delta: bool = False,
+) -> tuple[dict[str, str], str]:
+    """Partition glob rows for the collector template.
+
+    Rows uploading matching files without limit are handled by the generic
+    file collector and partitioned per accessor, other rows are handled by
+    the limited file collector. So are recursive globs when they shall be
+    pruned using exclusions, and every row when files shall be compared to
+    a baseline, which the generic file collector cannot do.
+
+    Args:
+        rows (list[tuple[str, str, int, RuleMode]]): Glob, accessor, max
+            size and mode rows.
+        prune (bool): Recursive globs shall be pruned using exclusions.
+        delta (bool): Unchanged files shall be skipped using a baseline.
+
+    Returns:
+        tuple[dict[str, str], str]: Single column glob CSV strings indexed
+            by accessor, and limited glob rows CSV string.
+    """
+    accessor_rows = defaultdict(list)
+    limited_rows = []
+    for glob, accessor, max_size, mode in rows:
+        recursive = any(
+            recursive_depth(component) is not None
+            for component in split_glob(glob)
+        )
+        if (
+            delta
+            or mode != RuleMode.CONTENT
+            or max_size
+            or (prune and recursive)
+        ):
+            limited_rows.append((glob, accessor, max_size, mode.value))
+            continue
+        accessor_rows[accessor].append((glob,))
+    return (
+        {
+            accessor: _csv_string(globs)
+            for accessor, globs in accessor_rows.items()
+        },
+        _csv_string(limited_rows),
+    )
 
 
 @dataclass
@@ -58,6 +176,18 @@ class CollectorConfig:
         dont_be_lazy (bool | None): Whether to disable lazy collection (Windows only).
         vss_analysis_age (int | None): VSS analysis age in days (Windows only).
         use_auto_accessor (bool | None): Whether to use automatic accessor (Windows only).
+        device_workers (int): Count of devices collected in parallel (Windows
+            only).
+        optimize_globs (bool): Whether to deduplicate, prune and merge globs.
+        performance (PerformanceProfile): Endpoint resource usage settings.
+        log_globs (bool): Whether the collector logs every loaded glob.
+        fast_rule_set (RuleSet | None): Rules collected in a first archive,
+            along with volatile artifacts, before the rule set is collected
+            in a second archive. Single archive collector if None.
+        baseline (BaselineEntryList | None): Files uploaded by a previous
+            collection, skipped when unchanged. Full collector if None.
+        metadata_walk (MetadataWalk | None): Native file metadata walk
+            settings, `find / -ls` is used if None (Linux only).
     """
 
     device: str
@@ -68,6 +198,15 @@ class CollectorConfig:
     dont_be_lazy: bool | None = None
     vss_analysis_age: int | None = None
     use_auto_accessor: bool | None = None
+    device_workers: int = 1
+    optimize_globs: bool = True
+    performance: PerformanceProfile = PERFORMANCE_PROFILES[
+        DEFAULT_PERFORMANCE_PROFILE
+    ]
+    log_globs: bool = False
+    fast_rule_set: RuleSet | None = None
+    baseline: BaselineEntryList | None = None
+    metadata_walk: MetadataWalk | None = None
 
     @property
     def context(self):
@@ -75,15 +214,65 @@ class CollectorConfig:
 
         Returns:
             dict: Context dictionary used for template rendering,
-                 including version, device, certificate data, and file globs.
+                 including version, device, certificate data, file globs
+                 partitioned per accessor, exclusion regex, performance
+                 settings, fast tier file globs and baseline files.
         """
+        rows = _glob_rows_from_ruleset(
+            self.rule_set,
+            self.distribution.opsystem,
+            self.optimize_globs,
+        )
+        exclusions = self.rule_set.exclusions
+        if self.fast_rule_set:
+            exclusions += self.fast_rule_set.exclusions
+        delta = self.baseline is not None
+        accessor_globs, limited_globs = _partition_glob_rows(
+            rows, prune=bool(exclusions), delta=delta
+        )
         ctx = {
             'version': version,
             'device': self.device,
             'cert_data_pem_str': pem_string(self.certificate),
             'cert_fingerprint_hex': fingerprint(self.certificate),
-            'file_globs': _globs_from_ruleset(self.rule_set),
+            # all glob rows, kept for custom templates
+            'file_globs': _csv_string(
+                (glob, accessor, max_size, mode.value)
+                for glob, accessor, max_size, mode in rows
+            ),
+            'accessor_globs': accessor_globs,
+            'limited_globs': limited_globs,
+            'log_globs': self.log_globs,
+            'exclude_regex': exclusion_regex(
+                [rule.glob for rule in exclusions],
+                case_insensitive=(
+                    self.distribution.opsystem == OperatingSystem.WINDOWS
+                ),
+            ),
+            'performance': self.performance.to_dict(),
+            'tiered': self.fast_rule_set is not None,
+            'baseline_files': _csv_string(
+                (entry.path, entry.size, entry.mtime, entry.sha256)
+                for entry in self.baseline or []
+            ),
+            'delta': delta,
         }
+        if self.fast_rule_set is not None:
+            fast_accessor_globs, fast_limited_globs = _partition_glob_rows(
+                _glob_rows_from_ruleset(
+                    self.fast_rule_set,
+                    self.distribution.opsystem,
+                    self.optimize_globs,
+                ),
+                prune=bool(exclusions),
+                delta=delta,
+            )
+            ctx.update(
+                {
+                    'fast_accessor_globs': fast_accessor_globs,
+                    'fast_limited_globs': fast_limited_globs,
+                }
+            )
         if self.distribution.opsystem == OperatingSystem.WINDOWS:
             ctx.update(
                 {
@@ -93,8 +282,13 @@ class CollectorConfig:
                     'use_auto_accessor': (
                         'Y' if self.use_auto_accessor else 'N'
                     ),
+                    'device_workers': self.device_workers,
                 }
             )
+        if self.distribution.opsystem == OperatingSystem.LINUX:
+            ctx['metadata_walk'] = (
+                self.metadata_walk.to_dict() if self.metadata_walk else None
+            )
         return ctx
 
     def generate(self, cache: Cache, config: Config, filepath: Path):
@@ -105,10 +299,11 @@ class CollectorConfig:
             config (Config): Config instance for custom template lookup.
             filepath (Path): Output path for the generated configuration file.
         """
-        vql_template = config.vql_template(self.distribution.opsystem)
+        opsystem = self.distribution.opsystem
+        vql_template = config.vql_template(opsystem, cache.bytecode_cache)
         if vql_template is None:
             vql_template = cache.config.vql_template(
-                self.distribution.opsystem
+                opsystem, cache.bytecode_cache
             )
         else:
             _LOGGER.warning("using custom VQL template...")
@@ -117,6 +312,96 @@ class CollectorConfig:
             stream.dump(fstream, encoding='utf-8')
 
 
+class RepackMethod(Enum):
+    """Repack method.
+
+    Attributes:
+        AUTO: Native repack, falling back to subprocess on failure.
+        NATIVE: Embed configuration in template binary from Python.
+        SUBPROCESS: Run 'config repack' using the platform binary.
+    """
+
+    AUTO = 'auto'
+    NATIVE = 'native'
+    SUBPROCESS = 'subprocess'
+
+
+def _repack_subprocess(
+    cache: Cache,
+    template_binary: Path,
+    output_config: Path,
+    output_binary: Path,
+) -> bool:
+    """Repack collector binary using the platform binary.
+
+    Args:
+        cache (Cache): Cache instance for platform binary access.
+        template_binary (Path): Template binary of the collector.
+        output_config (Path): Collector configuration file.
+        output_binary (Path): Output collector binary.
+
+    Returns:
+        bool: True if repack succeeded.
+    """
+    platform_binary = cache.platform_binary()
+    if not platform_binary:
+        _LOGGER.critical("unsupported platform!")
+        return False
+    if system() in {'Linux', 'Darwin'}:
+        platform_binary.chmod(0o700)
+    argv = [
+        str(platform_binary),
+        'config',
+        'repack',
+        '--exe',
+        str(template_binary),
+        str(output_config),
+        str(output_binary),
+    ]
+    _LOGGER.info("spawning subprocess: %s", argv)
+    try:
+        run(argv, check=True)
+    except CalledProcessError as exc:
+        _LOGGER.critical("repack failed (exit %d)", exc.returncode)
+        return False
+    return True
+
+
+def _repack_verified(
+    cache: Cache,
+    template_binary: Path,
+    output_config: Path,
+    output_binary: Path,
+) -> bool:
+    """Check native repack output against subprocess repack output.
+
+    Subprocess output replaces native output when they are not equivalent.
+
+    Args:
+        cache (Cache): Cache instance for platform binary access.
+        template_binary (Path): Template binary of the collector.
+        output_config (Path): Collector configuration file.
+        output_binary (Path): Natively repacked collector binary.
+
+    Returns:
+        bool: True if a collector binary was produced.
+    """
+    reference = output_binary.with_name(f'{output_binary.name}.reference')
+    if not _repack_subprocess(
+        cache, template_binary, output_config, reference
+    ):
+        _LOGGER.critical("cannot verify native repack")
+        output_binary.unlink(missing_ok=True)
+        return False
+    if verify_repack(template_binary, output_binary, reference):
+        _LOGGER.info("native repack verified")
+        reference.unlink()
+        return True
+    _LOGGER.error("native repack mismatch, keeping subprocess output")
+    reference.replace(output_binary)
+    return True
+
+
 @dataclass
 class Collector:
     """Collector.
@@ -130,7 +415,14 @@ class Collector:
     config: CollectorConfig
 
     def generate(
-        self, cache: Cache, config: Config, directory: Path
+        self,
+        cache: Cache,
+        config: Config,
+        directory: Path,
+        name: str | None = None,
+        use_build_cache: bool = True,
+        repack_method: RepackMethod = RepackMethod.AUTO,
+        verify: bool = False,
     ) -> tuple[Path, Path] | None:
         """Generate a configuration file and a pre-configured binary.
 
@@ -138,47 +430,95 @@ class Collector:
             cache (Cache): Cache instance for binary and template access.
             config (Config): Config instance for custom template lookup.
             directory (Path): Output directory for generated files.
+            name (str | None): Output files base name, defaults to a
+                timestamped name which is only unique to the second.
+            use_build_cache (bool): Serve identical builds from the build
+                cache instead of repacking them.
+            repack_method (RepackMethod): Method embedding the configuration
+                in the template binary.
+            verify (bool): Compare native repack output with subprocess
+                repack output.
 
         Returns:
             tuple[Path, Path] | None: Tuple of (binary_path, config_path) if successful,
                                  None if generation failed.
         """
-        platform_binary = cache.platform_binary()
-        if not platform_binary:
-            _LOGGER.critical("unsupported platform!")
+        template_binary = cache.template_binary(self.config.distribution)
+        if not template_binary:
             return None
-        if system() in {'Linux', 'Darwin'}:
-            platform_binary.chmod(0o700)
         # ensure that output directory exists
         directory.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        output_config = directory / f'collector-{timestamp}.yml'
-        output_binary = (
-            directory
-            / f'collector-{timestamp}-{self.config.distribution.suffix}'
-        )
+        if not name:
+            timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+            name = f'collector-{timestamp}'
+        output_config = directory / f'{name}.yml'
+        output_binary = directory / f'{name}-{self.config.distribution.suffix}'
         # generate collector config file
         _LOGGER.info("generating configuration...")
         self.config.generate(cache, config, output_config)
         _LOGGER.info("configuration written to: %s", output_config)
         # generate collector binary
         _LOGGER.info("generating release binary...")
-        template_binary = cache.template_binary(self.config.distribution)
-        argv = [
-            str(platform_binary),
-            'config',
-            'repack',
-            '--exe',
-            str(template_binary),
-            str(output_config),
-            str(output_binary),
-        ]
-        _LOGGER.info("spawning subprocess: %s", argv)
-        try:
-            run(argv, check=True)
-        except CalledProcessError as exc:
-            _LOGGER.critical("repack failed (exit %d)", exc.returncode)
+        build_key = None
+        if use_build_cache:
+            build_key = cache.build_cache.key(template_binary, output_config)
+            if cache.build_cache.fetch(build_key, output_binary):
+                _LOGGER.info("release binary served from build cache")
+                _LOGGER.info("release binary written to: %s", output_binary)
+                return output_binary, output_config
+        if not self._repack(
+            cache,
+            template_binary,
+            output_config,
+            output_binary,
+            repack_method,
+            verify,
+        ):
             output_config.unlink(missing_ok=True)
             return None
+        if build_key:
+            cache.build_cache.store(build_key, output_binary)
         _LOGGER.info("release binary written to: %s", output_binary)
         return output_binary, output_config
+
+    def _repack(
+        self,
+        cache: Cache,
+        template_binary: Path,
+        output_config: Path,
+        output_binary: Path,
+        method: RepackMethod,
+        verify: bool,
+    ) -> bool:
+        """Embed configuration in template binary.
+
+        Args:
+            cache (Cache): Cache instance for platform binary access.
+            template_binary (Path): Template binary of the collector.
+            output_config (Path): Collector configuration file.
+            output_binary (Path): Output collector binary.
+            method (RepackMethod): Repack method.
+            verify (bool): Compare native output with subprocess output.
+
+        Returns:
+            bool: True if repack succeeded.
+        """
+        if method == RepackMethod.SUBPROCESS:
+            return _repack_subprocess(
+                cache, template_binary, output_config, output_binary
+            )
+        try:
+            repack(template_binary, output_config, output_binary)
+        except RepackError as exc:
+            if method == RepackMethod.NATIVE:
+                _LOGGER.critical("native repack failed: %s", exc)
+                return False
+            _LOGGER.warning("native repack failed, falling back: %s", exc)
+            return _repack_subprocess(
+                cache, template_binary, output_config, output_binary
+            )
+        if verify:
+            return _repack_verified(
+                cache, template_binary, output_config, output_binary
+            )
+        return True
@@ -7,8 +7,14 @@ config directory handling and loading of rules, profiles, and targets.
 from dataclasses import dataclass
 from gettext import ngettext
 from pathlib import Path
+from threading import Lock
 
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+)
 
 from ..helper.logging import get_logger
 from .distribution import OperatingSystem
@@ -17,6 +23,46 @@ from .rule_set import RuleSet
 from .target_set import TargetSet
 
 _LOGGER = get_logger('concept.config')
+_ENVIRONMENTS: dict[tuple[Path, Path | None], Environment] = {}
+_ENVIRONMENTS_LOCK = Lock()
+
+
+def _environment(directory: Path, bytecode_cache: Path | None) -> Environment:
+    """Retrieve shared jinja environment for template directory.
+
+    Environments are shared within the process, their template cache only
+    reloads templates whose modification time changed. Compiled templates
+    are also persisted in the bytecode cache directory when given.
+
+    Args:
+        directory (Path): Template directory.
+        bytecode_cache (Path | None): Compiled templates directory.
+
+    Returns:
+        Environment: Jinja environment loading templates from directory.
+    """
+    key = (directory, bytecode_cache)
+    with _ENVIRONMENTS_LOCK:
+        environment = _ENVIRONMENTS.get(key)
+        if environment:
+            return environment
+        if bytecode_cache:
+            bytecode_cache.mkdir(parents=True, exist_ok=True)
+        environment = Environment(
+            loader=FileSystemLoader(directory),
+            bytecode_cache=(
+                FileSystemBytecodeCache(str(bytecode_cache))
+                if bytecode_cache
+                else None
+            ),
+            auto_reload=True,
+            autoescape=False,  # worst case scenario: we generate invalid YAML
+            trim_blocks=False,
+            lstrip_blocks=False,
+            keep_trailing_newline=True,
+        )
+        _ENVIRONMENTS[key] = environment
+        return environment
 
 
 @dataclass(frozen=True)
@@ -106,11 +152,14 @@ class Config:
         )
         return profile_set
 
-    def vql_template(self, opsystem: OperatingSystem) -> Template | None:
+    def vql_template(
+        self, opsystem: OperatingSystem, bytecode_cache: Path | None = None
+    ) -> Template | None:
         """Load jinja template matching given operating system.
 
         Args:
             opsystem (OperatingSystem): Target operating system.
+            bytecode_cache (Path | None): Compiled templates directory.
 
         Returns:
             Template | None: Loaded Jinja2 template, or None if not found.
@@ -118,12 +167,5 @@ class Config:
         template = self.directory / opsystem.value / 'collector.yml.jinja'
         if not template.is_file():
             return None
-        loader = FileSystemLoader(template.parent)
-        environment = Environment(
-            loader=loader,
-            autoescape=False,  # worst case scenario: we generate invalid YAML
-            trim_blocks=False,
-            lstrip_blocks=False,
-            keep_trailing_newline=True,
-        )
+        environment = _environment(template.parent, bytecode_cache)
         return environment.get_template(template.name)
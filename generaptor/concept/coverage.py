@@ -0,0 +1,252 @@
+"""Generaptor Coverage module.
+
+This module maps collection archive uploaded members back to the rules
+which collected them, to report per-rule and per-target collection costs.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import chain
+from re import Pattern
+from urllib.parse import unquote
+from uuid import UUID
+
+from ..helper.glob import glob_to_regex, is_literal, split_glob
+from ..helper.logging import get_logger
+from .distribution import OperatingSystem
+from .rule_set import Rule, RuleSet
+from .target_set import TargetSet
+
+_LOGGER = get_logger('concept.coverage')
+_UPLOADS_PREFIX = 'uploads/'
+_MAX_DEVICE_DEPTH = 3
+_RULE_ACCESSORS_BY_UPLOAD_ACCESSOR = {
+    'auto': {'lazy_ntfs'},
+    'lazy_ntfs': {'lazy_ntfs'},
+    'ntfs': {'ntfs', 'lazy_ntfs'},
+    'ntfs_vss': {'ntfs', 'lazy_ntfs'},
+    'file': {'file'},
+}
+
+
+def parse_upload_member(member: str) -> tuple[str, list[str]] | None:
+    """Parse uploaded member name.
+
+    Args:
+        member (str): Member name in the data archive.
+
+    Returns:
+        tuple[str, list[str]] | None: Accessor and unescaped path components,
+            or None if member is not an upload.
+    """
+    if not member.startswith(_UPLOADS_PREFIX):
+        return None
+    parts = member[len(_UPLOADS_PREFIX) :].split('/')
+    if len(parts) < 2:
+        return None
+    accessor, *components = parts
+    return accessor, [unquote(part) for part in components if part]
+
+
+@dataclass
+class RuleMatcher:
+    """Rule matcher.
+
+    Finds the rule which collected a given uploaded file. Rules are indexed
+    by their first glob component when it is a literal to avoid evaluating
+    every rule for every file.
+
+    Attributes:
+        rule_set (RuleSet): Rules to match against.
+        opsystem (OperatingSystem): Operating system of the rules.
+    """
+
+    rule_set: RuleSet
+    opsystem: OperatingSystem
+    _by_first: dict[str, list[tuple[Rule, Pattern]]] = field(
+        init=False, default_factory=dict
+    )
+    _wildcards: list[tuple[Rule, Pattern]] = field(
+        init=False, default_factory=list
+    )
+
+    @property
+    def case_insensitive(self) -> bool:
+        """Determine if paths are case insensitive.
+
+        Returns:
+            bool: True for Windows rules.
+        """
+        return self.opsystem == OperatingSystem.WINDOWS
+
+    def __post_init__(self):
+        for rule in self.rule_set.collected:
+            components = split_glob(rule.glob)
+            if not components:
+                continue
+            item = (rule, glob_to_regex(rule.glob, self.case_insensitive))
+            first = components[0]
+            if not is_literal(first):
+                self._wildcards.append(item)
+                continue
+            if self.case_insensitive:
+                first = first.lower()
+            self._by_first.setdefault(first, []).append(item)
+
+    def match(self, accessor: str, components: list[str]) -> Rule | None:
+        """Find the rule which collected given file.
+
+        Leading components (device or root directory) are skipped until a
+        rule matches, a file matched by several rules is attributed to the
+        first rule found.
+
+        Args:
+            accessor (str): Accessor used to upload the file.
+            components (list[str]): File path components.
+
+        Returns:
+            Rule | None: Matching rule, or None if no rule matches.
+        """
+        accessors = _RULE_ACCESSORS_BY_UPLOAD_ACCESSOR.get(accessor)
+        for depth in range(min(_MAX_DEVICE_DEPTH, len(components) - 1) + 1):
+            path_components = components[depth:]
+            first = path_components[0]
+            if self.case_insensitive:
+                first = first.lower()
+            path = '/' + '/'.join(path_components)
+            for rule, regex in chain(
+                self._by_first.get(first, []), self._wildcards
+            ):
+                if accessors and rule.accessor not in accessors:
+                    continue
+                if regex.fullmatch(path):
+                    return rule
+        return None
+
+
+@dataclass(kw_only=True)
+class CoverageEntry:
+    """Coverage entry.
+
+    Attributes:
+        files (int): Count of collected files.
+        size (int): Size of collected files in bytes.
+        collections (set[str]): Collections in which files were found.
+    """
+
+    files: int = 0
+    size: int = 0
+    collections: set[str] = field(default_factory=set)
+
+    def add(self, collection: str, size: int):
+        """Account for a collected file.
+
+        Args:
+            collection (str): Collection in which the file was found.
+            size (int): Size of the file in bytes.
+        """
+        self.files += 1
+        self.size += size
+        self.collections.add(collection)
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the entry.
+        """
+        return {
+            'files': self.files,
+            'bytes': self.size,
+            'collections': len(self.collections),
+        }
+
+
+@dataclass
+class CoverageReport:
+    """Coverage report.
+
+    Accumulates per-rule and per-target collected files counts and sizes
+    across collections of the same operating system.
+
+    Attributes:
+        matcher (RuleMatcher): Rule matcher for the operating system.
+        target_set (TargetSet): Targets referencing the rules.
+    """
+
+    matcher: RuleMatcher
+    target_set: TargetSet
+    by_rule: dict[UUID, CoverageEntry] = field(default_factory=dict)
+    unmatched: CoverageEntry = field(default_factory=CoverageEntry)
+
+    def add(self, collection: str, members: Iterable[tuple[str, int]]):
+        """Account for collection archive members.
+
+        Args:
+            collection (str): Collection in which members were found.
+            members (Iterable[tuple[str, int]]): Member names and sizes.
+        """
+        for member, size in members:
+            parsed = parse_upload_member(member)
+            if not parsed:
+                continue
+            accessor, components = parsed
+            if not components:
+                continue
+            rule = self.matcher.match(accessor, components)
+            if not rule:
+                _LOGGER.debug("unmatched member: %s", member)
+                self.unmatched.add(collection, size)
+                continue
+            entry = self.by_rule.setdefault(rule.guid, CoverageEntry())
+            entry.add(collection, size)
+
+    def rule_rows(self) -> Iterable[dict]:
+        """Per-rule rows sorted by decreasing size.
+
+        Yields:
+            dict: Rule coverage row.
+        """
+        by_guid = self.matcher.rule_set.by_guid
+        for guid, entry in sorted(
+            self.by_rule.items(), key=lambda item: -item[1].size
+        ):
+            rule = by_guid[guid]
+            yield {
+                'guid': str(guid),
+                'name': rule.name,
+                'category': rule.category,
+                'glob': rule.glob,
+                'accessor': rule.accessor,
+                **entry.to_dict(),
+            }
+
+    def target_rows(self) -> Iterable[dict]:
+        """Per-target rows sorted by decreasing size.
+
+        A file collected by a rule is accounted for in every target
+        referencing this rule.
+
+        Yields:
+            dict: Target coverage row.
+        """
+        rows = []
+        for target in self.target_set.values:
+            entry = CoverageEntry()
+            for guid in target.rules:
+                rule_entry = self.by_rule.get(guid)
+                if not rule_entry:
+                    continue
+                entry.files += rule_entry.files
+                entry.size += rule_entry.size
+                entry.collections.update(rule_entry.collections)
+            if not entry.files:
+                continue
+            rows.append(
+                {
+                    'guid': str(target.guid),
+                    'name': target.name,
+                    **entry.to_dict(),
+                }
+            )
+        yield from sorted(rows, key=lambda row: -row['bytes'])
@@ -0,0 +1,141 @@
+"""Generaptor Digest Cache module.
+
+This module provides a persistent cache of collection archive members
+digests, so that collections are hashed only once.
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from ..helper.crypto import stream_digests
+from ..helper.json import dump_jsonl, load_jsonl
+from ..helper.logging import get_logger
+from .collection import Collection, sorted_members
+
+_LOGGER = get_logger('concept.digest_cache')
+
+
+@dataclass(kw_only=True, frozen=True)
+class MemberDigest:
+    """Collection archive member digests.
+
+    Attributes:
+        member (str): Member name in the data archive.
+        size (int): Member uncompressed size in bytes.
+        md5 (str): Hexadecimal MD5 digest.
+        sha1 (str): Hexadecimal SHA-1 digest.
+        sha256 (str): Hexadecimal SHA-256 digest.
+    """
+
+    member: str
+    size: int
+    md5: str
+    sha1: str
+    sha256: str
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the member digests.
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, dct: dict):
+        """Contruct instance from dict.
+
+        Args:
+            dct (dict): Dictionary representation of the member digests.
+
+        Returns:
+            MemberDigest: MemberDigest instance.
+        """
+        return cls(
+            member=dct['member'],
+            size=dct['size'],
+            md5=dct['md5'],
+            sha1=dct['sha1'],
+            sha256=dct['sha256'],
+        )
+
+
+MemberDigestList = list[MemberDigest]
+
+
+def compute_digests(collection: Collection, secret: str) -> MemberDigestList:
+    """Compute digests of all collection archive uploaded members.
+
+    Args:
+        collection (Collection): Collection archive to hash.
+        secret (str): Secret for decrypting the archive.
+
+    Returns:
+        MemberDigestList: Digests of uploaded members.
+    """
+    digests = []
+    with collection.open_data(secret) as data_zipf:
+        for member in sorted_members(data_zipf):
+            if member.is_dir() or not member.filename.startswith('uploads/'):
+                continue
+            with data_zipf.open(member) as fobj:
+                digests.append(
+                    MemberDigest(
+                        member=member.filename,
+                        size=member.file_size,
+                        **stream_digests(fobj),
+                    )
+                )
+    return digests
+
+
+@dataclass(frozen=True)
+class DigestCache:
+    """Digest cache directory.
+
+    Stores one JSONL file of member digests per collection, indexed by
+    collection identifier.
+
+    Attributes:
+        directory (Path): Path to the digest cache directory.
+    """
+
+    directory: Path
+
+    def _filepath(self, collection: Collection) -> Path:
+        """Cache file path for given collection.
+
+        Args:
+            collection (Collection): Collection archive.
+
+        Returns:
+            Path: Path to the cache file.
+        """
+        return self.directory / f'{collection.identifier}.jsonl'
+
+    def load(self, collection: Collection) -> MemberDigestList | None:
+        """Load cached digests for given collection.
+
+        Args:
+            collection (Collection): Collection archive.
+
+        Returns:
+            MemberDigestList | None: Cached digests, or None if not cached.
+        """
+        filepath = self._filepath(collection)
+        if not filepath.is_file():
+            return None
+        return [MemberDigest.from_dict(row) for row in load_jsonl(filepath)]
+
+    def store(self, collection: Collection, digests: MemberDigestList):
+        """Store digests for given collection.
+
+        Args:
+            collection (Collection): Collection archive.
+            digests (MemberDigestList): Digests to store.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        filepath = self._filepath(collection)
+        tmp_filepath = filepath.with_suffix('.tmp')
+        dump_jsonl(tmp_filepath, (digest.to_dict() for digest in digests))
+        tmp_filepath.replace(filepath)
@@ -0,0 +1,87 @@
+"""Generaptor Metadata Walk module.
+
+This module provides the settings of the native file metadata walk which
+replaces `find / -ls` in Linux collectors.
+"""
+
+from dataclasses import dataclass
+
+DEFAULT_EXCLUDED_FSTYPES = (
+    'autofs',
+    'binfmt_misc',
+    'bpf',
+    'cgroup',
+    'cgroup2',
+    'cifs',
+    'configfs',
+    'debugfs',
+    'devpts',
+    'devtmpfs',
+    'fuse.*',
+    'fusectl',
+    'hugetlbfs',
+    'mqueue',
+    'nfs',
+    'nfs4',
+    'proc',
+    'pstore',
+    'securityfs',
+    'smb3',
+    'smbfs',
+    'sysfs',
+    'tracefs',
+)
+
+
+@dataclass(kw_only=True, frozen=True)
+class MetadataWalk:
+    """Native file metadata walk settings.
+
+    Attributes:
+        root (str): Absolute path of the directory to walk.
+        depth (int): Maximum recursion depth.
+        ops_per_sec (int): Maximum operations per second, 0 means no limit.
+        excluded_fstypes (tuple[str, ...]): File system types, possibly
+            ending with a '*' wildcard, whose mount points are not walked.
+    """
+
+    root: str = '/'
+    depth: int = 30
+    ops_per_sec: int = 0
+    excluded_fstypes: tuple[str, ...] = DEFAULT_EXCLUDED_FSTYPES
+
+    def __post_init__(self):
+        if not self.root.startswith('/'):
+            raise ValueError("metadata walk root must be an absolute path")
+        if self.depth < 1:
+            raise ValueError("metadata walk depth must be positive")
+        if self.ops_per_sec < 0:
+            raise ValueError("metadata walk rate limit must be positive")
+
+    @property
+    def excluded_fstypes_regex(self) -> str:
+        """Regular expression matching excluded file system types.
+
+        Returns:
+            str: RE2 regular expression, empty if no type is excluded.
+        """
+        if not self.excluded_fstypes:
+            return ''
+        alternatives = '|'.join(
+            fstype.replace('.', '\\.').replace('*', '.*')
+            for fstype in self.excluded_fstypes
+        )
+        return f'^({alternatives})$'
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the metadata walk settings.
+        """
+        return {
+            'root': self.root,
+            'depth': self.depth,
+            'ops_per_sec': self.ops_per_sec,
+            'excluded_fstypes_regex': self.excluded_fstypes_regex,
+        }
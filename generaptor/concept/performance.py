@@ -0,0 +1,102 @@
+"""Generaptor Performance module.
+
+This module provides collector performance profiles controlling the
+resources a collector consumes on the endpoint.
+"""
+
+from dataclasses import dataclass, fields, replace
+
+DEFAULT_PERFORMANCE_PROFILE = 'balanced'
+
+
+@dataclass(kw_only=True, frozen=True)
+class PerformanceProfile:
+    """Collector performance profile.
+
+    Limits set to 0 are not rendered, i.e. Velociraptor defaults apply.
+
+    Attributes:
+        name (str): Profile name.
+        compression_level (int): Collection archive compression level (0-9).
+        cpu_limit (int): Maximum CPU usage in percent, 0 means no limit.
+        ops_per_sec (int): Maximum operations per second, 0 means no limit.
+        timeout (int): Per-artifact timeout in seconds, 0 means Velociraptor
+            default.
+        ntfs_cache_time (int): NTFS parser cache flush period in seconds
+            (Windows only).
+    """
+
+    name: str
+    compression_level: int = 5
+    cpu_limit: int = 0
+    ops_per_sec: int = 0
+    timeout: int = 0
+    ntfs_cache_time: int = 1000000
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the performance profile.
+        """
+        return {
+            'name': self.name,
+            'compression_level': self.compression_level,
+            'cpu_limit': self.cpu_limit,
+            'ops_per_sec': self.ops_per_sec,
+            'timeout': self.timeout,
+            'ntfs_cache_time': self.ntfs_cache_time,
+        }
+
+    def override(self, **settings) -> 'PerformanceProfile':
+        """Override profile settings.
+
+        Args:
+            **settings: Settings to override, None values are ignored.
+
+        Returns:
+            PerformanceProfile: Profile with overridden settings, named
+                'custom' if any setting differs.
+
+        Raises:
+            ValueError: If a setting is unknown or out of range.
+        """
+        known = {item.name for item in fields(self)} - {'name'}
+        unknown = set(settings) - known
+        if unknown:
+            raise ValueError(f"unknown performance settings: {unknown}")
+        settings = {
+            key: value for key, value in settings.items() if value is not None
+        }
+        if not 0 <= settings.get('compression_level', 0) <= 9:
+            raise ValueError("compression level must be within 0-9")
+        if not 0 <= settings.get('cpu_limit', 0) <= 100:
+            raise ValueError("cpu limit must be within 0-100")
+        if any(value < 0 for value in settings.values()):
+            raise ValueError("performance settings must be positive")
+        profile = replace(self, **settings)
+        if profile != self:
+            profile = replace(profile, name='custom')
+        return profile
+
+
+PERFORMANCE_PROFILES = {
+    profile.name: profile
+    for profile in (
+        PerformanceProfile(
+            name='fast',
+            compression_level=1,
+        ),
+        PerformanceProfile(
+            name='balanced',
+        ),
+        PerformanceProfile(
+            name='low-impact',
+            compression_level=5,
+            cpu_limit=20,
+            ops_per_sec=500,
+            timeout=7200,
+            ntfs_cache_time=600,
+        ),
+    )
+}
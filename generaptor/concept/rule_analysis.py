@@ -0,0 +1,433 @@
+"""Generaptor Rule Analysis module.
+
+This module statically estimates the endpoint cost of a rule set from its
+globs and accessors, and classifies the cheapest correct accessor of
+Windows rules, without running a collector.
+"""
+
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+from re import fullmatch
+from uuid import UUID
+
+from ..helper.glob import (
+    find_overlaps,
+    is_literal,
+    recursive_depth,
+    split_glob,
+)
+from ..helper.logging import get_logger
+from .distribution import OperatingSystem
+from .rule_set import Rule, RuleSet
+
+_LOGGER = get_logger('concept.rule_analysis')
+_HIGH_FANOUT_DIRECTORIES = {
+    OperatingSystem.WINDOWS: [
+        'Users\\*',
+        'Users\\*\\AppData',
+        'Users\\*\\AppData\\Local',
+        'Users\\*\\AppData\\Roaming',
+        'ProgramData',
+        'Program Files*',
+        'Windows',
+        'Windows\\System32',
+        'Windows\\WinSxS',
+    ],
+    OperatingSystem.LINUX: [
+        'home/*',
+        'root',
+        'opt',
+        'usr',
+        'var',
+        'var/lib',
+        'proc',
+        'sys',
+    ],
+    OperatingSystem.DARWIN: [
+        'Users/*',
+        'Users/*/Library',
+        'Applications',
+        'Library',
+        'System',
+        'private/var',
+    ],
+}
+_BASE_COST = 1
+_WILDCARD_COST = 1
+_RECURSIVE_COST = 5
+_HIGH_FANOUT_COST = 25
+_UNANCHORED_COST = 100
+_ACCESSOR_FACTOR = {'ntfs': 2}
+_LEVELS = ((500, 'low'), (2000, 'medium'))
+_RAW_NTFS_ACCESSOR = 'ntfs'
+_LAZY_NTFS_ACCESSOR = 'lazy_ntfs'
+_NTFS_METADATA_FILES = (
+    '$attrdef',
+    '$badclus',
+    '$bitmap',
+    '$boot',
+    '$extend',
+    '$logfile',
+    '$mft',
+    '$secure',
+    '$upcase',
+    '$volume',
+)
+_REGULAR_FILE_REASON = (
+    "regular file, locked files are read through the auto accessor ntfs "
+    "fallback"
+)
+
+
+@dataclass(kw_only=True, frozen=True)
+class RuleCost:
+    """Rule cost estimate.
+
+    Attributes:
+        rule (Rule): Analyzed rule.
+        score (int): Estimated relative cost.
+        recursive (bool): Glob contains a recursive wildcard.
+        unanchored (bool): Glob starts with a recursive wildcard, i.e.
+            walks the whole file system.
+        high_fanout (bool): Recursive walk starts in or above a directory
+            known to contain many entries.
+    """
+
+    rule: Rule
+    score: int
+    recursive: bool
+    unanchored: bool
+    high_fanout: bool
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the rule cost.
+        """
+        return {
+            'guid': str(self.rule.guid),
+            'name': self.rule.name,
+            'glob': self.rule.glob,
+            'accessor': self.rule.accessor,
+            'score': self.score,
+            'recursive': self.recursive,
+            'unanchored': self.unanchored,
+            'high_fanout': self.high_fanout,
+        }
+
+
+@dataclass(kw_only=True, frozen=True)
+class AccessorSuggestion:
+    """Accessor suggestion.
+
+    Attributes:
+        rule (Rule): Classified rule.
+        accessor (str): Cheapest correct accessor for the rule.
+        reason (str): Reason of the suggestion.
+    """
+
+    rule: Rule
+    accessor: str
+    reason: str
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the accessor suggestion.
+        """
+        return {
+            'guid': str(self.rule.guid),
+            'name': self.rule.name,
+            'glob': self.rule.glob,
+            'accessor': self.rule.accessor,
+            'suggested': self.accessor,
+            'reason': self.reason,
+        }
+
+
+def _prefix_matches(root: list[str], directory: list[str]) -> bool:
+    """Determine if recursion root is, or is above, a directory pattern.
+
+    Args:
+        root (list[str]): Components preceding the first recursive wildcard.
+        directory (list[str]): High-fanout directory pattern components.
+
+    Returns:
+        bool: True if root matches the leading components of directory.
+    """
+    if len(root) > len(directory):
+        return False
+    return all(
+        left == right or not is_literal(left) or not is_literal(right)
+        for left, right in zip(root, directory)
+    )
+
+
+def _rule_cost(rule: Rule, fanout_directories: list[list[str]]) -> RuleCost:
+    """Estimate rule cost.
+
+    Args:
+        rule (Rule): Rule to analyze.
+        fanout_directories (list[list[str]]): Casefolded high-fanout
+            directory patterns components.
+
+    Returns:
+        RuleCost: Rule cost estimate.
+    """
+    components = [component.casefold() for component in split_glob(rule.glob)]
+    depths = [recursive_depth(component) for component in components]
+    score = _BASE_COST
+    score += _WILDCARD_COST * sum(
+        1
+        for component, depth in zip(components, depths)
+        if depth is None and not is_literal(component)
+    )
+    recursive = any(depth is not None for depth in depths)
+    unanchored = recursive and depths[0] is not None
+    high_fanout = False
+    if unanchored:
+        score += _UNANCHORED_COST
+    elif recursive:
+        first = next(
+            index for index, depth in enumerate(depths) if depth is not None
+        )
+        root = components[:first]
+        high_fanout = any(
+            _prefix_matches(root, directory)
+            for directory in fanout_directories
+        )
+        score += _HIGH_FANOUT_COST if high_fanout else _RECURSIVE_COST
+    score *= _ACCESSOR_FACTOR.get(rule.accessor, 1)
+    return RuleCost(
+        rule=rule,
+        score=score,
+        recursive=recursive,
+        unanchored=unanchored,
+        high_fanout=high_fanout,
+    )
+
+
+@dataclass(kw_only=True)
+class RuleSetAnalysis:
+    """Rule set analysis.
+
+    Attributes:
+        costs (list[RuleCost]): Rule cost estimates.
+        overlaps (dict[UUID, UUID]): GUID of a rule matching every file of
+            an overlapping rule, indexed by overlapping rule GUID.
+        accessors (list[AccessorSuggestion]): Cheapest correct accessor
+            suggestions.
+    """
+
+    costs: list[RuleCost] = field(default_factory=list)
+    overlaps: dict[UUID, UUID] = field(default_factory=dict)
+    accessors: list[AccessorSuggestion] = field(default_factory=list)
+
+    @property
+    def score(self) -> int:
+        """Estimated relative cost of the rule set.
+
+        Returns:
+            int: Sum of rule scores.
+        """
+        return sum(cost.score for cost in self.costs)
+
+    @property
+    def level(self) -> str:
+        """Cost level of the rule set.
+
+        Returns:
+            str: 'low', 'medium' or 'high'.
+        """
+        for threshold, level in _LEVELS:
+            if self.score < threshold:
+                return level
+        return 'high'
+
+    def summary(self) -> dict:
+        """Summarize analysis.
+
+        Returns:
+            dict: Rule set cost summary.
+        """
+        return {
+            'rules': len(self.costs),
+            'score': self.score,
+            'level': self.level,
+            'recursive': sum(cost.recursive for cost in self.costs),
+            'unanchored': sum(cost.unanchored for cost in self.costs),
+            'high_fanout': sum(cost.high_fanout for cost in self.costs),
+            'overlapping': len(self.overlaps),
+            'accessor_suggestions': len(self.accessors),
+            'accessors': dict(
+                Counter(cost.rule.accessor for cost in self.costs)
+            ),
+        }
+
+    def warnings(self) -> Iterator[dict]:
+        """Warnings about expensive or redundant rules.
+
+        Yields:
+            dict: Warning with rule GUID, glob and message.
+        """
+        for cost in self.costs:
+            rule = cost.rule
+            if cost.unanchored:
+                message = "recursive glob walks the whole file system"
+            elif cost.high_fanout:
+                message = "recursive glob walks a high-fanout directory"
+            else:
+                message = None
+            if message:
+                yield {
+                    'guid': str(rule.guid),
+                    'glob': rule.glob,
+                    'message': message,
+                }
+            wider = self.overlaps.get(rule.guid)
+            if wider:
+                yield {
+                    'guid': str(rule.guid),
+                    'glob': rule.glob,
+                    'message': f"files already matched by rule {wider}",
+                }
+        for suggestion in self.accessors:
+            rule = suggestion.rule
+            if suggestion.accessor == _LAZY_NTFS_ACCESSOR:
+                message = "ntfs accessor is not required"
+            else:
+                message = f"{suggestion.accessor} accessor is required"
+            yield {
+                'guid': str(rule.guid),
+                'glob': rule.glob,
+                'message': f"{message}: {suggestion.reason}",
+            }
+
+
+def _classify_accessor(rule: Rule) -> tuple[str, str] | None:
+    """Classify cheapest correct accessor of a Windows rule.
+
+    NTFS metadata files and alternate data streams are only reachable with
+    the raw ntfs parser. Other files, including locked ones such as hives
+    or event logs in use, are read by the lazy_ntfs collector which uses
+    the auto accessor falling back to ntfs when a file is locked.
+
+    Args:
+        rule (Rule): Rule to classify.
+
+    Returns:
+        tuple[str, str] | None: Accessor and reason, or None if the glob
+            may match NTFS metadata files through a wildcard.
+    """
+    components = [component.casefold() for component in split_glob(rule.glob)]
+    if components and fullmatch(r'[a-z]:', components[0]):
+        components = components[1:]
+    if not components:
+        return None
+    if any(':' in component for component in components):
+        return _RAW_NTFS_ACCESSOR, "alternate data stream"
+    if components[0].startswith(_NTFS_METADATA_FILES):
+        return _RAW_NTFS_ACCESSOR, "NTFS metadata file"
+    if not is_literal(components[0]):
+        return None
+    return _LAZY_NTFS_ACCESSOR, _REGULAR_FILE_REASON
+
+
+def suggest_accessors(
+    rule_set: RuleSet, opsystem: OperatingSystem
+) -> list[AccessorSuggestion]:
+    """Suggest cheapest correct accessor of rules using another one.
+
+    Only Windows rules using ntfs or lazy_ntfs accessors are classified.
+
+    Args:
+        rule_set (RuleSet): Rule set to classify.
+        opsystem (OperatingSystem): Operating system of the rule set.
+
+    Returns:
+        list[AccessorSuggestion]: Suggestions for rules using an accessor
+            which is either slower than required or unable to read files.
+    """
+    if opsystem != OperatingSystem.WINDOWS:
+        return []
+    suggestions = []
+    for rule in rule_set.collected:
+        if rule.accessor not in (_RAW_NTFS_ACCESSOR, _LAZY_NTFS_ACCESSOR):
+            continue
+        classification = _classify_accessor(rule)
+        if not classification or classification[0] == rule.accessor:
+            continue
+        accessor, reason = classification
+        suggestions.append(
+            AccessorSuggestion(rule=rule, accessor=accessor, reason=reason)
+        )
+    return suggestions
+
+
+def assign_accessors(rule_set: RuleSet, opsystem: OperatingSystem) -> RuleSet:
+    """Assign cheapest correct accessor to rules.
+
+    Args:
+        rule_set (RuleSet): Rule set to classify.
+        opsystem (OperatingSystem): Operating system of the rule set.
+
+    Returns:
+        RuleSet: Rule set with suggested accessors applied, exclusions and
+            unclassified rules are kept as is.
+    """
+    suggestions = {
+        suggestion.rule.guid: suggestion
+        for suggestion in suggest_accessors(rule_set, opsystem)
+    }
+    for suggestion in suggestions.values():
+        _LOGGER.info(
+            "assigned %s accessor to %s (%s)",
+            suggestion.accessor,
+            suggestion.rule.glob,
+            suggestion.reason,
+        )
+    return RuleSet(
+        by_guid={
+            guid: (
+                replace(rule, accessor=suggestions[guid].accessor)
+                if guid in suggestions
+                else rule
+            )
+            for guid, rule in rule_set.by_guid.items()
+        }
+    )
+
+
+def analyze_rule_set(
+    rule_set: RuleSet, opsystem: OperatingSystem
+) -> RuleSetAnalysis:
+    """Estimate rule set endpoint cost.
+
+    Args:
+        rule_set (RuleSet): Rule set to analyze.
+        opsystem (OperatingSystem): Operating system of the rule set.
+
+    Returns:
+        RuleSetAnalysis: Rule set analysis.
+    """
+    fanout_directories = [
+        [component.casefold() for component in split_glob(directory)]
+        for directory in _HIGH_FANOUT_DIRECTORIES.get(opsystem, [])
+    ]
+    rules = rule_set.collected
+    costs = [_rule_cost(rule, fanout_directories) for rule in rules]
+    overlaps = find_overlaps(
+        [(rule.glob, rule.accessor) for rule in rules],
+        case_insensitive=(opsystem == OperatingSystem.WINDOWS),
+    )
+    return RuleSetAnalysis(
+        costs=costs,
+        overlaps={
+            rules[narrow].guid: rules[wide].guid
+            for narrow, wide in overlaps.items()
+        },
+        accessors=suggest_accessors(rule_set, opsystem),
+    )
@@ -4,8 +4,9 @@ This module provides data structures for managing rules in generaptor,
 including the Rule class and RuleSet collection.
 """
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from dataclasses import asdict, dataclass, field
+from enum import Enum
 from pathlib import Path
 from uuid import UUID, uuid4
 
@@ -15,6 +16,37 @@ from ..helper.logging import get_logger
 _LOGGER = get_logger('concept.ruleset')
 
 
+class RuleMode(Enum):
+    """Rule collection mode.
+
+    Attributes:
+        CONTENT: Upload matching files.
+        HASH_ONLY: Hash matching files without uploading them.
+        METADATA_ONLY: List matching files without reading them.
+        EXCLUDE: Prune matching directories from recursive walks of other
+            rules.
+    """
+
+    CONTENT = 'content'
+    HASH_ONLY = 'hash-only'
+    METADATA_ONLY = 'metadata-only'
+    EXCLUDE = 'exclude'
+
+
+def _is_non_negative_int(value) -> bool:
+    """Determine if value is a non-negative integer.
+
+    Args:
+        value: Value to check.
+
+    Returns:
+        bool: True if value is an int, not a bool, greater or equal to 0.
+    """
+    return (
+        isinstance(value, int) and not isinstance(value, bool) and value >= 0
+    )
+
+
 @dataclass(kw_only=True, frozen=True)
 class Rule:
     """Rule.
@@ -28,6 +60,11 @@ class Rule:
         glob (str): Glob pattern for file matching.
         accessor (str): Accessor type for the rule.
         comment (str): Descriptive comment about the rule's purpose.
+        max_size (int): Maximum size in bytes of files read by the rule,
+            larger files are only listed, 0 means no limit.
+        mode (RuleMode): Collection mode of matching files.
+        max_depth (int): Maximum depth of recursive wildcards, 0 means
+            glob depth.
     """
 
     guid: UUID = field(default_factory=uuid4)
@@ -36,6 +73,17 @@ class Rule:
     glob: str
     accessor: str
     comment: str
+    max_size: int = 0
+    mode: RuleMode = RuleMode.CONTENT
+    max_depth: int = 0
+
+    def __post_init__(self):
+        if not _is_non_negative_int(self.max_size):
+            raise ValueError(f"invalid rule max size: {self.max_size!r}")
+        if self.mode not in set(RuleMode):
+            raise ValueError(f"invalid rule mode: {self.mode!r}")
+        if not _is_non_negative_int(self.max_depth):
+            raise ValueError(f"invalid rule max depth: {self.max_depth!r}")
 
     def to_dict(self) -> dict:
         """Convert to dict.
@@ -45,9 +93,45 @@ class Rule:
         """
         dct = asdict(self)
         dct['guid'] = str(dct['guid'])
+        dct['mode'] = dct['mode'].value
         return dct
 
 
+def _load_rules(filepath: Path) -> Iterator[Rule]:
+    """Load valid rules from JSONL file, skipping invalid rows.
+
+    Args:
+        filepath (Path): Path to JSONL file containing rule definitions.
+
+    Yields:
+        Rule: Rules built from valid rows.
+    """
+    for row in load_jsonl(filepath):
+        try:
+            yield Rule(
+                guid=UUID(row['guid']),
+                name=row['name'],
+                category=row['category'],
+                glob=row['glob'],
+                accessor=row['accessor'],
+                comment=row['comment'],
+                max_size=row.get('max_size', 0),
+                mode=RuleMode(row.get('mode', RuleMode.CONTENT.value)),
+                max_depth=row.get('max_depth', 0),
+            )
+        except KeyError as exc:
+            _LOGGER.error(
+                "skipped invalid rule in %s: %s (missing %s)",
+                filepath,
+                row,
+                exc,
+            )
+        except (AttributeError, TypeError, ValueError) as exc:
+            _LOGGER.error(
+                "skipped invalid rule in %s: %s (%s)", filepath, row, exc
+            )
+
+
 GUIDRuleMapping = dict[UUID, Rule]
 
 
@@ -90,6 +174,24 @@ class RuleSet:
         """
         return self.by_guid.values()
 
+    @property
+    def collected(self) -> list[Rule]:
+        """Retrieve rules collecting files.
+
+        Returns:
+            list[Rule]: Rules which are not exclusions.
+        """
+        return [rule for rule in self.values if rule.mode != RuleMode.EXCLUDE]
+
+    @property
+    def exclusions(self) -> list[Rule]:
+        """Retrieve exclusion rules.
+
+        Returns:
+            list[Rule]: Rules pruning directories from recursive walks.
+        """
+        return [rule for rule in self.values if rule.mode == RuleMode.EXCLUDE]
+
     @classmethod
     def from_iterable(cls, iterable: Iterable[Rule]):
         """Build from iterable.
@@ -118,17 +220,7 @@ class RuleSet:
         Returns:
             RuleSet: New RuleSet instance loaded from the file.
         """
-        return cls.from_iterable(
-            Rule(
-                guid=UUID(row['guid']),
-                name=row['name'],
-                category=row['category'],
-                glob=row['glob'],
-                accessor=row['accessor'],
-                comment=row['comment'],
-            )
-            for row in load_jsonl(filepath)
-        )
+        return cls.from_iterable(_load_rules(filepath))
 
     def merge(self, rule_set: 'RuleSet') -> bool:
         """Merge rules from given rule set in this rule set.
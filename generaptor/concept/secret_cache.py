@@ -0,0 +1,204 @@
+"""Generaptor Secret Cache module.
+
+This module provides a persistent cache of decrypted collection secrets,
+encrypted with a key derived from the private key passphrase, so that
+private key operations are done only once per collection secret.
+"""
+
+from base64 import b64decode, b64encode
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from secrets import token_bytes
+from time import time
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+from ..helper.crypto import data_checksum
+from ..helper.json import dump_json, load_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('concept.secret_cache')
+SECRET_CACHE_TTL = 86400
+_SALT_FILENAME = 'salt'
+_SALT_SIZE = 16
+_NONCE_SIZE = 12
+
+
+def _digest(fingerprint: str | None, b64_enc_secret: str) -> str:
+    """Digest indexing a cached secret.
+
+    Args:
+        fingerprint (str | None): Collection certificate fingerprint.
+        b64_enc_secret (str): Base64-encoded encrypted secret.
+
+    Returns:
+        str: Digest of the fingerprint and encrypted secret.
+    """
+    return data_checksum(f'{fingerprint}:{b64_enc_secret}'.encode())
+
+
+@dataclass(frozen=True)
+class SecretCache:
+    """Secret cache directory.
+
+    Stores one JSON file per encrypted collection secret, indexed by the
+    digest of the collection certificate fingerprint and encrypted secret.
+    Decrypted secrets are encrypted using AES-GCM with a key derived from
+    the private key passphrase, bound to the fingerprint, and are forgotten
+    after their time to live.
+
+    Attributes:
+        directory (Path): Path to the secret cache directory.
+        ttl (int): Seconds before stored secrets expire.
+    """
+
+    directory: Path
+    ttl: int = SECRET_CACHE_TTL
+    key: bytes | None = field(default=None, repr=False)
+
+    def _salt(self) -> bytes:
+        """Key derivation salt, created on first use.
+
+        Returns:
+            bytes: Salt shared by all entries of the cache.
+        """
+        filepath = self.directory / _SALT_FILENAME
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        salt = token_bytes(_SALT_SIZE)
+        try:
+            with filepath.open('xb') as fobj:
+                fobj.write(salt)
+        except FileExistsError:
+            return filepath.read_bytes()
+        return salt
+
+    def unlock(
+        self, private_key_secret: str, ttl: int | None = None
+    ) -> 'SecretCache':
+        """Derive the cache key from the private key passphrase.
+
+        Args:
+            private_key_secret (str): Private key passphrase.
+            ttl (int | None): Seconds before stored secrets expire,
+                defaults to current ttl.
+
+        Returns:
+            SecretCache: Secret cache able to load and store secrets.
+        """
+        kdf = Scrypt(salt=self._salt(), length=32, n=2**15, r=8, p=1)
+        key = kdf.derive(private_key_secret.encode('utf-8'))
+        return replace(self, key=key, ttl=ttl or self.ttl)
+
+    def _filepath(self, digest: str) -> Path:
+        """Cache file path for given encrypted secret digest.
+
+        Args:
+            digest (str): Digest of the encrypted secret.
+
+        Returns:
+            Path: Path to the cache file.
+        """
+        return self.directory / f'{digest}.json'
+
+    def load(
+        self, fingerprint: str | None, b64_enc_secret: str
+    ) -> bytes | None:
+        """Load cached secret for given encrypted secret.
+
+        Args:
+            fingerprint (str | None): Collection certificate fingerprint.
+            b64_enc_secret (str): Base64-encoded encrypted secret.
+
+        Returns:
+            bytes | None: Decrypted secret, or None if not cached, expired,
+                stored for another fingerprint or using another passphrase.
+        """
+        if not self.key:
+            return None
+        digest = _digest(fingerprint, b64_enc_secret)
+        filepath = self._filepath(digest)
+        if not filepath.is_file():
+            return None
+        dct = load_json(filepath.read_text(encoding='utf-8'))
+        if not dct:
+            return None
+        try:
+            if dct['fingerprint'] != fingerprint:
+                _LOGGER.warning(
+                    "cached secret fingerprint mismatch: %s", filepath
+                )
+                return None
+            expires = dct['expires']
+            if expires <= time():
+                filepath.unlink(missing_ok=True)
+                return None
+            return AESGCM(self.key).decrypt(
+                b64decode(dct['nonce']),
+                b64decode(dct['secret']),
+                f'{fingerprint}:{digest}:{expires}'.encode(),
+            )
+        except (KeyError, TypeError, ValueError, InvalidTag):
+            _LOGGER.warning("cannot use cached secret: %s", filepath)
+            return None
+
+    def store(
+        self, fingerprint: str | None, b64_enc_secret: str, secret: bytes
+    ):
+        """Store decrypted secret for given encrypted secret.
+
+        Args:
+            fingerprint (str | None): Collection certificate fingerprint.
+            b64_enc_secret (str): Base64-encoded encrypted secret.
+            secret (bytes): Decrypted secret.
+        """
+        if not self.key:
+            return
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        digest = _digest(fingerprint, b64_enc_secret)
+        expires = int(time()) + self.ttl
+        nonce = token_bytes(_NONCE_SIZE)
+        enc_secret = AESGCM(self.key).encrypt(
+            nonce, secret, f'{fingerprint}:{digest}:{expires}'.encode()
+        )
+        filepath = self._filepath(digest)
+        tmp_filepath = filepath.with_suffix('.tmp')
+        tmp_filepath.touch(mode=0o600)
+        tmp_filepath.write_text(
+            dump_json(
+                {
+                    'fingerprint': fingerprint,
+                    'expires': expires,
+                    'nonce': b64encode(nonce).decode(),
+                    'secret': b64encode(enc_secret).decode(),
+                }
+            ),
+            encoding='utf-8',
+        )
+        tmp_filepath.replace(filepath)
+
+    def purge(self, everything: bool = False) -> int:
+        """Remove expired cached secrets.
+
+        Args:
+            everything (bool): If True, remove all cached secrets and the
+                key derivation salt.
+
+        Returns:
+            int: Number of removed secrets.
+        """
+        if not self.directory.is_dir():
+            return 0
+        now = time()
+        count = 0
+        for filepath in self.directory.glob('*.json'):
+            if not everything:
+                dct = load_json(filepath.read_text(encoding='utf-8'))
+                if dct and dct.get('expires', 0) > now:
+                    continue
+            filepath.unlink(missing_ok=True)
+            count += 1
+        if everything:
+            (self.directory / _SALT_FILENAME).unlink(missing_ok=True)
+        return count
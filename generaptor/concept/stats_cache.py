@@ -0,0 +1,121 @@
+"""Generaptor Stats Cache module.
+
+This module provides a persistent cache of collection statistics, so that
+collections are decrypted only once to size them.
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from ..helper.json import dump_json, load_json
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('concept.stats_cache')
+
+
+@dataclass(kw_only=True, frozen=True)
+class CollectionStats:
+    """Collection statistics.
+
+    Attributes:
+        duration (float): Collection duration in seconds.
+        files (int): Count of uploaded files.
+        uploaded_bytes (int): Uploaded bytes.
+        errors (int): Count of error log messages.
+        artifact_rows (dict[str, int]): Count of result rows indexed by
+            artifact name.
+    """
+
+    duration: float
+    files: int
+    uploaded_bytes: int
+    errors: int
+    artifact_rows: dict[str, int]
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the collection statistics.
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, dct: dict):
+        """Contruct instance from dict.
+
+        Args:
+            dct (dict): Dictionary representation of the collection
+                statistics.
+
+        Returns:
+            CollectionStats: CollectionStats instance.
+        """
+        return cls(
+            duration=dct['duration'],
+            files=dct['files'],
+            uploaded_bytes=dct['uploaded_bytes'],
+            errors=dct['errors'],
+            artifact_rows=dct['artifact_rows'],
+        )
+
+
+@dataclass(frozen=True)
+class StatsCache:
+    """Stats cache directory.
+
+    Stores one JSON file of statistics per collection, indexed by
+    collection identifier. Collections read it through their stats
+    properties, hence this module does not depend on the collection module.
+
+    Attributes:
+        directory (Path): Path to the stats cache directory.
+    """
+
+    directory: Path
+
+    def _filepath(self, identifier: str) -> Path:
+        """Cache file path for given collection identifier.
+
+        Args:
+            identifier (str): Collection identifier.
+
+        Returns:
+            Path: Path to the cache file.
+        """
+        return self.directory / f'{identifier}.json'
+
+    def load(self, identifier: str) -> CollectionStats | None:
+        """Load cached statistics for given collection identifier.
+
+        Args:
+            identifier (str): Collection identifier.
+
+        Returns:
+            CollectionStats | None: Cached statistics, or None if not cached
+                or invalid.
+        """
+        filepath = self._filepath(identifier)
+        if not filepath.is_file():
+            return None
+        dct = load_json(filepath.read_text(encoding='utf-8'))
+        if not dct:
+            return None
+        try:
+            return CollectionStats.from_dict(dct)
+        except KeyError:
+            _LOGGER.warning("invalid cached statistics: %s", filepath)
+            return None
+
+    def store(self, identifier: str, stats: CollectionStats):
+        """Store statistics for given collection identifier.
+
+        Args:
+            identifier (str): Collection identifier.
+            stats (CollectionStats): Statistics to store.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        filepath = self._filepath(identifier)
+        tmp_filepath = filepath.with_suffix('.tmp')
+        tmp_filepath.write_text(dump_json(stats.to_dict()), encoding='utf-8')
+        tmp_filepath.replace(filepath)
@@ -6,6 +6,7 @@ including the Target class and TargetSet collection.
 
 from collections.abc import Iterable
 from dataclasses import asdict, dataclass, field
+from enum import Enum
 from pathlib import Path
 from uuid import UUID, uuid4
 
@@ -17,6 +18,19 @@ from .rule_set import RuleSet
 _LOGGER = get_logger('concept.targetset')
 
 
+class TargetTier(Enum):
+    """Collection tier of a target.
+
+    Attributes:
+        FAST: Small high-value files, collected in a first archive along
+            with volatile artifacts.
+        BULK: Other files, collected in a second archive.
+    """
+
+    FAST = 'fast'
+    BULK = 'bulk'
+
+
 @dataclass(kw_only=True, frozen=True)
 class Target:
     """Target.
@@ -27,11 +41,13 @@ class Target:
         guid (UUID): Unique identifier for the target.
         name (str): Human-readable name of the target.
         rules (set[UUID]): Set of rule GUIDs that this target includes.
+        tier (TargetTier): Collection tier of the target.
     """
 
     guid: UUID = field(default_factory=uuid4)
     name: str
     rules: set[UUID]
+    tier: TargetTier = TargetTier.BULK
 
     def to_dict(self) -> dict:
         """Convert to dict.
@@ -42,6 +58,7 @@ class Target:
         dct = asdict(self)
         dct['guid'] = str(dct['guid'])
         dct['rules'] = list(sorted(map(str, dct['rules'])))
+        dct['tier'] = self.tier.value
         return dct
 
 
@@ -128,6 +145,7 @@ class TargetSet:
                 guid=UUID(row['guid']),
                 name=row['name'],
                 rules=set(map(UUID, row['rules'])),
+                tier=TargetTier(row.get('tier', TargetTier.BULK.value)),
             )
             for row in load_jsonl(filepath)
         )
@@ -159,34 +177,52 @@ class TargetSet:
         self.by_guid.update(target_set.by_guid)
         return True
 
-    def select(self, rule_set: RuleSet, targets: list[str | UUID]) -> RuleSet:
-        """Build a rule set from an existing ruleset and selected targets.
+    def _prompt(self) -> list[str]:
+        """Prompt for an interactive targets selection.
 
-        If no targets are provided, an interactive selection is prompted.
+        Returns:
+            list[str]: Selected target names.
+        """
+        return multiselect(
+            "Pick one or more collection targets",
+            [
+                Option(label=target.name, value=target.name)
+                for target in self.by_name.values()
+            ],
+        )
+
+    def _resolve(self, targets: list[str | UUID]) -> list[Target]:
+        """Resolve target names or GUIDs.
 
         Args:
-            rule_set (RuleSet): The complete rule set to filter from.
-            targets (list[str | UUID]): List of target names or GUIDs to include.
-                If empty, interactive selection will be used.
+            targets (list[str | UUID]): List of target names or GUIDs.
 
         Returns:
-            RuleSet: New RuleSet containing only rules from the selected targets.
+            list[Target]: Known targets, unknown ones are skipped.
         """
-        if not targets:
-            targets = multiselect(
-                "Pick one or more collection targets",
-                [
-                    Option(label=target.name, value=target.name)
-                    for target in self.by_name.values()
-                ],
-            )
-        by_guid = {}
+        resolved = []
         for key in targets:
             by_key = self.by_guid if isinstance(key, UUID) else self.by_name
             target = by_key.get(key)
             if not target:
                 _LOGGER.warning("skipped unknown target: %s", key)
                 continue
+            resolved.append(target)
+        return resolved
+
+    @staticmethod
+    def _rules(rule_set: RuleSet, targets: list[Target]) -> RuleSet:
+        """Build a rule set from an existing ruleset and resolved targets.
+
+        Args:
+            rule_set (RuleSet): The complete rule set to filter from.
+            targets (list[Target]): Resolved targets to include.
+
+        Returns:
+            RuleSet: New RuleSet containing only rules from given targets.
+        """
+        by_guid = {}
+        for target in targets:
             for guid in target.rules:
                 if guid not in rule_set.by_guid:
                     _LOGGER.warning("skipped missing rule: %s", guid)
@@ -196,3 +232,57 @@ class TargetSet:
                 "select %s (%d rules)", target.name, len(target.rules)
             )
         return RuleSet(by_guid=by_guid)
+
+    def select(self, rule_set: RuleSet, targets: list[str | UUID]) -> RuleSet:
+        """Build a rule set from an existing ruleset and selected targets.
+
+        If no targets are provided, an interactive selection is prompted.
+
+        Args:
+            rule_set (RuleSet): The complete rule set to filter from.
+            targets (list[str | UUID]): List of target names or GUIDs to include.
+                If empty, interactive selection will be used.
+
+        Returns:
+            RuleSet: New RuleSet containing only rules from the selected targets.
+        """
+        if not targets:
+            targets = self._prompt()
+        return self._rules(rule_set, self._resolve(targets))
+
+    def select_tiers(
+        self, rule_set: RuleSet, targets: list[str | UUID]
+    ) -> tuple[RuleSet, RuleSet]:
+        """Build fast and bulk tier rule sets from selected targets.
+
+        If no targets are provided, an interactive selection is prompted.
+        Rules selected by targets of both tiers are collected in the fast
+        tier only.
+
+        Args:
+            rule_set (RuleSet): The complete rule set to filter from.
+            targets (list[str | UUID]): List of target names or GUIDs to include.
+                If empty, interactive selection will be used.
+
+        Returns:
+            tuple[RuleSet, RuleSet]: Fast tier and bulk tier rule sets.
+        """
+        if not targets:
+            targets = self._prompt()
+        resolved = self._resolve(targets)
+        fast_rule_set = self._rules(
+            rule_set,
+            [target for target in resolved if target.tier == TargetTier.FAST],
+        )
+        bulk_rule_set = self._rules(
+            rule_set,
+            [target for target in resolved if target.tier == TargetTier.BULK],
+        )
+        bulk_rule_set = RuleSet(
+            by_guid={
+                guid: rule
+                for guid, rule in bulk_rule_set.by_guid.items()
+                if guid not in fast_rule_set.by_guid
+            }
+        )
+        return fast_rule_set, bulk_rule_set
@@ -0,0 +1,416 @@
+"""Generaptor Timing module.
+
+This module extracts per-artifact and per-phase timings and overall
+statistics from collection archives logs and aggregates timings across
+collections.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from math import ceil, isfinite
+from zipfile import ZipFile
+
+from ..helper.json import load_json
+from ..helper.logging import get_logger
+from .collection import Collection
+from .stats_cache import CollectionStats
+
+_LOGGER = get_logger('concept.timing')
+_CONTEXT_FILENAME = 'collection_context.json'
+_LOG_FILENAME = 'log.json'
+_UPLOADS_PREFIX = 'uploads/'
+_ERROR_LEVEL = 'ERROR'
+_CUSTOM_PREFIX = '(custom) '
+_PHASE_SUFFIX = '...'
+_NANOSECONDS = 1_000_000_000
+
+
+def _counter(value) -> int:
+    """Convert query stats counter to an integer.
+
+    Args:
+        value: Counter as a number or a numeric string.
+
+    Returns:
+        int: Counter value.
+
+    Raises:
+        TypeError: If value is neither a number nor a string.
+        ValueError: If value is not a finite non-negative number.
+    """
+    if isinstance(value, bool) or not isinstance(value, int | float | str):
+        raise TypeError(f"invalid counter type: {value!r}")
+    number = float(value)
+    if not isfinite(number) or number < 0:
+        raise ValueError(f"invalid counter: {value!r}")
+    return int(number)
+
+
+@dataclass(kw_only=True, frozen=True)
+class ArtifactTiming:
+    """Artifact timing.
+
+    Attributes:
+        artifact (str): Artifact name.
+        duration (float): Query duration in seconds.
+        rows (int): Count of result rows.
+        uploaded_files (int): Count of uploaded files.
+        uploaded_bytes (int): Uploaded bytes.
+        status (str): Query status.
+    """
+
+    artifact: str
+    duration: float
+    rows: int
+    uploaded_files: int
+    uploaded_bytes: int
+    status: str
+
+    @classmethod
+    def from_dict(cls, dct: dict):
+        """Contruct instance from Velociraptor query stats.
+
+        Args:
+            dct (dict): Query stats item of the collection context.
+
+        Returns:
+            ArtifactTiming: ArtifactTiming instance.
+
+        Raises:
+            TypeError: If a counter is neither a number nor a string.
+            ValueError: If a counter is invalid.
+        """
+        names = dct.get('names_with_response')
+        if not isinstance(names, list) or not names:
+            names = ['unknown']
+        return cls(
+            artifact=str(dct.get('Artifact') or names[0]),
+            duration=_counter(dct.get('duration', 0)) / _NANOSECONDS,
+            rows=_counter(dct.get('result_rows', 0)),
+            uploaded_files=_counter(dct.get('uploaded_files', 0)),
+            uploaded_bytes=_counter(dct.get('uploaded_bytes', 0)),
+            status=str(dct.get('status', 'UNKNOWN')),
+        )
+
+
+@dataclass(kw_only=True, frozen=True)
+class PhaseTiming:
+    """Collector phase timing.
+
+    A phase starts with a custom progress log message and ends with the
+    next one or with the last log message.
+
+    Attributes:
+        phase (str): Phase name, i.e. progress message.
+        duration (float): Phase duration in seconds.
+    """
+
+    phase: str
+    duration: float
+
+
+@dataclass(kw_only=True)
+class CollectionTiming:
+    """Collection timing.
+
+    Attributes:
+        artifacts (list[ArtifactTiming]): Artifacts timings.
+        phases (list[PhaseTiming]): Collector phases timings.
+    """
+
+    artifacts: list[ArtifactTiming] = field(default_factory=list)
+    phases: list[PhaseTiming] = field(default_factory=list)
+
+
+def _parse_artifacts(data_zipf: ZipFile) -> list[ArtifactTiming]:
+    """Parse artifacts timings from collection context.
+
+    Args:
+        data_zipf (ZipFile): Decrypted data archive.
+
+    Returns:
+        list[ArtifactTiming]: Artifacts timings.
+    """
+    try:
+        context = load_json(data_zipf.read(_CONTEXT_FILENAME).decode())
+    except KeyError:
+        _LOGGER.warning("%s not found in data archive", _CONTEXT_FILENAME)
+        return []
+    if not isinstance(context, dict):
+        return []
+    query_stats = context.get('query_stats', [])
+    if not isinstance(query_stats, list):
+        _LOGGER.warning("invalid query stats in %s", _CONTEXT_FILENAME)
+        return []
+    artifacts = []
+    malformed = 0
+    for item in query_stats:
+        if not isinstance(item, dict):
+            malformed += 1
+            continue
+        try:
+            artifacts.append(ArtifactTiming.from_dict(item))
+        except (TypeError, ValueError):
+            malformed += 1
+    if malformed:
+        _LOGGER.warning("skipped %d malformed query stats items", malformed)
+    return artifacts
+
+
+def _timestamp(value) -> float | None:
+    """Convert log row timestamp to seconds since epoch.
+
+    Args:
+        value: Timestamp as a number, a numeric string or an ISO 8601 string.
+
+    Returns:
+        float | None: Seconds since epoch, or None if value is invalid.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        timestamp = float(value)
+    elif isinstance(value, str):
+        try:
+            timestamp = float(value)
+        except ValueError:
+            try:
+                timestamp = datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                return None
+    else:
+        return None
+    return timestamp if isfinite(timestamp) else None
+
+
+def _parse_phases(data_zipf: ZipFile) -> list[PhaseTiming]:
+    """Parse collector phases timings from collection log.
+
+    Args:
+        data_zipf (ZipFile): Decrypted data archive.
+
+    Returns:
+        list[PhaseTiming]: Collector phases timings.
+    """
+    try:
+        lines = data_zipf.read(_LOG_FILENAME).decode().splitlines()
+    except KeyError:
+        _LOGGER.warning("%s not found in data archive", _LOG_FILENAME)
+        return []
+    phases = []
+    current = None
+    timestamp = None
+    malformed = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row = load_json(line)
+        if not isinstance(row, dict):
+            continue
+        value = row.get('_ts', row.get('client_time'))
+        if value is not None:
+            value = _timestamp(value)
+            if value is None:
+                malformed += 1
+                continue
+            timestamp = value
+        message = row.get('message', row.get('Message', ''))
+        if (
+            timestamp is None
+            or not isinstance(message, str)
+            or not message.startswith(_CUSTOM_PREFIX)
+            or not message.endswith(_PHASE_SUFFIX)
+        ):
+            continue
+        if current:
+            phases.append(
+                PhaseTiming(phase=current[0], duration=timestamp - current[1])
+            )
+        phase = message[len(_CUSTOM_PREFIX) : -len(_PHASE_SUFFIX)]
+        current = (phase, timestamp)
+    if current and timestamp is not None:
+        phases.append(
+            PhaseTiming(phase=current[0], duration=timestamp - current[1])
+        )
+    if malformed:
+        _LOGGER.warning(
+            "skipped %d log rows with invalid timestamp", malformed
+        )
+    return phases
+
+
+def _count_errors(data_zipf: ZipFile) -> int:
+    """Count error messages in collection log.
+
+    Args:
+        data_zipf (ZipFile): Decrypted data archive.
+
+    Returns:
+        int: Count of error log messages.
+    """
+    try:
+        lines = data_zipf.read(_LOG_FILENAME).decode().splitlines()
+    except KeyError:
+        _LOGGER.warning("%s not found in data archive", _LOG_FILENAME)
+        return 0
+    errors = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row = load_json(line)
+        if (
+            isinstance(row, dict)
+            and str(row.get('level', '')).upper() == _ERROR_LEVEL
+        ):
+            errors += 1
+    return errors
+
+
+def collection_timing(collection: Collection, secret: str) -> CollectionTiming:
+    """Extract timings from collection archive.
+
+    Args:
+        collection (Collection): Collection archive.
+        secret (str): Secret for decrypting the archive.
+
+    Returns:
+        CollectionTiming: Collection timings.
+    """
+    with collection.open_data(secret) as data_zipf:
+        return CollectionTiming(
+            artifacts=_parse_artifacts(data_zipf),
+            phases=_parse_phases(data_zipf),
+        )
+
+
+def collection_stats(collection: Collection, secret: str) -> CollectionStats:
+    """Extract statistics from collection archive.
+
+    Duration spans collector phases, or the longest artifact query when
+    the log has no phase, uploaded files are counted from the archive
+    members.
+
+    Args:
+        collection (Collection): Collection archive.
+        secret (str): Secret for decrypting the archive.
+
+    Returns:
+        CollectionStats: Collection statistics.
+    """
+    with collection.open_data(secret) as data_zipf:
+        artifacts = _parse_artifacts(data_zipf)
+        phases = _parse_phases(data_zipf)
+        uploads = [
+            member
+            for member in data_zipf.infolist()
+            if not member.is_dir()
+            and member.filename.startswith(_UPLOADS_PREFIX)
+        ]
+        errors = _count_errors(data_zipf)
+    artifact_rows = {}
+    for item in artifacts:
+        artifact_rows[item.artifact] = (
+            artifact_rows.get(item.artifact, 0) + item.rows
+        )
+    if phases:
+        duration = sum(item.duration for item in phases)
+    else:
+        duration = max((item.duration for item in artifacts), default=0.0)
+    return CollectionStats(
+        duration=round(duration, 3),
+        files=len(uploads),
+        uploaded_bytes=sum(member.file_size for member in uploads),
+        errors=errors,
+        artifact_rows=artifact_rows,
+    )
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Compute percentile using the nearest-rank method.
+
+    Args:
+        values (list[float]): Non-empty list of values.
+        pct (float): Percentile between 0 and 100.
+
+    Returns:
+        float: Percentile value.
+    """
+    ordered = sorted(values)
+    rank = max(ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _durations_row(durations: list[float]) -> dict:
+    """Summarize durations.
+
+    Args:
+        durations (list[float]): Durations in seconds.
+
+    Returns:
+        dict: Durations statistics.
+    """
+    return {
+        'collections': len(durations),
+        'p50': round(percentile(durations, 50), 3),
+        'p95': round(percentile(durations, 95), 3),
+        'max': round(max(durations), 3),
+    }
+
+
+@dataclass
+class TimingReport:
+    """Timing report.
+
+    Accumulates artifacts and phases timings across collections.
+    """
+
+    artifacts: dict[str, list[ArtifactTiming]] = field(default_factory=dict)
+    phases: dict[str, list[float]] = field(default_factory=dict)
+
+    def add(self, timing: CollectionTiming):
+        """Account for collection timings.
+
+        Args:
+            timing (CollectionTiming): Collection timings.
+        """
+        for item in timing.artifacts:
+            self.artifacts.setdefault(item.artifact, []).append(item)
+        for item in timing.phases:
+            self.phases.setdefault(item.phase, []).append(item.duration)
+
+    def artifact_rows(self) -> Iterable[dict]:
+        """Per-artifact rows sorted by decreasing p95 duration.
+
+        Yields:
+            dict: Artifact timing row.
+        """
+        rows = []
+        for artifact, items in self.artifacts.items():
+            rows.append(
+                {
+                    'artifact': artifact,
+                    **_durations_row([item.duration for item in items]),
+                    'rows': sum(item.rows for item in items),
+                    'uploaded_files': sum(
+                        item.uploaded_files for item in items
+                    ),
+                    'uploaded_bytes': sum(
+                        item.uploaded_bytes for item in items
+                    ),
+                    'failures': sum(item.status != 'OK' for item in items),
+                }
+            )
+        yield from sorted(rows, key=lambda row: -row['p95'])
+
+    def phase_rows(self) -> Iterable[dict]:
+        """Per-phase rows sorted by decreasing p95 duration.
+
+        Yields:
+            dict: Phase timing row.
+        """
+        rows = [
+            {'phase': phase, **_durations_row(durations)}
+            for phase, durations in self.phases.items()
+        ]
+        yield from sorted(rows, key=lambda row: -row['p95'])
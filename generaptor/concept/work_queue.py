@@ -0,0 +1,231 @@
+"""Generaptor Work Queue module.
+
+This module provides a lease-based work queue stored in a SQLite file,
+allowing several processes or nodes sharing a directory to distribute
+collection archives processing between them.
+"""
+
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from os import getpid
+from pathlib import Path
+from socket import gethostname
+from sqlite3 import Connection, connect
+from threading import Event, Thread
+from time import time
+
+from ..helper.logging import get_logger
+
+_LOGGER = get_logger('concept.work_queue')
+_BUSY_TIMEOUT = 60
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    state TEXT NOT NULL,
+    owner TEXT,
+    expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+class TaskState(Enum):
+    """Task state.
+
+    Attributes:
+        PENDING: Task waits for a worker.
+        LEASED: Task is processed by a worker until its lease expires.
+        DONE: Task was processed successfully.
+        FAILED: Task processing failed.
+    """
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+def default_owner() -> str:
+    """Default worker identifier.
+
+    Returns:
+        str: Hostname and process identifier.
+    """
+    return f'{gethostname()}:{getpid()}'
+
+
+@dataclass(frozen=True)
+class WorkQueue:
+    """Lease-based work queue.
+
+    A worker claims a task by leasing it for a limited duration and shall
+    renew the lease until the task is completed. Tasks whose lease expired,
+    i.e. whose worker died, are claimed again by other workers.
+
+    SQLite locking relies on the file system, the queue file shall be
+    stored on a file system supporting POSIX locks when shared between
+    nodes.
+
+    Attributes:
+        filepath (Path): Path to the SQLite queue file.
+        owner (str): Worker identifier.
+        lease_duration (float): Lease duration in seconds.
+    """
+
+    filepath: Path
+    owner: str
+    lease_duration: float = 300.0
+
+    def _connect(self) -> Connection:
+        """Open a connection to the queue file.
+
+        Connections are opened per operation so that the queue can be used
+        from several threads.
+
+        Returns:
+            Connection: Connection in autocommit mode.
+        """
+        conn = connect(
+            str(self.filepath), timeout=_BUSY_TIMEOUT, isolation_level=None
+        )
+        conn.execute(_SCHEMA)
+        return conn
+
+    def submit(self, tasks: Iterable[tuple[str, str]]):
+        """Submit tasks, already known tasks are ignored.
+
+        Args:
+            tasks (Iterable[tuple[str, str]]): Task keys and names.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany(
+                'INSERT OR IGNORE INTO tasks (key, name, state) '
+                'VALUES (?, ?, ?)',
+                [(key, name, TaskState.PENDING.value) for key, name in tasks],
+            )
+            conn.execute('COMMIT')
+
+    def claim(self, keys: Iterable[str]) -> str | None:
+        """Claim a pending or expired task among given keys.
+
+        Args:
+            keys (Iterable[str]): Keys of the tasks this worker can process.
+
+        Returns:
+            str | None: Claimed task key, or None if no task is available.
+        """
+        keys = list(keys)
+        if not keys:
+            return None
+        now = time()
+        placeholders = ','.join('?' * len(keys))
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT key, state FROM tasks '
+                f'WHERE key IN ({placeholders}) AND '
+                '(state = ? OR (state = ? AND expires < ?)) '
+                'ORDER BY attempts, key LIMIT 1',
+                [
+                    *keys,
+                    TaskState.PENDING.value,
+                    TaskState.LEASED.value,
+                    now,
+                ],
+            ).fetchone()
+            if not row:
+                conn.execute('COMMIT')
+                return None
+            key, state = row
+            conn.execute(
+                'UPDATE tasks SET state = ?, owner = ?, expires = ?, '
+                'attempts = attempts + 1 WHERE key = ?',
+                [
+                    TaskState.LEASED.value,
+                    self.owner,
+                    now + self.lease_duration,
+                    key,
+                ],
+            )
+            conn.execute('COMMIT')
+        if state == TaskState.LEASED.value:
+            _LOGGER.warning("reclaimed expired task: %s", key)
+        return key
+
+    def renew(self, key: str) -> bool:
+        """Renew lease of a task claimed by this worker.
+
+        Args:
+            key (str): Task key.
+
+        Returns:
+            bool: False if the lease was lost, i.e. reclaimed by another worker.
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'UPDATE tasks SET expires = ? '
+                'WHERE key = ? AND owner = ? AND state = ?',
+                [
+                    time() + self.lease_duration,
+                    key,
+                    self.owner,
+                    TaskState.LEASED.value,
+                ],
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, key: str, state: TaskState):
+        """Complete a task claimed by this worker.
+
+        Args:
+            key (str): Task key.
+            state (TaskState): Final task state, DONE or FAILED.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute(
+                'UPDATE tasks SET state = ?, expires = NULL '
+                'WHERE key = ? AND owner = ?',
+                [state.value, key, self.owner],
+            )
+
+    @contextmanager
+    def lease(self, key: str) -> Iterator[None]:
+        """Keep the lease of a claimed task alive.
+
+        Lease is renewed in a background thread three times per lease
+        duration until the context exits.
+
+        Args:
+            key (str): Task key.
+        """
+        stop = Event()
+
+        def _renew():
+            while not stop.wait(self.lease_duration / 3):
+                if not self.renew(key):
+                    _LOGGER.warning("lost lease of task: %s", key)
+                    return
+
+        thread = Thread(target=_renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def counts(self) -> dict[str, int]:
+        """Count tasks by state.
+
+        Returns:
+            dict[str, int]: Count of tasks indexed by state value.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT state, COUNT(*) FROM tasks GROUP BY state'
+            ).fetchall()
+        return dict(rows)
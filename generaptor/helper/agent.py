@@ -0,0 +1,182 @@
+"""Key agent helper module.
+
+This module provides the client side of the key agent which keeps
+unlocked private keys in memory behind a Unix socket and decrypts
+collection secrets on behalf of other commands.
+"""
+
+from base64 import b64decode
+from dataclasses import dataclass
+from json import JSONDecodeError, dumps, loads
+from os import getenv, getuid
+from pathlib import Path
+from socket import AF_UNIX, SOCK_STREAM, socket
+from stat import S_ISDIR, S_ISSOCK
+
+from .logging import get_logger
+
+_LOGGER = get_logger('helper.agent')
+AGENT_SOCKET_ENV = 'GENERAPTOR_AGENT_SOCK'
+AGENT_SOCKET_NAME = 'agent.sock'
+AGENT_TIMEOUT = 30.0
+_KEY_SUFFIX = '.key.pem'
+
+
+class AgentError(ValueError):
+    """Key agent is unreachable or rejected a request."""
+
+
+def default_socket_path() -> Path | None:
+    """Key agent socket path.
+
+    Returns:
+        Path | None: Socket path from GENERAPTOR_AGENT_SOCK environment
+            variable, generaptor directory in XDG_RUNTIME_DIR otherwise, or
+            None if neither is set.
+    """
+    socket_path = getenv(AGENT_SOCKET_ENV)
+    if socket_path:
+        return Path(socket_path)
+    runtime_dir = getenv('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / 'generaptor' / AGENT_SOCKET_NAME
+    return None
+
+
+def check_private(path: Path, is_socket: bool = False):
+    """Check that path is owned by current user and private.
+
+    Args:
+        path (Path): Path to the socket or its directory.
+        is_socket (bool): True if path must be a socket, a directory
+            otherwise.
+
+    Raises:
+        AgentError: If path is missing, of the wrong type, owned by another
+            user or accessible to group or others.
+    """
+    try:
+        info = path.lstat() if is_socket else path.stat()
+    except OSError as exc:
+        raise AgentError(f"agent unreachable: {exc}") from exc
+    is_expected_type = S_ISSOCK if is_socket else S_ISDIR
+    if not is_expected_type(info.st_mode):
+        raise AgentError(f"unexpected file type: {path}")
+    if info.st_uid != getuid():
+        raise AgentError(f"not owned by current user: {path}")
+    if info.st_mode & 0o077:
+        raise AgentError(f"accessible to group or others: {path}")
+
+
+def key_id_from_path(private_key_path: Path) -> str:
+    """Key identifier from private key file path.
+
+    Args:
+        private_key_path (Path): Path to the private key file.
+
+    Returns:
+        str: Certificate fingerprint for generated keys, filename otherwise.
+    """
+    return private_key_path.name.removesuffix(_KEY_SUFFIX)
+
+
+def agent_request(request: dict, socket_path: Path | None = None) -> dict:
+    """Send a request to the key agent.
+
+    Args:
+        request (dict): Request with 'op' operation name and arguments.
+        socket_path (Path | None): Agent socket path, defaults to
+            default_socket_path().
+
+    Returns:
+        dict: Agent response.
+
+    Raises:
+        AgentError: If the agent is unreachable, its socket is not private
+            to current user or it rejects the request.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not socket_path:
+        raise AgentError(f"agent socket unknown, set {AGENT_SOCKET_ENV}")
+    socket_path = socket_path.absolute()
+    check_private(socket_path.parent)
+    check_private(socket_path, is_socket=True)
+    try:
+        with socket(AF_UNIX, SOCK_STREAM) as sock:
+            sock.settimeout(AGENT_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.sendall(dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as fobj:
+                line = fobj.readline()
+        response = loads(line)
+    except (OSError, JSONDecodeError) as exc:
+        raise AgentError(f"agent unreachable: {exc}") from exc
+    if not response.get('ok'):
+        raise AgentError(response.get('error', "unknown agent error"))
+    return response
+
+
+@dataclass(frozen=True)
+class AgentPrivateKey:
+    """Private key held by the key agent.
+
+    Stands for an unlocked private key in commands, secrets are decrypted
+    by the agent so that the key and its passphrase never leave it.
+
+    Attributes:
+        socket_path (Path): Agent socket path.
+        key_id (str): Key identifier in the agent.
+    """
+
+    socket_path: Path
+    key_id: str
+
+    def decrypt_secret(self, b64_enc_secret: str) -> bytes:
+        """Decrypt a base64-encoded secret.
+
+        Args:
+            b64_enc_secret (str): Base64-encoded secret to decrypt.
+
+        Returns:
+            bytes: Decrypted secret bytes.
+
+        Raises:
+            AgentError: If the agent is unreachable, the key expired or
+                does not match the secret.
+        """
+        response = agent_request(
+            {
+                'op': 'decrypt',
+                'key_id': self.key_id,
+                'b64_enc_secret': b64_enc_secret,
+            },
+            self.socket_path,
+        )
+        return b64decode(response['secret'])
+
+
+def agent_private_key(private_key_path: Path) -> AgentPrivateKey | None:
+    """Retrieve agent key matching a private key file.
+
+    Args:
+        private_key_path (Path): Path to the private key file.
+
+    Returns:
+        AgentPrivateKey | None: Agent key, or None if no agent is configured
+            in the environment or the agent does not hold the key.
+    """
+    socket_path = getenv(AGENT_SOCKET_ENV)
+    if not socket_path:
+        return None
+    socket_path = Path(socket_path)
+    key_id = key_id_from_path(private_key_path)
+    try:
+        response = agent_request({'op': 'list'}, socket_path)
+    except AgentError as exc:
+        _LOGGER.warning("%s", exc)
+        return None
+    if key_id not in {key['key_id'] for key in response['keys']}:
+        _LOGGER.info("agent does not hold key %s", key_id)
+        return None
+    _LOGGER.info("using agent key %s", key_id)
+    return AgentPrivateKey(socket_path=socket_path, key_id=key_id)
@@ -5,24 +5,40 @@ This module provides cryptographic utilities for generaptor, including:
 - Encryption and decryption
 - Checksum computation
 - PEM format conversion
+- Pool of pre-generated private keys and certificates
 """
 
 from base64 import b64decode
-from datetime import datetime, timedelta, timezone
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta, timezone
 from getpass import getpass
-from os import getenv
+from itertools import repeat
+from os import environ, getenv, getpid
 from pathlib import Path
 from secrets import token_urlsafe
+from subprocess import DEVNULL, Popen
+from sys import executable
+from time import time
+from typing import BinaryIO
 
 from cryptography.hazmat.primitives.asymmetric.padding import MGF1, OAEP
 from cryptography.hazmat.primitives.asymmetric.rsa import (
     RSAPrivateKey,
     generate_private_key,
 )
-from cryptography.hazmat.primitives.hashes import SHA256, SHA512, Hash
+from cryptography.hazmat.primitives.hashes import (
+    MD5,
+    SHA1,
+    SHA256,
+    SHA512,
+    Hash,
+)
 from cryptography.hazmat.primitives.serialization import (
     BestAvailableEncryption,
     Encoding,
+    NoEncryption,
     PrivateFormat,
     load_pem_private_key,
 )
@@ -38,6 +54,7 @@ from cryptography.x509 import (
 )
 from cryptography.x509.oid import NameOID
 
+from .agent import AgentError, AgentPrivateKey, agent_private_key
 from .logging import get_logger
 
 _LOGGER = get_logger('helper.crypto')
@@ -45,6 +62,11 @@ VALIDITY = timedelta(days=30)
 CHUNK_SIZE = 8192
 RSA_KEY_SIZE = 4096
 RSA_PUBLIC_EXPONENT = 65537
+KEY_POOL_SIZE = 4
+KEY_POOL_MAX_AGE = timedelta(days=7)
+_KEY_POOL_LOCK_MAX_AGE = 3600
+# private key loaded by each secret decryption worker process
+_WORKER_PRIVATE_KEY: RSAPrivateKey | None = None
 
 
 def checksum(filepath: Path) -> str:
@@ -65,6 +87,40 @@ def checksum(filepath: Path) -> str:
     return digest.finalize().hex()
 
 
+def data_checksum(data: bytes) -> str:
+    """Compute the checksum of in-memory data.
+
+    Args:
+        data (bytes): Data to hash.
+
+    Returns:
+        str: Hexadecimal SHA-256 checksum of the data.
+    """
+    digest = Hash(SHA256())
+    digest.update(data)
+    return digest.finalize().hex()
+
+
+def stream_digests(stream: BinaryIO) -> dict[str, str]:
+    """Compute MD5, SHA-1 and SHA-256 digests of a stream in a single pass.
+
+    Args:
+        stream (BinaryIO): Stream to read data from.
+
+    Returns:
+        dict[str, str]: Hexadecimal digests indexed by algorithm name.
+    """
+    digests = {
+        'md5': Hash(MD5()),
+        'sha1': Hash(SHA1()),
+        'sha256': Hash(SHA256()),
+    }
+    while chunk := stream.read(CHUNK_SIZE * 128):
+        for digest in digests.values():
+            digest.update(chunk)
+    return {name: digest.finalize().hex() for name, digest in digests.items()}
+
+
 def fingerprint(certificate: Certificate):
     """Certificate SHA256 fingerprint.
 
@@ -153,32 +209,38 @@ def generate_private_key_and_certificate(
 
 
 def private_key_to_pem_bytes(
-    private_key: RSAPrivateKey, private_key_secret: bytes
+    private_key: RSAPrivateKey, private_key_secret: bytes | None
 ) -> bytes:
     """RSA private key to PEM bytes.
 
     Args:
         private_key (RSAPrivateKey): RSA private key to convert.
-        private_key_secret (bytes): Password for encrypting the private key.
+        private_key_secret (bytes | None): Password for encrypting the
+            private key, None for an unencrypted key.
 
     Returns:
-        bytes: Encrypted PEM-encoded private key bytes.
+        bytes: PEM-encoded private key bytes.
     """
     return private_key.private_bytes(
         encoding=Encoding.PEM,
         format=PrivateFormat.TraditionalOpenSSL,
-        encryption_algorithm=BestAvailableEncryption(private_key_secret),
+        encryption_algorithm=(
+            BestAvailableEncryption(private_key_secret)
+            if private_key_secret
+            else NoEncryption()
+        ),
     )
 
 
 def private_key_from_pem_bytes(
-    pem_bytes: bytes, private_key_secret: bytes
+    pem_bytes: bytes, private_key_secret: bytes | None
 ) -> RSAPrivateKey:
     """RSA private key from PEM bytes.
 
     Args:
-        pem_bytes (bytes): Encrypted PEM-encoded private key bytes.
-        private_key_secret (bytes): Password for decrypting the private key.
+        pem_bytes (bytes): PEM-encoded private key bytes.
+        private_key_secret (bytes | None): Password for decrypting the
+            private key, None for an unencrypted key.
 
     Returns:
         RSAPrivateKey: Decrypted RSA private key.
@@ -210,6 +272,238 @@ def certificate_from_pem_bytes(pem_bytes: bytes) -> Certificate:
     return load_pem_x509_certificate(pem_bytes)
 
 
+def _generate_pool_entry(directory: Path, private_key_secret: bytes) -> str:
+    """Generate a key pool entry.
+
+    Certificate is written first and private key last, both through a
+    temporary file, so that a private key file denotes a complete entry.
+
+    Args:
+        directory (Path): Key pool directory.
+        private_key_secret (bytes): Password for encrypting the private key.
+
+    Returns:
+        str: Hexadecimal fingerprint of the generated certificate.
+    """
+    private_key, certificate = generate_private_key_and_certificate()
+    fingerprint_hex = fingerprint(certificate)
+    for suffix, data in (
+        ('.crt.pem', certificate_to_pem_bytes(certificate)),
+        (
+            '.key.pem',
+            private_key_to_pem_bytes(private_key, private_key_secret),
+        ),
+    ):
+        filepath = directory / f'{fingerprint_hex}{suffix}'
+        tmp_filepath = directory / f'{fingerprint_hex}{suffix}.tmp'
+        tmp_filepath.write_bytes(data)
+        tmp_filepath.replace(filepath)
+    return fingerprint_hex
+
+
+@dataclass(frozen=True)
+class KeyPool:
+    """Pool of pre-generated private keys and certificates.
+
+    Private keys are encrypted with the private key secret when generated
+    and handed out at most once, by atomically renaming the private key
+    file before moving it to the output directory.
+
+    Attributes:
+        directory (Path): Path to the key pool directory.
+    """
+
+    directory: Path
+
+    @property
+    def enabled(self) -> bool:
+        """Determine if key pool was filled at least once.
+
+        Returns:
+            bool: True if the key pool directory exists.
+        """
+        return self.directory.is_dir()
+
+    @property
+    def size(self) -> int:
+        """Count of entries maintained in the key pool.
+
+        Returns:
+            int: Size requested by the last fill, default size otherwise.
+        """
+        try:
+            return int((self.directory / 'size').read_text())
+        except (OSError, ValueError):
+            return KEY_POOL_SIZE
+
+    @property
+    def fingerprints(self) -> list[str]:
+        """Fingerprints of available entries.
+
+        Returns:
+            list[str]: Hexadecimal fingerprints of entries with both a
+                private key and a certificate.
+        """
+        return sorted(
+            filepath.name.removesuffix('.key.pem')
+            for filepath in self.directory.glob('*.key.pem')
+            if filepath.with_name(
+                filepath.name.replace('.key.pem', '.crt.pem')
+            ).is_file()
+        )
+
+    def _acquire_fill_lock(self) -> Path | None:
+        """Acquire fill lock, breaking stale locks.
+
+        Returns:
+            Path | None: Lock file path, or None if another fill is running.
+        """
+        lock = self.directory / 'fill.lock'
+        try:
+            if time() - lock.stat().st_mtime > _KEY_POOL_LOCK_MAX_AGE:
+                _LOGGER.warning("breaking stale key pool lock")
+                lock.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+        try:
+            with lock.open('x') as fobj:
+                fobj.write(str(getpid()))
+        except FileExistsError:
+            return None
+        return lock
+
+    def fill(
+        self,
+        private_key_secret: str,
+        size: int | None = None,
+        workers: int = 1,
+    ) -> int:
+        """Generate entries until the key pool holds given size.
+
+        Args:
+            private_key_secret (str): Secret for encrypting private keys.
+            size (int | None): Count of entries to maintain, defaults to the
+                size requested by the last fill.
+            workers (int): Count of keys generated in parallel.
+
+        Returns:
+            int: Count of generated entries.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if size is None:
+            size = self.size
+        else:
+            (self.directory / 'size').write_text(str(size))
+        lock = self._acquire_fill_lock()
+        if not lock:
+            _LOGGER.info("key pool is already being filled")
+            return 0
+        generated = 0
+        secret = private_key_secret.encode('utf-8')
+        try:
+            # entries may be claimed while generating, check again
+            while (missing := size - len(self.fingerprints)) > 0:
+                _LOGGER.info("generating %d pooled keys...", missing)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(
+                            _generate_pool_entry, self.directory, secret
+                        )
+                        for _ in range(missing)
+                    ]
+                    for future in futures:
+                        future.result()
+                generated += missing
+            return generated
+        finally:
+            lock.unlink(missing_ok=True)
+
+    def refill_async(self):
+        """Refill key pool in a detached background process."""
+        _LOGGER.info("refilling key pool in background...")
+        Popen(
+            [
+                executable,
+                '-m',
+                'generaptor.main',
+                '--cache',
+                str(self.directory.parent),
+                'key-pool',
+            ],
+            env=environ.copy(),
+            stdin=DEVNULL,
+            stdout=DEVNULL,
+            stderr=DEVNULL,
+            start_new_session=True,
+        )
+
+    def _discard(self, *filepaths: Path):
+        """Remove entry files.
+
+        Args:
+            filepaths (Path): Entry files to remove.
+        """
+        for filepath in filepaths:
+            filepath.unlink(missing_ok=True)
+
+    def claim(
+        self, output_directory: Path, private_key_secret: str
+    ) -> Certificate | None:
+        """Hand out a pooled entry.
+
+        Entries older than the maximum age are discarded, the key pool is
+        left untouched if it is encrypted with another secret.
+
+        Args:
+            output_directory (Path): Directory to move key and certificate
+                files to.
+            private_key_secret (str): Secret the private key was encrypted
+                with.
+
+        Returns:
+            Certificate | None: Certificate of the claimed entry, or None if
+                the key pool is empty.
+
+        Raises:
+            ValueError: If the key pool is encrypted with another secret.
+        """
+        secret = private_key_secret.encode('utf-8')
+        utc_now = datetime.now(UTC)
+        for fingerprint_hex in self.fingerprints:
+            key_filepath = self.directory / f'{fingerprint_hex}.key.pem'
+            crt_filepath = self.directory / f'{fingerprint_hex}.crt.pem'
+            claimed = self.directory / f'{fingerprint_hex}.key.{getpid()}'
+            try:
+                key_filepath.rename(claimed)
+            except FileNotFoundError:
+                # claimed by another process
+                continue
+            key_pem_bytes = claimed.read_bytes()
+            certificate = certificate_from_pem_bytes(crt_filepath.read_bytes())
+            try:
+                private_key_from_pem_bytes(key_pem_bytes, secret)
+            except (TypeError, ValueError) as exc:
+                claimed.rename(key_filepath)
+                raise ValueError(
+                    "key pool is encrypted with another secret"
+                ) from exc
+            if utc_now - certificate.not_valid_before_utc > KEY_POOL_MAX_AGE:
+                _LOGGER.warning("discarded outdated pooled key")
+                self._discard(claimed, crt_filepath)
+                continue
+            output_directory.mkdir(parents=True, exist_ok=True)
+            (output_directory / f'{fingerprint_hex}.key.pem').write_bytes(
+                key_pem_bytes
+            )
+            (output_directory / f'{fingerprint_hex}.crt.pem').write_bytes(
+                certificate_to_pem_bytes(certificate)
+            )
+            self._discard(claimed, crt_filepath)
+            _LOGGER.info("using pooled certificate %s", fingerprint_hex)
+            return certificate
+        return None
+
+
 def _provide_private_key_secret(
     ask_password: bool = False, raise_if_generate: bool = False
 ) -> str:
@@ -285,16 +579,21 @@ def provide_x509_certificate(
     cert_filepath: Path | None = None,
     ask_password: bool = False,
     private_key_secret: str | None = None,
+    key_pool: KeyPool | None = None,
 ) -> Certificate:
     """Provide x509 certificate.
 
-    Loads an existing certificate from a file or generates a new self-signed one.
+    Loads an existing certificate from a file, claims one from the key pool
+    or generates a new self-signed one.
 
     Args:
         output_directory (Path): Directory to save generated key and certificate files.
         cert_filepath (Path | None): Optional path to existing certificate file.
         ask_password (bool): If True, prompt for private key secret.
         private_key_secret (str | None): Optional secret for encrypting private key.
+        key_pool (KeyPool | None): Optional key pool, only used if enabled
+            and the secret is given or set in the environment, refilled in
+            background if the secret is set in the environment.
 
     Returns:
         Certificate: X.509 certificate (loaded or newly generated).
@@ -307,29 +606,69 @@ def provide_x509_certificate(
             fingerprint(certificate),
         )
         return certificate
+    env_secret = getenv('GENERAPTOR_PK_SECRET')
+    pool_secret = private_key_secret or env_secret
+    if key_pool and key_pool.enabled and pool_secret:
+        try:
+            certificate = key_pool.claim(output_directory, pool_secret)
+        except ValueError as exc:
+            # refilling would not replace entries encrypted with another secret
+            _LOGGER.warning("%s, key pool not refilled", exc)
+        else:
+            # detached refill reads the secret from the environment only
+            if pool_secret == env_secret:
+                key_pool.refill_async()
+            else:
+                _LOGGER.warning(
+                    "key pool not refilled, secret differs from "
+                    "GENERAPTOR_PK_SECRET environment variable"
+                )
+            if certificate:
+                return certificate
+            _LOGGER.warning("no pooled key available")
     return _generate_self_signed_certificate(
         output_directory, ask_password, private_key_secret
     )
 
 
+def ask_private_key_secret() -> str | None:
+    """Provide private key secret from environment or user input.
+
+    Returns:
+        str | None: Private key secret, or None if not provided.
+    """
+    try:
+        return _provide_private_key_secret(
+            ask_password=True, raise_if_generate=True
+        )
+    except (ValueError, KeyboardInterrupt):
+        return None
+
+
 def load_private_key(
-    private_key_path: Path, private_key_secret: str | None = None
-) -> RSAPrivateKey | None:
+    private_key_path: Path,
+    private_key_secret: str | None = None,
+    use_agent: bool = True,
+) -> RSAPrivateKey | AgentPrivateKey | None:
     """Load PEM encoded encrypted private key from file.
 
+    The key agent is used instead if GENERAPTOR_AGENT_SOCK environment
+    variable is set and the agent holds the key, the file is not read and
+    no secret is needed then.
+
     Args:
         private_key_path (Path): Path to the encrypted private key file.
         private_key_secret (str | None): Optional secret for decrypting the key.
+        use_agent (bool): If False, always read the key from file.
 
     Returns:
-        RSAPrivateKey | None: Loaded private key, or None if loading failed.
+        RSAPrivateKey | AgentPrivateKey | None: Loaded private key, or None if
+            loading failed.
     """
-    try:
-        private_key_secret = private_key_secret or _provide_private_key_secret(
-            ask_password=True, raise_if_generate=True
-        )
-    except (ValueError, KeyboardInterrupt):
-        private_key_secret = None
+    agent_key = agent_private_key(private_key_path) if use_agent else None
+    if agent_key:
+        return agent_key
+    private_key_secret = private_key_secret or ask_private_key_secret()
     if not private_key_secret:
         _LOGGER.warning("failed to provide private key secret")
         return None
@@ -338,19 +677,114 @@ def load_private_key(
     )
 
 
-def decrypt_secret(private_key: RSAPrivateKey, b64_enc_secret: str) -> bytes:
+def decrypt_secret(
+    private_key: RSAPrivateKey | AgentPrivateKey, b64_enc_secret: str
+) -> bytes:
     """Decrypt a base64-encoded secret using given private key.
 
     Args:
-        private_key (RSAPrivateKey): Private key for decryption.
+        private_key (RSAPrivateKey | AgentPrivateKey): Private key for
+            decryption.
         b64_enc_secret (str): Base64-encoded secret to decrypt.
 
     Returns:
         bytes: Decrypted secret bytes.
+
+    Raises:
+        ValueError: If the private key does not match the secret.
     """
+    if isinstance(private_key, AgentPrivateKey):
+        return private_key.decrypt_secret(b64_enc_secret)
     enc_secret = b64decode(b64_enc_secret)
     secret = private_key.decrypt(
         enc_secret,
         OAEP(mgf=MGF1(algorithm=SHA512()), algorithm=SHA512(), label=None),
     )
     return secret
+
+
+def _init_decrypt_worker(private_key_pem: bytes):
+    """Load private key once per decryption worker process.
+
+    Args:
+        private_key_pem (bytes): Unencrypted PEM encoded private key.
+    """
+    global _WORKER_PRIVATE_KEY
+    _WORKER_PRIVATE_KEY = private_key_from_pem_bytes(private_key_pem, None)
+
+
+def _decrypt_secret_or_none(
+    private_key: RSAPrivateKey | AgentPrivateKey | None, b64_enc_secret: str
+) -> bytes | None:
+    """Decrypt a base64-encoded secret, None if the key does not match.
+
+    Args:
+        private_key (RSAPrivateKey | AgentPrivateKey | None): Private key for
+            decryption, worker process key if None.
+        b64_enc_secret (str): Base64-encoded secret to decrypt.
+
+    Returns:
+        bytes | None: Decrypted secret bytes, or None if decryption failed.
+
+    Raises:
+        AgentError: If the agent is unreachable or rejects the request.
+    """
+    try:
+        return decrypt_secret(
+            private_key or _WORKER_PRIVATE_KEY, b64_enc_secret
+        )
+    except AgentError:
+        raise
+    except ValueError:
+        return None
+
+
+def decrypt_secrets(
+    private_key: RSAPrivateKey | AgentPrivateKey,
+    b64_enc_secrets: Iterable[str],
+    workers: int | None = None,
+) -> dict[str, bytes | None]:
+    """Decrypt many base64-encoded secrets using given private key.
+
+    Repeated secrets are decrypted once. Distinct secrets are spread across
+    worker processes each loading the private key once, agent keys are
+    used sequentially.
+
+    Args:
+        private_key (RSAPrivateKey | AgentPrivateKey): Private key for
+            decryption.
+        b64_enc_secrets (Iterable[str]): Base64-encoded secrets to decrypt.
+        workers (int | None): Number of worker processes, defaults to
+            the number of CPUs.
+
+    Returns:
+        dict[str, bytes | None]: Decrypted secrets indexed by base64-encoded
+            secret in first seen order, None for secrets the private key
+            does not match.
+
+    Raises:
+        AgentError: If the agent holding the private key is unreachable or
+            rejects a request.
+    """
+    unique = list(dict.fromkeys(b64_enc_secrets))
+    if (
+        len(unique) < 2
+        or workers == 1
+        or isinstance(private_key, AgentPrivateKey)
+    ):
+        return {
+            b64_enc_secret: _decrypt_secret_or_none(
+                private_key, b64_enc_secret
+            )
+            for b64_enc_secret in unique
+        }
+    private_key_pem = private_key_to_pem_bytes(private_key, None)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_decrypt_worker,
+        initargs=(private_key_pem,),
+    ) as executor:
+        secrets = executor.map(
+            _decrypt_secret_or_none, repeat(None), unique, chunksize=16
+        )
+        return dict(zip(unique, secrets, strict=True))
@@ -0,0 +1,528 @@
+"""Glob helpers module.
+
+This module provides utilities to reason about Velociraptor glob patterns,
+such as splitting them into components and translating them to regular
+expressions.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cache
+from itertools import chain
+from re import IGNORECASE, Pattern, escape, fullmatch
+from re import compile as re_compile
+
+from .logging import get_logger
+
+_LOGGER = get_logger('helper.glob')
+RECURSIVE_DEFAULT_DEPTH = 30
+_RECURSIVE = re_compile(r'(?<![^/\\])\*\*(\d*)(?![^/\\])')
+_EXCLUSION_SEPARATOR = '[\\\\/]'
+
+
+def split_glob(glob: str) -> list[str]:
+    """Split glob into components.
+
+    Both slash and backslash are considered as separators.
+
+    Args:
+        glob (str): Glob pattern.
+
+    Returns:
+        list[str]: Non-empty glob components.
+    """
+    return [part for part in glob.replace('\\', '/').split('/') if part]
+
+
+@cache
+def recursive_depth(component: str) -> int | None:
+    """Recursion depth of a glob component.
+
+    Args:
+        component (str): Glob component.
+
+    Returns:
+        int | None: Depth if component is a recursive wildcard (** or **N),
+            None otherwise.
+    """
+    match = fullmatch(r'\*\*(\d*)', component)
+    if not match:
+        return None
+    depth = match.group(1)
+    return int(depth) if depth else RECURSIVE_DEFAULT_DEPTH
+
+
+def bound_depth(glob: str, max_depth: int) -> str:
+    """Bound recursion depth of a glob.
+
+    Args:
+        glob (str): Glob pattern.
+        max_depth (int): Maximum recursion depth, 0 means unbounded.
+
+    Returns:
+        str: Glob with recursive wildcards limited to given depth.
+    """
+    if max_depth <= 0:
+        return glob
+
+    def _bound(match) -> str:
+        depth = match.group(1)
+        depth = int(depth) if depth else RECURSIVE_DEFAULT_DEPTH
+        return f'**{min(depth, max_depth)}'
+
+    return _RECURSIVE.sub(_bound, glob)
+
+
+def is_literal(component: str) -> bool:
+    """Determine if glob component is a literal.
+
+    Args:
+        component (str): Glob component.
+
+    Returns:
+        bool: True if component does not contain any wildcard.
+    """
+    return not any(char in component for char in '*?[{')
+
+
+def _component_regex(component: str, separators: str = '/') -> str:
+    """Translate a non-recursive glob component to a regular expression.
+
+    Args:
+        component (str): Glob component.
+        separators (str): Path separators, escaped for a character class.
+
+    Returns:
+        str: Regular expression matching a single path component.
+    """
+    regex = []
+    index = 0
+    while index < len(component):
+        char = component[index]
+        if char == '*':
+            regex.append(f'[^{separators}]*')
+        elif char == '?':
+            regex.append(f'[^{separators}]')
+        elif char == '[':
+            end = component.find(']', index + 1)
+            if end < 0:
+                regex.append(escape(char))
+            else:
+                charset = component[index + 1 : end].replace('\\', '\\\\')
+                if charset.startswith('!'):
+                    charset = '^' + charset[1:]
+                regex.append(f'[{charset}]')
+                index = end
+        elif char == '{':
+            end = component.find('}', index + 1)
+            if end < 0:
+                regex.append(escape(char))
+            else:
+                alternatives = component[index + 1 : end].split(',')
+                regex.append(
+                    '(?:'
+                    + '|'.join(
+                        _component_regex(alt, separators)
+                        for alt in alternatives
+                    )
+                    + ')'
+                )
+                index = end
+        else:
+            # RE2 rejects escaped spaces
+            regex.append(char if char == ' ' else escape(char))
+        index += 1
+    return ''.join(regex)
+
+
+def glob_to_regex(glob: str, case_insensitive: bool = False) -> Pattern:
+    """Translate glob to a regular expression.
+
+    Resulting expression matches paths made of components separated by
+    slashes and starting with a slash, i.e. '/Windows/System32/config/SAM'.
+
+    Args:
+        glob (str): Glob pattern.
+        case_insensitive (bool): Resulting expression ignores case.
+
+    Returns:
+        Pattern: Compiled regular expression.
+    """
+    regex = []
+    for component in split_glob(glob):
+        depth = recursive_depth(component)
+        if depth is None:
+            regex.append('/' + _component_regex(component))
+            continue
+        regex.append(f'(?:/[^/]+){{0,{depth}}}')
+    return re_compile(
+        ''.join(regex) or '/', IGNORECASE if case_insensitive else 0
+    )
+
+
+def exclusion_regex(
+    globs: Iterable[str], case_insensitive: bool = False
+) -> str:
+    """Translate exclusion globs to a single regular expression.
+
+    Resulting expression is RE2 compatible so that it can be evaluated by
+    Velociraptor. It matches the end of slash or backslash separated paths,
+    i.e. 'node_modules' excludes every directory with this name.
+
+    Args:
+        globs (Iterable[str]): Exclusion glob patterns.
+        case_insensitive (bool): Resulting expression ignores case.
+
+    Returns:
+        str: Regular expression, empty if there is no exclusion glob.
+    """
+    separator = _EXCLUSION_SEPARATOR
+    separators = separator[1:-1]
+    alternatives = []
+    for glob in globs:
+        regex = []
+        for component in split_glob(glob):
+            depth = recursive_depth(component)
+            if depth is None:
+                regex.append(
+                    separator + _component_regex(component, separators)
+                )
+                continue
+            regex.append(f'(?:{separator}[^{separators}]+){{0,{depth}}}')
+        if regex:
+            alternatives.append(''.join(regex))
+    if not alternatives:
+        return ''
+    flags = '(?i)' if case_insensitive else ''
+    return flags + '(?:' + '|'.join(alternatives) + ')$'
+
+
+@dataclass(kw_only=True)
+class GlobOptimizerStats:
+    """Glob optimizer statistics.
+
+    Attributes:
+        total (int): Count of input globs.
+        duplicates (int): Count of removed duplicate globs.
+        subsumed (int): Count of removed globs matched by a wider glob.
+        merged (int): Count of globs merged into brace alternations.
+    """
+
+    total: int = 0
+    duplicates: int = 0
+    subsumed: int = 0
+    merged: int = 0
+
+    @property
+    def removed(self) -> int:
+        """Count of glob entries removed.
+
+        Returns:
+            int: Difference between input and output glob counts.
+        """
+        return self.duplicates + self.subsumed + self.merged
+
+
+@dataclass(frozen=True)
+class _Glob:
+    """Canonical glob.
+
+    Attributes:
+        components (tuple[str, ...]): Glob components.
+        accessor (str): Accessor of the glob.
+        absolute (bool): Glob starts with a separator.
+        key (tuple[str, ...]): Components compared for equality.
+    """
+
+    components: tuple[str, ...]
+    accessor: str
+    absolute: bool
+    key: tuple[str, ...]
+
+    def render(self, separator: str) -> str:
+        """Render glob using given separator.
+
+        Args:
+            separator (str): Path separator.
+
+        Returns:
+            str: Glob pattern.
+        """
+        glob = separator.join(self.components)
+        return separator + glob if self.absolute else glob
+
+
+def _canonical(glob: str, accessor: str, case_insensitive: bool) -> _Glob:
+    """Canonicalize glob.
+
+    Args:
+        glob (str): Glob pattern.
+        accessor (str): Accessor of the glob.
+        case_insensitive (bool): Globs ignore case.
+
+    Returns:
+        _Glob: Canonical glob.
+    """
+    components = tuple(split_glob(glob))
+    key = components
+    if case_insensitive:
+        key = tuple(component.casefold() for component in components)
+    return _Glob(
+        components=components,
+        accessor=accessor,
+        absolute=glob[:1] in ('/', '\\'),
+        key=key,
+    )
+
+
+def _max_depth(components: tuple[str, ...]) -> int:
+    """Maximum count of path components matched by glob components.
+
+    Args:
+        components (tuple[str, ...]): Glob components.
+
+    Returns:
+        int: Maximum matched depth.
+    """
+    return sum(recursive_depth(component) or 1 for component in components)
+
+
+@cache
+def _component_subsumes(
+    wide: str, narrow: str, case_insensitive: bool
+) -> bool:
+    """Determine if every name matched by narrow component matches wide.
+
+    Args:
+        wide (str): Non-recursive glob component.
+        narrow (str): Non-recursive glob component.
+        case_insensitive (bool): Globs ignore case.
+
+    Returns:
+        bool: True if wide component subsumes narrow component.
+    """
+    if wide == '*' or wide == narrow:
+        return True
+    if not is_literal(narrow):
+        return False
+    flags = IGNORECASE if case_insensitive else 0
+    return fullmatch(_component_regex(wide), narrow, flags) is not None
+
+
+def _subsumes(wide: _Glob, narrow: _Glob, case_insensitive: bool) -> bool:
+    """Determine if every path matched by narrow glob matches wide glob.
+
+    Wide globs without recursive component shall have as many components
+    as the narrow glob, each subsuming the narrow one. Wide globs ending
+    with a recursive component, optionally followed by '*', shall have
+    leading components subsuming the leading components of the narrow glob
+    and a recursion depth covering its remaining components. Other wide
+    globs are not considered.
+
+    Args:
+        wide (_Glob): Candidate subsuming glob.
+        narrow (_Glob): Candidate subsumed glob.
+        case_insensitive (bool): Globs ignore case.
+
+    Returns:
+        bool: True if wide glob subsumes narrow glob.
+    """
+    if wide.accessor != narrow.accessor or wide.absolute != narrow.absolute:
+        return False
+    if not any(recursive_depth(component) for component in wide.key):
+        if len(wide.key) != len(narrow.key):
+            return False
+        return all(
+            recursive_depth(narrow_component) is None
+            and _component_subsumes(
+                wide_component, narrow_component, case_insensitive
+            )
+            for wide_component, narrow_component in zip(wide.key, narrow.key)
+        )
+    components = wide.key
+    extra = 0
+    if len(components) > 1 and components[-1] == '*':
+        components, extra = components[:-1], 1
+    if not components:
+        return False
+    depth = recursive_depth(components[-1])
+    if depth is None:
+        return False
+    prefix = components[:-1]
+    if len(narrow.key) <= len(prefix):
+        return False
+    for wide_component, narrow_component in zip(prefix, narrow.key):
+        if recursive_depth(wide_component) is not None:
+            return False
+        if recursive_depth(narrow_component) is not None:
+            return False
+        if not _component_subsumes(
+            wide_component, narrow_component, case_insensitive
+        ):
+            return False
+    return _max_depth(narrow.key[len(prefix) :]) <= depth + extra
+
+
+def _mergeable(component: str) -> bool:
+    """Determine if glob component can be merged in a brace alternation.
+
+    Args:
+        component (str): Glob component.
+
+    Returns:
+        bool: True if component does not contain braces, commas or a
+            recursive wildcard.
+    """
+    return recursive_depth(component) is None and not any(
+        char in component for char in '{},'
+    )
+
+
+def _find_wider(items: list[_Glob], case_insensitive: bool) -> dict[int, int]:
+    """Find globs subsumed by another glob.
+
+    Of globs subsuming each other, the first one is kept. Subsumed globs
+    are resolved to a glob which is not subsumed itself, so that removing
+    every subsumed glob never removes the paths they match.
+
+    Args:
+        items (list[_Glob]): Canonical globs without duplicates.
+        case_insensitive (bool): Globs ignore case.
+
+    Returns:
+        dict[int, int]: Index of a kept subsuming glob indexed by subsumed
+            glob index.
+    """
+    # index candidate wide globs to avoid comparing every pair of globs
+    recursive_wides = {}
+    wides_by_length = {}
+    for index, item in enumerate(items):
+        if any(recursive_depth(component) for component in item.key):
+            first = item.key[0]
+            first = first if is_literal(first) else None
+            recursive_wides.setdefault(first, []).append(index)
+        elif not all(is_literal(component) for component in item.key):
+            wides_by_length.setdefault(len(item.key), []).append(index)
+    wider = {}
+    for index, item in enumerate(items):
+        candidates = chain(
+            recursive_wides.get(None, []),
+            recursive_wides.get(item.key[0] if item.key else None, []),
+            wides_by_length.get(len(item.key), []),
+        )
+        for candidate in candidates:
+            if candidate == index or not _subsumes(
+                items[candidate], item, case_insensitive
+            ):
+                continue
+            # equivalent globs: keep the first one
+            if candidate > index and _subsumes(
+                item, items[candidate], case_insensitive
+            ):
+                continue
+            wider[index] = candidate
+            break
+    # keep the first glob of any remaining cycle of subsumed globs
+    for index in list(wider):
+        path = []
+        current = index
+        while current in wider and current not in path:
+            path.append(current)
+            current = wider[current]
+        if current in path:
+            del wider[min(path[path.index(current) :])]
+    resolved = {}
+    for index, current in wider.items():
+        while current in wider:
+            current = wider[current]
+        resolved[index] = current
+    return resolved
+
+
+def find_overlaps(
+    globs: list[tuple[str, str]], case_insensitive: bool = False
+) -> dict[int, int]:
+    """Find globs which duplicate or are subsumed by another glob.
+
+    Args:
+        globs (list[tuple[str, str]]): Glob patterns and accessors.
+        case_insensitive (bool): Globs ignore case, i.e. Windows globs.
+
+    Returns:
+        dict[int, int]: Index of a glob matching every path matched by the
+            overlapping glob, indexed by overlapping glob index.
+    """
+    overlaps = {}
+    first_index = {}
+    items = []
+    indices = []
+    for index, (glob, accessor) in enumerate(globs):
+        item = _canonical(glob, accessor, case_insensitive)
+        dedup_key = (item.key, item.accessor, item.absolute)
+        if dedup_key in first_index:
+            overlaps[index] = first_index[dedup_key]
+            continue
+        first_index[dedup_key] = index
+        items.append(item)
+        indices.append(index)
+    for narrow, wide in _find_wider(items, case_insensitive).items():
+        overlaps[indices[narrow]] = indices[wide]
+    return overlaps
+
+
+def optimize_globs(
+    globs: Iterable[tuple[str, str]],
+    case_insensitive: bool = False,
+    separator: str = '/',
+) -> tuple[list[tuple[str, str]], GlobOptimizerStats]:
+    """Reduce the count of glob entries without changing matched paths.
+
+    Globs are canonicalized, exact duplicates and globs subsumed by a wider
+    glob of the same accessor are removed, then globs differing only by
+    their last component are merged into a brace alternation.
+
+    Args:
+        globs (Iterable[tuple[str, str]]): Glob patterns and accessors.
+        case_insensitive (bool): Globs ignore case, i.e. Windows globs.
+        separator (str): Path separator of rendered globs.
+
+    Returns:
+        tuple[list[tuple[str, str]], GlobOptimizerStats]: Optimized glob
+            patterns and accessors, in input order, and statistics.
+    """
+    stats = GlobOptimizerStats()
+    unique = {}
+    for glob, accessor in globs:
+        stats.total += 1
+        item = _canonical(glob, accessor, case_insensitive)
+        dedup_key = (item.key, item.accessor, item.absolute)
+        if dedup_key in unique:
+            stats.duplicates += 1
+            continue
+        unique[dedup_key] = item
+    items = list(unique.values())
+    wider = _find_wider(items, case_insensitive)
+    stats.subsumed = len(wider)
+    kept = [item for index, item in enumerate(items) if index not in wider]
+    groups = {}
+    for item in kept:
+        group_key = (item.accessor, item.absolute, item.key[:-1])
+        if not item.components or not _mergeable(item.components[-1]):
+            group_key = (item, None, None)
+        groups.setdefault(group_key, []).append(item)
+    optimized = []
+    for group in groups.values():
+        first = group[0]
+        if len(group) == 1:
+            optimized.append((first.render(separator), first.accessor))
+            continue
+        stats.merged += len(group) - 1
+        alternatives = ','.join(item.components[-1] for item in group)
+        merged = _Glob(
+            components=first.components[:-1] + (f'{{{alternatives}}}',),
+            accessor=first.accessor,
+            absolute=first.absolute,
+            key=first.key,
+        )
+        optimized.append((merged.render(separator), merged.accessor))
+    return optimized, stats
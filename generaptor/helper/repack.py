@@ -0,0 +1,154 @@
+"""Repack helpers module.
+
+This module embeds a collector configuration into a Velociraptor template
+binary the way 'velociraptor config repack' does: the configuration is
+zlib compressed and written over the placeholder following the embedded
+config marker.
+"""
+
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from re import compile as re_compile
+from zlib import compress, decompressobj
+from zlib import error as zlib_error
+
+from .logging import get_logger
+
+_LOGGER = get_logger('helper.repack')
+_MARKER = re_compile(rb'#{3}<Begin Embedded Config>\r?\n')
+_PLACEHOLDER = re_compile(rb'#+')
+_SIZE_MARGIN = 40
+_PADDING = b'\n'
+
+
+class RepackError(Exception):
+    """Raised when configuration cannot be embedded in template binary."""
+
+
+def _placeholder(data) -> tuple[int, int]:
+    """Locate embedded config placeholder.
+
+    Args:
+        data: Template binary content (bytes or mmap).
+
+    Returns:
+        tuple[int, int]: Placeholder start and end offsets.
+
+    Raises:
+        RepackError: If the marker cannot be found or is already repacked.
+    """
+    marker = _MARKER.search(data)
+    if not marker:
+        raise RepackError("embedded config marker not found")
+    placeholder = _PLACEHOLDER.match(data, marker.end())
+    if not placeholder:
+        raise RepackError("binary already contains an embedded config")
+    return placeholder.start(), placeholder.end()
+
+
+def repack(template_binary: Path, config: Path, output_binary: Path):
+    """Embed configuration in template binary.
+
+    Args:
+        template_binary (Path): Velociraptor template binary.
+        config (Path): Collector configuration file.
+        output_binary (Path): Output collector binary.
+
+    Raises:
+        RepackError: If the configuration cannot be embedded.
+    """
+    compressed = compress(config.read_bytes(), 9)
+    with (
+        template_binary.open('rb') as fstream,
+        mmap(fstream.fileno(), 0, access=ACCESS_READ) as data,
+    ):
+        start, end = _placeholder(data)
+        capacity = end - start - _SIZE_MARGIN
+        if len(compressed) > capacity:
+            raise RepackError(
+                f"compressed config is too large to embed "
+                f"({len(compressed)} > {capacity} bytes)"
+            )
+        with output_binary.open('wb') as output:
+            output.write(data[:start])
+            output.write(compressed)
+            output.write(_PADDING * (end - start - len(compressed)))
+            output.write(data[end:])
+    output_binary.chmod(0o700)
+
+
+def embedded_config(data: bytes, start: int) -> bytes:
+    """Decode embedded config.
+
+    Args:
+        data (bytes): Repacked binary content.
+        start (int): Embedded config start offset.
+
+    Returns:
+        bytes: Decoded configuration.
+
+    Raises:
+        RepackError: If the embedded config cannot be decoded.
+    """
+    try:
+        return decompressobj().decompress(data[start:])
+    except zlib_error as exc:
+        raise RepackError("invalid embedded config") from exc
+
+
+def _repacked_config(
+    template: bytes, start: int, end: int, filepath: Path
+) -> bytes | None:
+    """Check repacked binary against template and decode its config.
+
+    Args:
+        template (bytes): Template binary content.
+        start (int): Placeholder start offset.
+        end (int): Placeholder end offset.
+        filepath (Path): Repacked binary.
+
+    Returns:
+        bytes | None: Decoded configuration, or None if binary does not
+            match the template outside of the placeholder.
+    """
+    data = filepath.read_bytes()
+    if len(data) != len(template):
+        _LOGGER.error("unexpected binary size: %s", filepath)
+        return None
+    if data[:start] != template[:start] or data[end:] != template[end:]:
+        _LOGGER.error("binary differs outside of config: %s", filepath)
+        return None
+    try:
+        return embedded_config(data, start)
+    except RepackError:
+        _LOGGER.error("invalid embedded config: %s", filepath)
+    return None
+
+
+def verify_repack(
+    template_binary: Path, output_binary: Path, reference_binary: Path
+) -> bool:
+    """Compare a natively repacked binary with a reference repacked binary.
+
+    Both binaries must match the template binary outside of the embedded
+    config placeholder and their embedded configs must decode to the same
+    content.
+
+    Args:
+        template_binary (Path): Velociraptor template binary.
+        output_binary (Path): Natively repacked binary.
+        reference_binary (Path): Binary repacked by Velociraptor.
+
+    Returns:
+        bool: True if both binaries are equivalent.
+    """
+    template = template_binary.read_bytes()
+    start, end = _placeholder(template)
+    config = _repacked_config(template, start, end, output_binary)
+    ref_config = _repacked_config(template, start, end, reference_binary)
+    if config is None or ref_config is None:
+        return False
+    if config != ref_config:
+        _LOGGER.error("embedded configs differ")
+        return False
+    return True
@@ -0,0 +1,213 @@
+"""Search helpers module.
+
+This module provides multi-pattern search over byte streams, using a literal
+prefilter to avoid running regular expressions on data which cannot match.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from re import IGNORECASE, Pattern
+from re import _parser as re_parser  # pylint: disable=no-name-in-module
+from re import error as re_error
+from typing import BinaryIO
+
+from .logging import get_logger
+
+_LOGGER = get_logger('helper.search')
+CHUNK_SIZE = 1024 * 1024
+OVERLAP_SIZE = 4096
+MATCH_MAX_SIZE = 256
+
+try:
+    from ahocorasick import Automaton as _Automaton
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _Automaton = None
+    AHOCORASICK_AVAILABLE = False
+
+
+def _literal_runs(parsed) -> Iterator[bytes]:
+    """Yield literal runs which must appear in any match of parsed pattern.
+
+    Args:
+        parsed: Parsed regular expression (sequence of opcodes).
+
+    Yields:
+        bytes: Literal byte sequences required by the pattern.
+    """
+    run = bytearray()
+    for opcode, argument in parsed:
+        name = str(opcode)
+        if name == 'LITERAL':
+            run.append(argument)
+            continue
+        if run:
+            yield bytes(run)
+            run.clear()
+        if name == 'SUBPATTERN':
+            _, add_flags, del_flags, subpattern = argument
+            if not add_flags and not del_flags:
+                yield from _literal_runs(subpattern)
+        elif name in {'MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'}:
+            minimum, _, subpattern = argument
+            if minimum >= 1:
+                yield from _literal_runs(subpattern)
+        elif name == 'ATOMIC_GROUP':
+            yield from _literal_runs(argument)
+    if run:
+        yield bytes(run)
+
+
+def required_literal(pattern: Pattern) -> bytes | None:
+    """Longest literal which must appear in any match of given pattern.
+
+    Args:
+        pattern (Pattern): Compiled bytes regular expression.
+
+    Returns:
+        bytes | None: Required literal, or None if no literal can be derived.
+    """
+    try:
+        parsed = re_parser.parse(pattern.pattern, pattern.flags)
+    except (re_error, RecursionError):
+        _LOGGER.debug("failed to parse pattern: %s", pattern.pattern)
+        return None
+    literal = max(_literal_runs(parsed), key=len, default=b'')
+    return literal or None
+
+
+@dataclass(kw_only=True, frozen=True)
+class SearchMatch:
+    """Search match.
+
+    Attributes:
+        offset (int): Offset of the match in the stream.
+        pattern (str): Pattern which matched.
+        data (bytes): Matched data (truncated).
+    """
+
+    offset: int
+    pattern: str
+    data: bytes
+
+    def to_dict(self) -> dict:
+        """Convert to dict.
+
+        Returns:
+            dict: Dictionary representation of the match.
+        """
+        return {
+            'offset': self.offset,
+            'pattern': self.pattern,
+            'match': self.data.decode('utf-8', errors='replace'),
+        }
+
+
+@dataclass
+class Searcher:
+    """Multi-pattern searcher.
+
+    Patterns for which a required literal can be derived are only evaluated
+    on chunks containing this literal. The literal prefilter relies on an
+    Aho-Corasick automaton when pyahocorasick is installed and falls back
+    to substring searches otherwise.
+
+    Attributes:
+        patterns (list[Pattern]): Compiled bytes regular expressions.
+        ignore_case (bool): Prefilter ignores case.
+    """
+
+    patterns: list[Pattern]
+    ignore_case: bool = False
+    _always: list[int] = field(init=False, default_factory=list)
+    _by_literal: dict[bytes, list[int]] = field(
+        init=False, default_factory=dict
+    )
+    _automaton: object = field(init=False, default=None)
+
+    def __post_init__(self):
+        for index, pattern in enumerate(self.patterns):
+            literal = required_literal(pattern)
+            if pattern.flags & IGNORECASE and not self.ignore_case:
+                literal = None
+            if literal is None:
+                _LOGGER.warning(
+                    "no literal prefilter for pattern: %s", pattern.pattern
+                )
+                self._always.append(index)
+                continue
+            if self.ignore_case:
+                literal = literal.lower()
+            self._by_literal.setdefault(literal, []).append(index)
+        if AHOCORASICK_AVAILABLE and self._by_literal:
+            self._automaton = _Automaton()
+            for literal in self._by_literal:
+                key = literal.decode('latin-1')
+                self._automaton.add_word(key, literal)
+            self._automaton.make_automaton()
+
+    def _candidates(self, window: bytes) -> list[int]:
+        """Select patterns which may match in window.
+
+        Args:
+            window (bytes): Data window.
+
+        Returns:
+            list[int]: Indices of candidate patterns.
+        """
+        if self.ignore_case:
+            window = window.lower()
+        if self._automaton is not None:
+            literals = {
+                literal
+                for _, literal in self._automaton.iter(
+                    window.decode('latin-1')
+                )
+            }
+        else:
+            literals = {
+                literal for literal in self._by_literal if literal in window
+            }
+        candidates = set(self._always)
+        for literal in literals:
+            candidates.update(self._by_literal[literal])
+        return sorted(candidates)
+
+    def search(self, stream: BinaryIO) -> Iterator[SearchMatch]:
+        """Search stream for patterns.
+
+        Stream is read by chunks overlapping by OVERLAP_SIZE bytes, matches
+        larger than the overlap and spanning two chunks might be missed.
+
+        Args:
+            stream (BinaryIO): Stream to read data from.
+
+        Yields:
+            SearchMatch: Matches ordered by chunk.
+        """
+        base = 0
+        tail = b''
+        reported = set()
+        while chunk := stream.read(CHUNK_SIZE):
+            window = tail + chunk
+            current = set()
+            for index in self._candidates(window):
+                pattern = self.patterns[index]
+                for match in pattern.finditer(window):
+                    offset = base + match.start()
+                    if (index, offset) in reported:
+                        continue
+                    if match.end() <= len(tail):
+                        continue
+                    current.add((index, offset))
+                    yield SearchMatch(
+                        offset=offset,
+                        pattern=pattern.pattern.decode(
+                            'utf-8', errors='replace'
+                        ),
+                        data=match.group()[:MATCH_MAX_SIZE],
+                    )
+            tail = window[-OVERLAP_SIZE:]
+            base += len(window) - len(tail)
+            reported = {item for item in current if item[1] >= base}